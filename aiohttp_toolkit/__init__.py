@@ -5,9 +5,26 @@ from ._handler import (
     RequestHandler,
     CallbackBuilder,
 )
+from ._cache import ResponseCache
+from ._coalesce import Coalescer
+from ._retry import RetryPolicy, RetryBudget
+from ._breaker import CircuitBreaker, CircuitOpenError
+from ._ratelimit import RateLimiter
+from ._concurrency import ConcurrencyLimiter
+from ._instrument import Instrumentation, Histogram
+from ._fanout import ProcessFanOut, RemoteError
+from ._offload import OffloadPool
+from ._hedge import HedgePolicy
+from ._balance import EndpointGroup
+from ._scheduler import RequestScheduler, SchedulerLane
+from ._prepared import PreparedEndpoint
+from ._paginate import Paginator
+from ._streaming import LineTooLongError
+from ._warmup import ConnectionWarmer
 from . import (
     response_callbacks as callbacks,
     response_models as models,
     callback_builders as builders,
+    sinks,
     types,
 )
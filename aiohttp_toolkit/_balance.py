@@ -0,0 +1,196 @@
+from typing import Any, Optional, Iterable, Union
+import asyncio
+import dataclasses
+import random
+import time
+
+import aiohttp
+import yarl
+
+from .types import ResponseCbOut, Send
+
+
+__all__ = ("EndpointGroup",)
+
+
+@dataclasses.dataclass
+class _Endpoint:
+    url: yarl.URL
+    outstanding: int = 0
+    latency: float = 0.0
+    failures: int = 0
+    ejections: int = 0
+    ejected_until: float = 0.0
+
+
+class EndpointGroup:
+    """
+    A group of equivalent replica base URLs, balanced on the client side.
+
+    With an endpoint group, `url` of a request is relative: it is resolved
+    against a replica base URL with `yarl.URL.join`, so base URLs with a path
+    should end with `/`, and `url` should not start with `/`.
+
+    For every request two random replicas are picked and the one with lower
+    `(outstanding + 1) * latency` is used, where `latency` is an exponentially
+    weighted moving average of request durations (power of two choices).
+    A failure is averaged in as `penalty` times the slowest of its duration
+    and latencies of the other replicas, so a replica failing fast does not
+    look faster than healthy ones, and recovers in a few successes.
+    After `max_failures` consecutive failures (connection errors, or
+    response status in `statuses`), a replica is ejected for
+    `ejection_time` seconds, doubled on every consecutive ejection. If every
+    replica is ejected, all of them are used.
+    """
+
+    def __init__(
+        self,
+        base_urls: Iterable[Union[str, yarl.URL]],
+        *,
+        decay: float = 0.3,
+        penalty: float = 5.0,
+        max_failures: int = 5,
+        ejection_time: float = 10.0,
+        statuses: Iterable[int] = (500, 502, 503, 504),
+    ) -> None:
+        """
+        Args:
+            base_urls: Base URLs of replicas.
+            decay: Weight of the latest duration in latency average. \
+                Defaults to `0.3`.
+            penalty: Multiplier of the duration of failures in latency \
+                average. Defaults to `5.0`.
+            max_failures: Number of consecutive failures to eject a replica \
+                after. Defaults to `5`.
+            ejection_time: Initial ejection duration, in seconds. \
+                Defaults to `10.0`.
+            statuses: Response statuses counted as failures. \
+                Defaults to `(500, 502, 503, 504)`.
+        """
+
+        self.endpoints = [_Endpoint(yarl.URL(url)) for url in base_urls]
+        if not self.endpoints:
+            raise ValueError("base_urls must not be empty")
+
+        self.decay = decay
+        self.penalty = penalty
+        self.max_failures = max_failures
+        self.ejection_time = ejection_time
+        self.statuses = frozenset(statuses)
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """
+        Return state of replicas, keyed by base URL, with `outstanding`
+        requests, average `latency`, consecutive `failures` and whether the
+        replica is `ejected`.
+        """
+
+        now = time.monotonic()
+        return {
+            str(endpoint.url): dict(
+                outstanding=endpoint.outstanding,
+                latency=endpoint.latency,
+                failures=endpoint.failures,
+                ejected=endpoint.ejected_until > now,
+            )
+            for endpoint in self.endpoints
+        }
+
+    def _pick(self) -> _Endpoint:
+        now = time.monotonic()
+        healthy = [
+            endpoint
+            for endpoint in self.endpoints
+            if endpoint.ejected_until <= now
+        ] or self.endpoints
+
+        if len(healthy) == 1:
+            return healthy[0]
+
+        first, second = random.sample(healthy, 2)
+        return min(
+            first, second,
+            key=lambda endpoint: (endpoint.outstanding + 1) * endpoint.latency,
+        )
+
+    def wrap(self, send: Send) -> Send:
+        """
+        Wrap a request sending function with the endpoint group.
+
+        Used by `RequestHandler.request(..., endpoints=group)`.
+        """
+
+        async def balanced_send(
+            response_callback,
+            **request_kwargs,
+        ) -> ResponseCbOut:
+            endpoint = self._pick()
+            request_kwargs = request_kwargs | dict(
+                url=endpoint.url.join(yarl.URL(request_kwargs["url"])),
+            )
+
+            status: Optional[int] = None
+
+            async def balanced_callback(
+                cr: aiohttp.ClientResponse,
+                **kwargs,
+            ) -> ResponseCbOut:
+                nonlocal status
+                status = cr.status
+                return await response_callback(cr, **kwargs)
+
+            endpoint.outstanding += 1
+            start = time.monotonic()
+            try:
+                out, err = await send(balanced_callback, **request_kwargs)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self._record(endpoint, time.monotonic() - start, True)
+                raise
+            finally:
+                endpoint.outstanding -= 1
+
+            failed = (
+                (status is None and err is not None)
+                or status in self.statuses
+            )
+            self._record(endpoint, time.monotonic() - start, failed)
+
+            return out, err
+
+        return balanced_send
+
+    def _record(
+        self,
+        endpoint: _Endpoint,
+        latency: float,
+        failed: bool,
+    ) -> None:
+        if failed:
+            latency = self.penalty * max(
+                latency,
+                *(
+                    other.latency
+                    for other in self.endpoints
+                    if other is not endpoint
+                ),
+            )
+
+        if endpoint.latency:
+            endpoint.latency += self.decay * (latency - endpoint.latency)
+        else:
+            endpoint.latency = latency
+
+        if not failed:
+            endpoint.failures = 0
+            endpoint.ejections = 0
+            return
+
+        endpoint.failures += 1
+        if endpoint.failures >= self.max_failures:
+            endpoint.ejected_until = time.monotonic() + (
+                self.ejection_time * 2 ** endpoint.ejections
+            )
+            endpoint.ejections += 1
+            endpoint.failures = 0
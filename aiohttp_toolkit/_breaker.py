@@ -0,0 +1,249 @@
+from typing import Any, Optional, Iterable
+import asyncio
+import collections
+import dataclasses
+import time
+
+import aiohttp
+import yarl
+
+from .types import ResponseCbOut, Send
+
+
+__all__ = ("CircuitBreaker", "CircuitOpenError")
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitOpenError(Exception):
+    """
+    Returned instead of performing a request, while the circuit of the
+    request origin is open.
+    """
+
+    def __init__(self, origin: str, retry_in: float) -> None:
+        super().__init__(
+            f"circuit for {origin} is open, retry in {retry_in:.3f}s",
+        )
+        self.origin = origin
+        self.retry_in = retry_in
+
+
+@dataclasses.dataclass
+class _Circuit:
+    state: str = CLOSED
+    opened_at: float = 0.0
+    probes: int = 0
+    successes: int = 0
+    failures: int = 0
+    latency: float = 0.0
+    window: collections.deque = dataclasses.field(
+        default_factory=collections.deque,
+    )
+
+
+class CircuitBreaker:
+    """
+    A circuit breaker keyed by request origin (scheme, host and port).
+
+    While the circuit is `closed`, outcomes of requests are tracked over a
+    rolling window of `window` seconds. A request fails if it raises or
+    returns a connection error, its response status is one of `statuses`,
+    or it takes longer than `slow_call` seconds. Once at least `min_requests`
+    are tracked and the failure ratio reaches `failure_ratio`, the circuit
+    becomes `open`, and requests immediately return `CircuitOpenError`.
+    After `reset_timeout` seconds the circuit becomes `half-open` and lets
+    `probes` requests through: if they all succeed, the circuit is `closed`,
+    otherwise it is `open` again.
+    """
+
+    def __init__(
+        self,
+        *,
+        window: float = 10.0,
+        min_requests: int = 20,
+        failure_ratio: float = 0.5,
+        slow_call: Optional[float] = None,
+        statuses: Iterable[int] = (500, 502, 503, 504),
+        reset_timeout: float = 30.0,
+        probes: int = 1,
+    ) -> None:
+        """
+        Args:
+            window: Rolling window duration, in seconds. Defaults to `10.0`.
+            min_requests: Minimum number of requests in the window to open \
+                the circuit. Defaults to `20`.
+            failure_ratio: Failure ratio to open the circuit at. \
+                Defaults to `0.5`.
+            slow_call: Duration, in seconds, after which a request is \
+                counted as failed. Defaults to `None`.
+            statuses: Response statuses counted as failures. \
+                Defaults to `(500, 502, 503, 504)`.
+            reset_timeout: Time, in seconds, the circuit stays open. \
+                Defaults to `30.0`.
+            probes: Number of requests let through in half-open state. \
+                Defaults to `1`.
+        """
+
+        self.window = window
+        self.min_requests = min_requests
+        self.failure_ratio = failure_ratio
+        self.slow_call = slow_call
+        self.statuses = frozenset(statuses)
+        self.reset_timeout = reset_timeout
+        self.probes = probes
+
+        self._circuits: dict[str, _Circuit] = {}
+
+    def state(self, origin: str) -> str:
+        """
+        Return state of the circuit of `origin`: `"closed"`, `"open"` or
+        `"half-open"`.
+        """
+
+        circuit = self._circuits.get(origin)
+        if circuit is None:
+            return CLOSED
+
+        self._advance(circuit, time.monotonic())
+        return circuit.state
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """
+        Return state of all circuits, keyed by origin, with `state`,
+        `requests` and `failures` in the window, and mean `latency`.
+        """
+
+        now = time.monotonic()
+        snapshot: dict[str, dict[str, Any]] = {}
+        for origin, circuit in self._circuits.items():
+            self._advance(circuit, now)
+            requests = len(circuit.window)
+            snapshot[origin] = dict(
+                state=circuit.state,
+                requests=requests,
+                failures=circuit.failures,
+                latency=circuit.latency / requests if requests else 0.0,
+            )
+        return snapshot
+
+    def wrap(self, send: Send) -> Send:
+        """
+        Wrap a request sending function with the circuit breaker.
+
+        Used by `RequestHandler.request(..., breaker=breaker)`.
+        """
+
+        async def breaking_send(
+            response_callback,
+            **request_kwargs,
+        ) -> ResponseCbOut:
+            origin = str(yarl.URL(request_kwargs["url"]).origin())
+            circuit = self._circuits.get(origin)
+            if circuit is None:
+                circuit = self._circuits[origin] = _Circuit()
+
+            now = time.monotonic()
+            self._advance(circuit, now)
+            if circuit.state == OPEN or (
+                circuit.state == HALF_OPEN and circuit.probes >= self.probes
+            ):
+                retry_in = max(
+                    circuit.opened_at + self.reset_timeout - now, 0.0,
+                )
+                return {}, CircuitOpenError(origin, retry_in)
+
+            if circuit.state == HALF_OPEN:
+                circuit.probes += 1
+
+            status: Optional[int] = None
+
+            async def breaker_callback(
+                cr: aiohttp.ClientResponse,
+                **kwargs,
+            ) -> ResponseCbOut:
+                nonlocal status
+                status = cr.status
+                return await response_callback(cr, **kwargs)
+
+            try:
+                out, err = await send(breaker_callback, **request_kwargs)
+            except asyncio.CancelledError:
+                if circuit.state == HALF_OPEN:
+                    circuit.probes -= 1
+                raise
+            except Exception:
+                end = time.monotonic()
+                self._record(circuit, end, True, end - now)
+                raise
+
+            end = time.monotonic()
+            failed = (
+                (status is None and err is not None)
+                or status in self.statuses
+                or (self.slow_call is not None and end - now > self.slow_call)
+            )
+            self._record(circuit, end, failed, end - now)
+
+            return out, err
+
+        return breaking_send
+
+    def _advance(self, circuit: _Circuit, now: float) -> None:
+        while circuit.window and circuit.window[0][0] < now - self.window:
+            _, failed, latency = circuit.window.popleft()
+            circuit.failures -= failed
+            circuit.latency -= latency
+
+        if (
+            circuit.state == OPEN
+            and now - circuit.opened_at >= self.reset_timeout
+        ):
+            circuit.state = HALF_OPEN
+            circuit.probes = 0
+            circuit.successes = 0
+
+    def _record(
+        self,
+        circuit: _Circuit,
+        now: float,
+        failed: bool,
+        latency: float,
+    ) -> None:
+        if circuit.state == HALF_OPEN:
+            if failed:
+                self._open(circuit, now)
+                return
+
+            circuit.successes += 1
+            if circuit.successes >= self.probes:
+                circuit.state = CLOSED
+                circuit.window.clear()
+                circuit.failures = 0
+                circuit.latency = 0.0
+            return
+
+        if circuit.state == OPEN:
+            return
+
+        circuit.window.append((now, failed, latency))
+        circuit.failures += failed
+        circuit.latency += latency
+        self._advance(circuit, now)
+
+        requests = len(circuit.window)
+        if (
+            requests >= self.min_requests
+            and circuit.failures / requests >= self.failure_ratio
+        ):
+            self._open(circuit, now)
+
+    def _open(self, circuit: _Circuit, now: float) -> None:
+        circuit.state = OPEN
+        circuit.opened_at = now
+        circuit.window.clear()
+        circuit.failures = 0
+        circuit.latency = 0.0
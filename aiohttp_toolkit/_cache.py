@@ -0,0 +1,243 @@
+from typing import Any, Optional, Mapping
+import collections
+import dataclasses
+import sys
+import time
+
+import aiohttp
+import multidict
+import yarl
+
+from .types import ResponseCbOut, Send
+
+
+__all__ = ("ResponseCache",)
+
+
+@dataclasses.dataclass
+class _Entry:
+    out: dict[str, Any]
+    size: int
+    expires: float
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+
+class ResponseCache:
+    """
+    An HTTP-semantics cache of processed response callback output.
+
+    Only successful (`200`) responses to `GET` and `HEAD` requests are stored,
+    keyed by method, URL with query parameters, response callback and values
+    of request headers listed in response `Vary` header. Freshness is taken
+    from response `Cache-Control: max-age`; stale entries with `ETag` or
+    `Last-Modified` validators are revalidated with `If-None-Match` or
+    `If-Modified-Since`, and reused on `304 Not Modified` without running
+    the response callback.
+
+    Entries are evicted in LRU order once their total estimated size exceeds
+    `max_bytes`.
+
+    Attributes:
+        hits: number of requests answered with a fresh entry
+        misses: number of requests answered from the network
+        revalidations: number of stale entries reused on `304`
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+
+        self._entries: collections.OrderedDict[tuple, _Entry] = (
+            collections.OrderedDict()
+        )
+        self._vary: dict[tuple, tuple[str, ...]] = {}
+
+    def stats(self) -> dict[str, int]:
+        """
+        Return cache counters: `hits`, `misses`, `revalidations`, `entries`
+        and `size` in bytes.
+        """
+
+        return dict(
+            hits=self.hits,
+            misses=self.misses,
+            revalidations=self.revalidations,
+            entries=len(self._entries),
+            size=self.size,
+        )
+
+    def clear(self) -> None:
+        """Remove all entries, keeping counters."""
+
+        self._entries.clear()
+        self._vary.clear()
+        self.size = 0
+
+    def wrap(self, send: Send) -> Send:
+        """
+        Wrap a request sending function with the cache.
+
+        Used by `RequestHandler.request(..., cache=cache)`.
+        """
+
+        async def cached_send(
+            response_callback,
+            **request_kwargs,
+        ) -> ResponseCbOut:
+            method: str = request_kwargs["method"]
+            if method not in ("GET", "HEAD"):
+                return await send(response_callback, **request_kwargs)
+
+            url = yarl.URL(request_kwargs["url"]).extend_query(
+                request_kwargs.get("params") or {},
+            )
+            base_key = (method, str(url), response_callback)
+            headers = request_kwargs.get("headers") or {}
+
+            key = self._key(base_key, headers)
+            entry = self._entries.get(key) if key is not None else None
+
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+                if entry.expires > time.monotonic():
+                    self.hits += 1
+                    return dict(entry.out), None
+
+                if entry.etag or entry.last_modified:
+                    conditional = multidict.CIMultiDict(headers)
+                    if entry.etag:
+                        conditional["If-None-Match"] = entry.etag
+                    if entry.last_modified:
+                        conditional["If-Modified-Since"] = entry.last_modified
+                    request_kwargs = request_kwargs | dict(headers=conditional)
+                else:
+                    entry = None
+
+            revalidated = False
+
+            async def caching_callback(
+                cr: aiohttp.ClientResponse,
+                **kwargs,
+            ) -> ResponseCbOut:
+                nonlocal revalidated
+
+                if entry is not None and cr.status == 304:
+                    revalidated = True
+                    entry.expires = self._expires(cr.headers)
+                    return dict(entry.out), None
+
+                out, err = await response_callback(cr, **kwargs)
+                if not err and cr.status == 200:
+                    self._store(base_key, headers, cr.headers, out)
+
+                return out, err
+
+            out, err = await send(caching_callback, **request_kwargs)
+
+            if revalidated:
+                self.revalidations += 1
+            else:
+                self.misses += 1
+
+            return out, err
+
+        return cached_send
+
+    def _key(
+        self,
+        base_key: tuple,
+        headers: Mapping[str, str],
+    ) -> Optional[tuple]:
+        vary = self._vary.get(base_key)
+        if vary is None:
+            return None
+
+        headers = multidict.CIMultiDict(headers)
+        return base_key + tuple(headers.get(name) for name in vary)
+
+    def _store(
+        self,
+        base_key: tuple,
+        headers: Mapping[str, str],
+        response_headers: Mapping[str, str],
+        out: dict[str, Any],
+    ) -> None:
+        cache_control = _parse_cache_control(response_headers)
+        if "no-store" in cache_control:
+            return
+
+        vary = tuple(
+            name.strip().lower()
+            for name in response_headers.get("Vary", "").split(",")
+            if name.strip()
+        )
+        if "*" in vary:
+            return
+
+        etag = response_headers.get("ETag")
+        last_modified = response_headers.get("Last-Modified")
+        expires = self._expires(response_headers)
+        if expires <= time.monotonic() and not (etag or last_modified):
+            return
+
+        size = _sizeof(out)
+        if size > self.max_bytes:
+            return
+
+        self._vary[base_key] = vary
+        key = self._key(base_key, headers)
+
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.size -= previous.size
+
+        self._entries[key] = _Entry(
+            out=dict(out),
+            size=size,
+            expires=expires,
+            etag=etag,
+            last_modified=last_modified,
+        )
+        self.size += size
+
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= evicted.size
+
+    @staticmethod
+    def _expires(response_headers: Mapping[str, str]) -> float:
+        cache_control = _parse_cache_control(response_headers)
+        if "no-cache" in cache_control:
+            return 0.0
+
+        try:
+            max_age = int(cache_control.get("max-age") or 0)
+            age = int(response_headers.get("Age") or 0)
+        except ValueError:
+            return 0.0
+
+        return time.monotonic() + max(max_age - age, 0)
+
+
+def _parse_cache_control(headers: Mapping[str, str]) -> dict[str, str]:
+    directives: dict[str, str] = {}
+    for directive in headers.get("Cache-Control", "").split(","):
+        name, _, value = directive.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"')
+    return directives
+
+
+def _sizeof(obj: Any) -> int:
+    if isinstance(obj, (bytes, bytearray, str)):
+        return len(obj)
+    if isinstance(obj, Mapping):
+        return sum(_sizeof(k) + _sizeof(v) for k, v in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return sum(_sizeof(v) for v in obj)
+    return sys.getsizeof(obj)
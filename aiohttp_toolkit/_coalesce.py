@@ -0,0 +1,126 @@
+from typing import Any, Optional, Callable, Hashable, Iterable
+import asyncio
+
+import multidict
+import yarl
+
+from .types import ResponseCbOut, Send
+
+
+__all__ = ("Coalescer",)
+
+
+class Coalescer:
+    """
+    A single-flight coalescer of identical in-flight requests.
+
+    Concurrent requests with the same key share one underlying request and
+    one response callback execution; every waiter gets a shallow copy of the
+    handled data and the same exception. The shared request runs as a
+    separate task, so a cancelled waiter does not cancel it for others; it is
+    cancelled only once every waiter is gone.
+
+    The default key is built from method, URL with query parameters, values
+    of request headers listed in `headers` and the response callback itself.
+    `response_callback_kwargs` are not a part of the key, so requests that
+    pass different callback kwargs must use different callbacks or a custom
+    `key`.
+
+    Attributes:
+        coalesced: number of requests that were answered by a shared request
+    """
+
+    def __init__(
+        self,
+        *,
+        methods: Iterable[str] = ("GET", "HEAD", "OPTIONS"),
+        headers: Iterable[str] = (),
+        key: Optional[Callable[..., Hashable]] = None,
+    ) -> None:
+        """
+        Args:
+            methods: Idempotent methods to coalesce. \
+                Defaults to `("GET", "HEAD", "OPTIONS")`.
+            headers: Names of request headers that are a part of the key. \
+                Defaults to `()`.
+            key: Function called as `key(response_callback, **request_kwargs)` \
+                to build the key, replacing the default one. Defaults to `None`.
+        """
+
+        self.methods = frozenset(methods)
+        self.headers = tuple(headers)
+        self.key = key or self._default_key
+        self.coalesced = 0
+
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        self._waiters: dict[Hashable, int] = {}
+
+    @property
+    def inflight(self) -> int:
+        """Number of shared requests in flight."""
+
+        return len(self._inflight)
+
+    def wrap(self, send: Send) -> Send:
+        """
+        Wrap a request sending function with the coalescer.
+
+        Used by `RequestHandler.request(..., coalescer=coalescer)`.
+        """
+
+        async def coalesced_send(
+            response_callback,
+            **request_kwargs,
+        ) -> ResponseCbOut:
+            if request_kwargs["method"] not in self.methods:
+                return await send(response_callback, **request_kwargs)
+
+            key = self.key(response_callback, **request_kwargs)
+
+            task = self._inflight.get(key)
+            if task is None:
+                task = asyncio.ensure_future(
+                    send(response_callback, **request_kwargs),
+                )
+                self._inflight[key] = task
+                self._waiters[key] = 0
+                task.add_done_callback(lambda _: self._forget(key, task))
+            else:
+                self.coalesced += 1
+
+            self._waiters[key] += 1
+            try:
+                out, err = await asyncio.shield(task)
+            except asyncio.CancelledError:
+                if not task.done():
+                    self._waiters[key] -= 1
+                    if not self._waiters[key]:
+                        self._forget(key, task)
+                        task.cancel()
+                raise
+
+            return dict(out), err
+
+        return coalesced_send
+
+    def _forget(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+            del self._waiters[key]
+
+    def _default_key(
+        self,
+        response_callback,
+        **request_kwargs,
+    ) -> Hashable:
+        url = yarl.URL(request_kwargs["url"]).extend_query(
+            request_kwargs.get("params") or {},
+        )
+        headers = multidict.CIMultiDict(request_kwargs.get("headers") or {})
+
+        return (
+            request_kwargs["method"],
+            str(url),
+            tuple(headers.get(name) for name in self.headers),
+            response_callback,
+        )
@@ -0,0 +1,247 @@
+from typing import Any, Optional, Callable, Hashable, Iterable, Literal
+import asyncio
+import collections
+import math
+import time
+
+import aiohttp
+
+from .types import ResponseCbOut, Send
+from ._ratelimit import _host_key
+
+
+__all__ = ("ConcurrencyLimiter",)
+
+
+class _Limit:
+    def __init__(self, limit: float) -> None:
+        self.limit = limit
+        self.inflight = 0
+        self.waiters: collections.deque[asyncio.Future] = collections.deque()
+        self.rtt = 0.0
+        self.long_rtt = 0.0
+
+    def wake(self) -> None:
+        while self.waiters and self.inflight < int(self.limit):
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                self.inflight += 1
+                waiter.set_result(None)
+
+    async def acquire(self) -> None:
+        if not self.waiters and self.inflight < int(self.limit):
+            self.inflight += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            else:
+                try:
+                    self.waiters.remove(waiter)
+                except ValueError:
+                    pass
+            raise
+
+    def release(self) -> None:
+        self.inflight -= 1
+        self.wake()
+
+
+class ConcurrencyLimiter:
+    """
+    An adaptive limiter of requests in flight, that finds the concurrency a
+    backend handles best from observed round-trip latency and errors.
+
+    Requests take a slot of their key (request host by default); once
+    `limit` slots are taken, they wait in FIFO order. The limit of every key
+    starts at `initial_limit` and is adjusted after every request, within
+    `min_limit` and `max_limit`:
+
+    - with `"aimd"` algorithm, it grows by `1 / limit` on success (about `1`
+      per round trip of all slots), and is multiplied by `backoff` on a drop:
+      an error, a response status in `statuses`, or round-trip latency over
+      `latency_threshold`;
+    - with `"gradient"` algorithm, it follows the ratio of long-term average
+      to current latency, clamped to `[0.5, 1.0]`, plus a queue allowance of
+      `sqrt(limit)`, smoothed with `smoothing`; drops multiply it by
+      `backoff` too.
+
+    The limit only grows while at least half of the slots are taken, so an
+    idle key does not inflate it. Round-trip latency includes the response
+    callback, since the response is consumed while the slot is taken.
+
+    A single limiter is meant to be shared between calls, for example across
+    a whole session.
+    """
+
+    def __init__(
+        self,
+        *,
+        algorithm: Literal["aimd", "gradient"] = "gradient",
+        initial_limit: int = 10,
+        min_limit: int = 1,
+        max_limit: int = 200,
+        backoff: float = 0.9,
+        latency_threshold: Optional[float] = None,
+        smoothing: float = 0.2,
+        decay: float = 0.01,
+        statuses: Iterable[int] = (429, 502, 503, 504),
+        key: Optional[Callable[..., Hashable]] = None,
+    ) -> None:
+        """
+        Args:
+            algorithm: Limit adjustment algorithm, `"aimd"` or `"gradient"`. \
+                Defaults to `"gradient"`.
+            initial_limit: Limit of a new key. Defaults to `10`.
+            min_limit: Lowest limit. Defaults to `1`.
+            max_limit: Highest limit. Defaults to `200`.
+            backoff: Multiplier of the limit on drops. Defaults to `0.9`.
+            latency_threshold: Round-trip latency, in seconds, counted as a \
+                drop by `"aimd"` algorithm. Defaults to `None`.
+            smoothing: Weight of a new limit of `"gradient"` algorithm. \
+                Defaults to `0.2`.
+            decay: Weight of the latest latency in long-term average. \
+                Defaults to `0.01`.
+            statuses: Response statuses counted as drops. \
+                Defaults to `(429, 502, 503, 504)`.
+            key: Function called as `key(**request_kwargs)` to pick a limit. \
+                Defaults to request host.
+        """
+
+        if algorithm not in ("aimd", "gradient"):
+            raise ValueError(f"unknown algorithm {algorithm!r}")
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError(
+                "limits must satisfy 1 <= min_limit <= initial_limit "
+                "<= max_limit",
+            )
+
+        self.algorithm = algorithm
+        self.initial_limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.latency_threshold = latency_threshold
+        self.smoothing = smoothing
+        self.decay = decay
+        self.statuses = frozenset(statuses)
+        self.key = key or _host_key
+
+        self._limits: dict[Hashable, _Limit] = {}
+
+    def limit(self, key: Hashable) -> int:
+        """Return the current limit of `key`."""
+
+        return int(self._get(key).limit)
+
+    def snapshot(self) -> dict[Hashable, dict[str, Any]]:
+        """
+        Return state of keys: current `limit`, requests `inflight`, requests
+        `queued` for a slot, and latest and long-term average round-trip
+        latency, `rtt` and `long_rtt`.
+        """
+
+        return {
+            key: dict(
+                limit=int(limit.limit),
+                inflight=limit.inflight,
+                queued=len(limit.waiters),
+                rtt=limit.rtt,
+                long_rtt=limit.long_rtt,
+            )
+            for key, limit in self._limits.items()
+        }
+
+    def wrap(self, send: Send) -> Send:
+        """
+        Wrap a request sending function with the limiter.
+
+        Used by `RequestHandler.request(..., concurrency=limiter)`.
+        """
+
+        async def limited_send(
+            response_callback,
+            **request_kwargs,
+        ) -> ResponseCbOut:
+            limit = self._get(self.key(**request_kwargs))
+            await limit.acquire()
+
+            status: Optional[int] = None
+
+            async def limited_callback(
+                cr: aiohttp.ClientResponse,
+                **kwargs,
+            ) -> ResponseCbOut:
+                nonlocal status
+                status = cr.status
+                return await response_callback(cr, **kwargs)
+
+            start = time.monotonic()
+            inflight = limit.inflight
+            try:
+                out, err = await send(limited_callback, **request_kwargs)
+            except asyncio.CancelledError:
+                limit.release()
+                raise
+            except Exception:
+                self._record(limit, time.monotonic() - start, inflight, True)
+                limit.release()
+                raise
+
+            dropped = (
+                (status is None and err is not None)
+                or status in self.statuses
+            )
+            self._record(limit, time.monotonic() - start, inflight, dropped)
+            limit.release()
+
+            return out, err
+
+        return limited_send
+
+    def _get(self, key: Hashable) -> _Limit:
+        limit = self._limits.get(key)
+        if limit is None:
+            limit = self._limits[key] = _Limit(self.initial_limit)
+        return limit
+
+    def _record(
+        self,
+        limit: _Limit,
+        rtt: float,
+        inflight: int,
+        dropped: bool,
+    ) -> None:
+        limit.rtt = rtt
+        long_rtt = limit.long_rtt or rtt
+        if not dropped:
+            limit.long_rtt = long_rtt + self.decay * (rtt - long_rtt)
+
+        if self.algorithm == "aimd" and (
+            self.latency_threshold is not None
+            and rtt > self.latency_threshold
+        ):
+            dropped = True
+
+        if dropped:
+            new_limit = limit.limit * self.backoff
+        elif inflight * 2 < limit.limit:
+            return
+        elif self.algorithm == "aimd":
+            new_limit = limit.limit + 1 / limit.limit
+        else:
+            gradient = max(0.5, min(1.0, long_rtt / rtt)) if rtt else 1.0
+            new_limit = (
+                (1 - self.smoothing) * limit.limit
+                + self.smoothing * (
+                    limit.limit * gradient + math.sqrt(limit.limit)
+                )
+            )
+
+        limit.limit = max(self.min_limit, min(self.max_limit, new_limit))
+        limit.wake()
@@ -0,0 +1,306 @@
+from typing import (
+    Any, Optional, Union, Callable, Awaitable, Iterable, AsyncIterable,
+    AsyncIterator,
+)
+import asyncio
+import concurrent.futures
+import importlib
+import multiprocessing.context
+import multiprocessing.util
+import os
+import pickle
+
+import aiohttp
+import multidict
+
+from .types import ResponseCbOut
+from ._handler import RequestHandler, _aiter
+
+
+__all__ = ("ProcessFanOut", "RemoteError")
+
+
+class RemoteError(Exception):
+    """
+    Returned in place of an exception raised in a worker process, that could
+    not be sent back to the parent process.
+    """
+
+
+class ProcessFanOut:
+    """
+    A multi-process executor of request batches.
+
+    Specs are sharded into chunks of `chunk_size` across `processes` worker
+    processes. Every worker runs its own event loop and a long-lived
+    `aiohttp.ClientSession`, and performs its chunks with
+    `RequestHandler.request_many`; results are streamed back to the parent
+    chunk by chunk, tagged with the index of the spec. At most two chunks per
+    worker are in flight, so specs are consumed lazily.
+
+    The response callback is sent to workers by pickling, so it must be
+    importable: callbacks built with `CallbackBuilder` are closures, and
+    should be passed by import path instead, as `"module:attribute"` (for
+    example `"aiohttp_toolkit.response_callbacks:json"`). Specs, callback
+    kwargs and handled data must be picklable too; response headers are
+    passed back as `multidict.CIMultiDictProxy`, and exceptions that can not
+    be pickled are replaced with `RemoteError`, as well as handled data that
+    can not be pickled (with `{}`). If a whole chunk fails, for example when
+    a worker process dies, every spec of it gets a `RemoteError`.
+
+    Can be used as a context manager, that calls `close` on exit.
+    """
+
+    def __init__(
+        self,
+        processes: Optional[int] = None,
+        *,
+        chunk_size: int = 256,
+        limit: int = 100,
+        limit_per_host: int = 0,
+        session_kwargs: Optional[dict[str, Any]] = None,
+        mp_context: Optional[multiprocessing.context.BaseContext] = None,
+    ) -> None:
+        """
+        Args:
+            processes: Number of worker processes. \
+                Defaults to `os.cpu_count()`.
+            chunk_size: Number of specs sent to a worker at once. \
+                Defaults to `256`.
+            limit: Maximum number of requests in flight per worker. \
+                Defaults to `100`.
+            limit_per_host: Maximum number of requests in flight to the same \
+                host per worker, `0` for no limit. Defaults to `0`.
+            session_kwargs: Kwargs of `aiohttp.ClientSession` of workers. \
+                Defaults to `None`.
+            mp_context: Multiprocessing context to start workers with. \
+                Defaults to `None`.
+        """
+
+        self.processes = processes or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+
+        self._executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=mp_context,
+            initializer=_initialize,
+            initargs=(session_kwargs or {},),
+        )
+
+    def __enter__(self) -> "ProcessFanOut":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut down worker processes, closing their sessions."""
+
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    async def request_many(
+        self,
+        response_callback: Union[
+            str, Callable[..., Awaitable[ResponseCbOut]],
+        ],
+        response_callback_kwargs: dict[str, Any],
+        specs: Union[Iterable[dict[str, Any]], AsyncIterable[dict[str, Any]]],
+    ) -> AsyncIterator[tuple[int, dict[str, Any], Optional[Exception]]]:
+        """
+        Perform a batch of HTTP requests in worker processes, yielding
+        results as chunks complete.
+
+        Args:
+            response_callback: Response callback, or its import path as \
+                `"module:attribute"`
+            response_callback_kwargs: Kwargs that are passed to response \
+                callback
+            specs: Iterable or async iterable of dictionaries, each one \
+                unpacked as `RequestHandler.request(**spec)` kwargs
+
+        Yields:
+            tuple[int, dict[str, Any], Optional[Exception]]: index of the spec
+            in `specs`, handled data and optional exception.
+        """
+
+        loop = asyncio.get_running_loop()
+        iterator = _aiter(specs)
+        pending: set[asyncio.Future] = set()
+        indexes: dict[asyncio.Future, list[int]] = {}
+        index = 0
+        exhausted = False
+
+        try:
+            while True:
+                while not exhausted and len(pending) < self.processes * 2:
+                    chunk: list[tuple[int, dict[str, Any]]] = []
+                    while len(chunk) < self.chunk_size:
+                        try:
+                            spec = await iterator.__anext__()
+                        except StopAsyncIteration:
+                            exhausted = True
+                            break
+                        chunk.append((index, spec))
+                        index += 1
+
+                    if not chunk:
+                        break
+
+                    future = loop.run_in_executor(
+                        self._executor,
+                        _run_chunk,
+                        response_callback,
+                        response_callback_kwargs,
+                        chunk,
+                        self.limit,
+                        self.limit_per_host,
+                    )
+                    pending.add(future)
+                    indexes[future] = [index_ for index_, _ in chunk]
+
+                if not pending:
+                    return
+
+                done, pending = await asyncio.wait(
+                    pending,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for future in done:
+                    chunk_indexes = indexes.pop(future)
+                    try:
+                        results = pickle.loads(future.result())
+                    except Exception as err:
+                        for index_ in chunk_indexes:
+                            yield index_, {}, RemoteError(
+                                f"{type(err).__name__}: {err}",
+                            )
+                        continue
+
+                    for index_, out, err, proxies in results:
+                        for key in proxies:
+                            out[key] = multidict.CIMultiDictProxy(out[key])
+                        yield index_, out, err
+
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+_worker: dict[str, Any] = {}
+
+
+def _initialize(session_kwargs: dict[str, Any]) -> None:
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    _worker.update(
+        loop=loop,
+        session=None,
+        session_kwargs=session_kwargs,
+        callbacks={},
+    )
+    multiprocessing.util.Finalize(None, _finalize, exitpriority=10)
+
+
+def _finalize() -> None:
+    loop: asyncio.AbstractEventLoop = _worker["loop"]
+    session: Optional[aiohttp.ClientSession] = _worker["session"]
+    if session is not None:
+        loop.run_until_complete(session.close())
+    loop.close()
+
+
+def _resolve(
+    response_callback: Union[str, Callable[..., Awaitable[ResponseCbOut]]],
+) -> Callable[..., Awaitable[ResponseCbOut]]:
+    if not isinstance(response_callback, str):
+        return response_callback
+
+    callbacks = _worker["callbacks"]
+    callback = callbacks.get(response_callback)
+    if callback is None:
+        module, _, attribute = response_callback.partition(":")
+        callback = getattr(importlib.import_module(module), attribute)
+        callbacks[response_callback] = callback
+    return callback
+
+
+def _run_chunk(
+    response_callback: Union[str, Callable[..., Awaitable[ResponseCbOut]]],
+    response_callback_kwargs: dict[str, Any],
+    chunk: list[tuple[int, dict[str, Any]]],
+    limit: int,
+    limit_per_host: int,
+) -> bytes:
+    loop: asyncio.AbstractEventLoop = _worker["loop"]
+    results = loop.run_until_complete(_request_chunk(
+        _resolve(response_callback),
+        response_callback_kwargs,
+        chunk,
+        limit,
+        limit_per_host,
+    ))
+
+    try:
+        return pickle.dumps(results)
+    except Exception:
+        return pickle.dumps([_picklable(*result) for result in results])
+
+
+def _picklable(
+    index: int,
+    out: dict[str, Any],
+    err: Optional[Exception],
+    proxies: tuple[str, ...],
+) -> tuple[int, dict[str, Any], Optional[Exception], tuple[str, ...]]:
+    try:
+        pickle.dumps(out)
+    except Exception as exc:
+        out, proxies = {}, ()
+        err = RemoteError(
+            f"handled data could not be pickled: {type(exc).__name__}: {exc}",
+        )
+
+    if err is not None:
+        try:
+            pickle.dumps(err)
+        except Exception:
+            err = RemoteError(f"{type(err).__name__}: {err}")
+
+    return index, out, err, proxies
+
+
+async def _request_chunk(
+    response_callback: Callable[..., Awaitable[ResponseCbOut]],
+    response_callback_kwargs: dict[str, Any],
+    chunk: list[tuple[int, dict[str, Any]]],
+    limit: int,
+    limit_per_host: int,
+) -> list[tuple[int, dict[str, Any], Optional[Exception], tuple[str, ...]]]:
+    session: Optional[aiohttp.ClientSession] = _worker["session"]
+    if session is None:
+        session = _worker["session"] = aiohttp.ClientSession(
+            **_worker["session_kwargs"],
+        )
+
+    results = []
+    async for position, out, err in RequestHandler.request_many(
+        session=session,
+        response_callback=response_callback,
+        response_callback_kwargs=response_callback_kwargs,
+        specs=(spec for _, spec in chunk),
+        limit=limit,
+        limit_per_host=limit_per_host,
+    ):
+        proxies = tuple(
+            key
+            for key, value in out.items()
+            if isinstance(value, multidict.CIMultiDictProxy)
+        )
+        for key in proxies:
+            out[key] = multidict.CIMultiDict(out[key])
+
+        results.append((chunk[position][0], out, err, proxies))
+
+    return results
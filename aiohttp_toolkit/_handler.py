@@ -1,6 +1,8 @@
 from typing import (
     Any, Optional, Union, Literal, Callable, Awaitable, Iterable, Mapping,
+    AsyncIterable, AsyncIterator,
 )
+import asyncio
 import types
 import ssl
 from http.cookies import BaseCookie
@@ -12,12 +14,30 @@ import multidict
 from .types import (
     ResponseCbOut,
     CbBuilderOut,
+    Send,
 )
+from ._cache import ResponseCache
+from ._coalesce import Coalescer
+from ._retry import RetryPolicy
+from ._breaker import CircuitBreaker
+from ._ratelimit import RateLimiter
+from ._concurrency import ConcurrencyLimiter
+from ._instrument import Instrumentation
+from ._hedge import HedgePolicy
+from ._balance import EndpointGroup
+from ._scheduler import RequestScheduler, SchedulerLane
+from ._streaming import _iter_lines, _iter_ndjson, _iter_sse
+from ._pipeline import Handlers, _handlers, _run_handlers
 
 
 __all__ = ("RequestHandler", "CallbackBuilder")
 
 
+_STREAM_TIMEOUT = aiohttp.ClientTimeout(
+    total=None, sock_connect=30, sock_read=300,
+)
+
+
 class RequestHandler:
     """
     A class for executing HTTP requests using `aiohttp` and handling the
@@ -32,6 +52,12 @@ class RequestHandler:
         `request` method performs an HTTP request, processes the response
         with a callback, and returns the handled data along with any
         exceptions.
+
+        `request_many` method performs a batch of HTTP requests with bounded
+        concurrency, yielding results as they complete.
+
+        `stream` method performs an HTTP request to a streaming endpoint,
+        yielding records parsed incrementally from the response body.
     """
 
     @staticmethod
@@ -126,6 +152,62 @@ class RequestHandler:
         except aiohttp.ClientError as err:
             return {}, err
 
+    @staticmethod
+    def _compose(
+        session: aiohttp.ClientSession,
+        response_callback: Callable[..., Awaitable[ResponseCbOut]],
+        response_callback_kwargs: dict[str, Any],
+        *,
+        cache: Optional[ResponseCache] = None,
+        coalescer: Optional[Coalescer] = None,
+        retry: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        concurrency: Optional[ConcurrencyLimiter] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        hedge: Optional[HedgePolicy] = None,
+        endpoints: Optional[EndpointGroup] = None,
+        scheduler: Optional[Union[RequestScheduler, SchedulerLane]] = None,
+    ) -> tuple[Send, Callable[..., Awaitable[ResponseCbOut]]]:
+        async def send(
+            response_callback: Callable[..., Awaitable[ResponseCbOut]],
+            **request_kwargs,
+        ) -> ResponseCbOut:
+            request_context = RequestHandler._prepare_request(
+                session=session,
+                **request_kwargs,
+            )
+
+            return await RequestHandler._process_request(
+                request_context=request_context,
+                response_callback=response_callback,
+                **response_callback_kwargs,
+            )
+
+        if instrumentation is not None:
+            response_callback = instrumentation.instrument(response_callback)
+            send = instrumentation.wrap(send)
+        if concurrency is not None:
+            send = concurrency.wrap(send)
+        if rate_limiter is not None:
+            send = rate_limiter.wrap(send)
+        if breaker is not None:
+            send = breaker.wrap(send)
+        if endpoints is not None:
+            send = endpoints.wrap(send)
+        if scheduler is not None:
+            send = scheduler.wrap(send)
+        if hedge is not None:
+            send = hedge.wrap(send)
+        if retry is not None:
+            send = retry.wrap(send)
+        if cache is not None:
+            send = cache.wrap(send)
+        if coalescer is not None:
+            send = coalescer.wrap(send)
+
+        return send, response_callback
+
     @staticmethod
     async def request(
         session: aiohttp.ClientSession,
@@ -143,6 +225,16 @@ class RequestHandler:
         max_redirects: int = 10,
         proxy: Optional[yarl.URL] = None,
         timeout: Optional[aiohttp.ClientTimeout] = None,
+        cache: Optional[ResponseCache] = None,
+        coalescer: Optional[Coalescer] = None,
+        retry: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        concurrency: Optional[ConcurrencyLimiter] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        hedge: Optional[HedgePolicy] = None,
+        endpoints: Optional[EndpointGroup] = None,
+        scheduler: Optional[Union[RequestScheduler, SchedulerLane]] = None,
         **kwargs,
     ) -> tuple[dict[str, Any], Optional[Exception]]:
         """
@@ -178,6 +270,27 @@ class RequestHandler:
                 Defaults to `10`.
             proxy: Proxy URL. Defaults to `None`.
             timeout: Override the session's timeout. Defaults to `None`.
+            cache: Response cache to answer `GET` and `HEAD` requests from. \
+                Defaults to `None`.
+            coalescer: Coalescer to share identical in-flight requests. \
+                Defaults to `None`.
+            retry: Retry policy to retry failed requests with. \
+                Defaults to `None`.
+            breaker: Circuit breaker to short-circuit requests to failing \
+                origins with. Defaults to `None`.
+            rate_limiter: Rate limiter to wait for a token from before \
+                every attempt. Defaults to `None`.
+            concurrency: Adaptive limiter of requests in flight to take a \
+                slot from for every attempt. Defaults to `None`.
+            instrumentation: Instrumentation to measure phase timings of \
+                every attempt with. Defaults to `None`.
+            hedge: Hedging policy to send duplicates of slow idempotent \
+                requests with. Defaults to `None`.
+            endpoints: Group of replica base URLs to resolve relative `url` \
+                against, balancing every attempt. Defaults to `None`.
+            scheduler: Scheduler (or its lane) to wait for an in-flight \
+                slot from before every attempt, shared fairly between \
+                classes of traffic. Defaults to `None`.
 
         Returns:
             tuple[dict[str, Any], Optional[Exception]]: tuple with handled data
@@ -199,8 +312,24 @@ class RequestHandler:
             ```
         """
 
-        request_context = RequestHandler._prepare_request(
+        send, response_callback = RequestHandler._compose(
             session=session,
+            response_callback=response_callback,
+            response_callback_kwargs=response_callback_kwargs,
+            cache=cache,
+            coalescer=coalescer,
+            retry=retry,
+            breaker=breaker,
+            rate_limiter=rate_limiter,
+            concurrency=concurrency,
+            instrumentation=instrumentation,
+            hedge=hedge,
+            endpoints=endpoints,
+            scheduler=scheduler,
+        )
+
+        out, err = await send(
+            response_callback,
             method=method,
             url=url,
             params=params,
@@ -214,13 +343,217 @@ class RequestHandler:
             timeout=timeout,
             **kwargs,
         )
+        return out, err
 
-        out, err = await RequestHandler._process_request(
-            request_context=request_context,
-            response_callback=response_callback,
-            **response_callback_kwargs,
+    @staticmethod
+    async def request_many(
+        session: aiohttp.ClientSession,
+        response_callback: Callable[..., Awaitable[ResponseCbOut]],
+        response_callback_kwargs: dict[str, Any],
+        specs: Union[Iterable[dict[str, Any]], AsyncIterable[dict[str, Any]]],
+        *,
+        limit: int = 100,
+        limit_per_host: int = 0,
+    ) -> AsyncIterator[tuple[int, dict[str, Any], Optional[Exception]]]:
+        """
+        Perform a batch of HTTP requests with bounded concurrency, yielding
+        results in completion order.
+
+        Specs are consumed lazily: at most `limit` requests are in flight (and
+        held in memory) at any moment, so batches of any size keep a flat
+        memory profile. Any exception of a single request (for example a
+        timeout, or raised by the response callback) is yielded as its
+        result, and does not abort the batch.
+
+        Args:
+            session: Interface for making HTTP requests
+            response_callback: Response callback that is used for every \
+                request, unless overridden by spec
+            response_callback_kwargs: Kwargs that are passed to response \
+                callback, unless overridden by spec
+            specs: Iterable or async iterable of dictionaries, each one \
+                unpacked as `RequestHandler.request(**spec)` kwargs \
+                (`method`, `url`, `params`, ...)
+            limit: Maximum number of requests in flight. Defaults to `100`.
+            limit_per_host: Maximum number of requests in flight to the same \
+                host, `0` for no limit. Defaults to `0`.
+
+        Yields:
+            tuple[int, dict[str, Any], Optional[Exception]]: index of the spec
+            in `specs`, handled data and optional exception.
+
+            ```python
+            specs = ({"method": "GET", "url": url} for url in urls)
+
+            async for index, out, err in aiohtk.RequestHandler.request_many(
+                session, aiohtk.callbacks.text, {}, specs, limit=50,
+            ):
+                if err:
+                    print(f"{urls[index]} failed: {err!r}")
+            ```
+        """
+
+        if limit < 1:
+            raise ValueError(f"limit must be positive, got {limit}")
+
+        host_semaphores: dict[Optional[str], asyncio.Semaphore] = {}
+
+        async def request(
+            spec: dict[str, Any],
+        ) -> tuple[dict[str, Any], Optional[Exception]]:
+            spec = dict(
+                response_callback=response_callback,
+                response_callback_kwargs=response_callback_kwargs,
+            ) | spec
+
+            if not limit_per_host:
+                return await RequestHandler.request(session, **spec)
+
+            host = yarl.URL(spec["url"]).host
+            semaphore = host_semaphores.get(host)
+            if semaphore is None:
+                semaphore = host_semaphores[host] = asyncio.Semaphore(
+                    limit_per_host,
+                )
+
+            async with semaphore:
+                return await RequestHandler.request(session, **spec)
+
+        async def run(
+            index: int,
+            spec: dict[str, Any],
+        ) -> tuple[int, dict[str, Any], Optional[Exception]]:
+            try:
+                out, err = await request(spec)
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:
+                return index, {}, err
+            return index, out, err
+
+        iterator = _aiter(specs)
+        pending: set[asyncio.Future] = set()
+        index = 0
+        exhausted = False
+
+        try:
+            while True:
+                while not exhausted and len(pending) < limit:
+                    try:
+                        spec = await iterator.__anext__()
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+
+                    pending.add(asyncio.ensure_future(run(index, spec)))
+                    index += 1
+
+                if not pending:
+                    return
+
+                done, pending = await asyncio.wait(
+                    pending,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    yield task.result()
+
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    @staticmethod
+    async def stream(
+        session: aiohttp.ClientSession,
+        *,
+        method: Literal["GET", "POST", "PUT", "DELETE", "PATCH"],
+        url: yarl.URL,
+        format: Literal["ndjson", "sse", "lines"] = "ndjson",
+        decoder: Optional[Callable[[bytes], Any]] = None,
+        max_line: int = 1 << 20,
+        timeout: Optional[aiohttp.ClientTimeout] = None,
+        **kwargs,
+    ) -> AsyncIterator[tuple[Any, Optional[Exception]]]:
+        """
+        Perform an HTTP request to a streaming endpoint, yielding records
+        parsed incrementally from the response body as it arrives, while
+        also using Golang-style return exception.
+
+        The body is read only as records are consumed, so buffering is
+        bounded by `max_line` and the connection's read buffer, and endless
+        streams can be consumed. The response is released when the stream
+        ends or the iterator is closed (call `aclose()` after `break` to
+        release it right away).
+
+        Args:
+            **kwargs: Passed to `aiohttp.ClientSession.request` (`params`, \
+                `headers`, `timeout`, ...)
+            session: Interface for making HTTP requests
+            method: HTTP method
+            url: Request URL
+            format: Framing of records: `"ndjson"` for newline-delimited \
+                JSON, `"sse"` for Server-Sent Events (dictionaries with \
+                `event`, `data`, `id` and `retry`), `"lines"` for raw lines \
+                as `bytes`. Defaults to `"ndjson"`.
+            decoder: Decoder of NDJSON records, called on raw line bytes. \
+                Defaults to `json.loads`.
+            max_line: Maximum size of a line, in bytes; longer lines stop \
+                the stream with `LineTooLongError`. Defaults to `1 << 20`.
+            timeout: Timeout of the stream. A `total` timeout would cut off \
+                long-lived feeds, so by default only connecting and waiting \
+                for the next chunk are limited. Defaults to \
+                `aiohttp.ClientTimeout(total=None, sock_connect=30, \
+                sock_read=300)`.
+
+        Yields:
+            tuple[Any, Optional[Exception]]: record and optional exception.
+            After an exception (connection error, timeout, error response
+            status, decoding error) the stream stops.
+
+            ```python
+            async for event, err in aiohtk.RequestHandler.stream(
+                session, method="GET", url=url, format="sse",
+            ):
+                if err:
+                    raise err
+                print(event["data"])
+            ```
+        """
+
+        if format not in ("ndjson", "sse", "lines"):
+            raise ValueError(f"unknown format {format!r}")
+
+        request_context = RequestHandler._prepare_request(
+            session=session,
+            method=method,
+            url=url,
+            timeout=timeout or _STREAM_TIMEOUT,
+            **kwargs,
         )
-        return out, err
+
+        try:
+            async with request_context as client_response:
+                client_response.raise_for_status()
+
+                records: AsyncIterator[Any]
+                if format == "ndjson":
+                    records = _iter_ndjson(
+                        client_response.content, max_line, decoder,
+                    )
+                elif format == "sse":
+                    records = _iter_sse(client_response.content, max_line)
+                else:
+                    records = _iter_lines(client_response.content, max_line)
+
+                async for record in records:
+                    yield record, None
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as err:
+            yield None, err
 
 
 class CallbackBuilder:
@@ -228,6 +561,10 @@ class CallbackBuilder:
     A utility class for building HTTP response callback handlers that can
     sequentially process data using a chain of handlers.
 
+    Built callbacks are compiled into a single flat list of handlers, which
+    is exposed as `handlers` attribute of the callback, so developing a
+    built callback does not nest pipelines.
+
     Methods:
         `build` method returns a callback function that will process an
         `aiohttp.ClientResponse` object using the provided handlers.
@@ -235,29 +572,38 @@ class CallbackBuilder:
         `develop` method returns a callback function that will process an
         `aiohttp.ClientResponse` object using the provided handlers, developing
         the built callback with new handlers.
+
+        `concurrent` method returns a handler that runs independent handlers
+        concurrently over the same data.
+
+        `dispatch` method returns a handler that picks a sub-pipeline by
+        response status.
     """
 
     @staticmethod
     def build(
         *handlers: Callable[
             [dict[str, Any], aiohttp.ClientResponse],
-            Awaitable[CbBuilderOut],
+            Union[CbBuilderOut, Awaitable[CbBuilderOut]],
         ],
     ) -> Callable[..., Awaitable[ResponseCbOut]]:
         """
-        Build a response callback function from a sequence of asynchronous
-        handlers.
+        Build a response callback function from a sequence of handlers.
 
-        Each handler is an asynchronous function that processes a data
-        dictionary and an `aiohttp.ClientResponse` object. The handlers are
-        executed in the order they are provided. If any handler returns an
-        error, the process is terminated, and the error is returned, while
-        also return a built prior to that handler dictionary.
+        Each handler is a function that processes a data dictionary and an
+        `aiohttp.ClientResponse` object. The handlers are executed in the
+        order they are provided, writing their fields directly into the same
+        data dictionary. If any handler returns an error, the process is
+        terminated, and the error is returned, while also return a built
+        prior to that handler dictionary.
+
+        Handlers may be either asynchronous or synchronous functions;
+        synchronous handlers are called without the overhead of an `await`.
 
         Args:
-            *handlers: A variable number of asynchronous handler functions,
-            each taking a dictionary and an `aiohttp.ClientResponse` object
-            as input and returning a modified dictionary and an error object.
+            *handlers: A variable number of handler functions, each taking a
+            dictionary and an `aiohttp.ClientResponse` object as input and
+            returning a modified dictionary and an error object.
 
         Returns:
             Callable[..., Awaitable[ResponseCbOut]]: An asynchronous callback
@@ -265,47 +611,33 @@ class CallbackBuilder:
             arguments.
         """
 
-        async def response_callback(
-            cr: aiohttp.ClientResponse,
-            **kwargs,
-        ) -> ResponseCbOut:
-            nonlocal handlers
-
-            out: dict[str, Any] = {}
-
-            for handler in handlers:
-                out, err = await handler(out, cr, **kwargs)
-                if err:
-                    return out, err
-
-            return out, None
-
-        return response_callback
+        return CallbackBuilder._compile(handlers)
 
     @staticmethod
     def develop(
         built: Callable[..., Awaitable[ResponseCbOut]],
         *handlers: Callable[
             [dict[str, Any], aiohttp.ClientResponse],
-            Awaitable[CbBuilderOut],
+            Union[CbBuilderOut, Awaitable[CbBuilderOut]],
         ],
     ) -> Callable[..., Awaitable[ResponseCbOut]]:
         """
-        Enhance an existing response callback with additional asynchronous
-        handlers, allowing further processing of the data.
+        Enhance an existing response callback with additional handlers,
+        allowing further processing of the data.
 
         The `develop` method takes an existing callback function (`built`) and
         appends additional handlers to it. The returned callback first executes
         the original callback, and then processes the output using the new
-        handlers sequentially.
+        handlers sequentially. If `built` was returned by `build` or
+        `develop`, its handlers are flattened into the new callback.
 
         Args:
             built: An existing asynchronous callback function that returns a
             dictionary and an error object after processing an
             `aiohttp.ClientResponse`.
-            *handlers: Additional asynchronous handler functions that take a
-            dictionary and an `aiohttp.ClientResponse` object as input,
-            returning a modified dictionary and an error object.
+            *handlers: Additional handler functions that take a dictionary
+            and an `aiohttp.ClientResponse` object as input, returning a
+            modified dictionary and an error object.
 
         Returns:
             Callable[..., Awaitable[ResponseCbOut]]: An asynchronous callback
@@ -313,21 +645,234 @@ class CallbackBuilder:
             processes its output with the additional handlers.
         """
 
-        async def response_callback(
+        built_handlers = getattr(built, "handlers", None)
+        if built_handlers is None:
+            async def built_handler(
+                data: dict[str, Any],
+                cr: aiohttp.ClientResponse,
+                **kwargs,
+            ) -> CbBuilderOut:
+                return await built(cr, **kwargs)
+
+            built_handlers = (built_handler,)
+
+        return CallbackBuilder._compile(built_handlers + handlers)
+
+    @staticmethod
+    def concurrent(
+        *branches: Union[
+            Callable[
+                [dict[str, Any], aiohttp.ClientResponse],
+                Union[CbBuilderOut, Awaitable[CbBuilderOut]],
+            ],
+            Iterable[Callable[
+                [dict[str, Any], aiohttp.ClientResponse],
+                Union[CbBuilderOut, Awaitable[CbBuilderOut]],
+            ]],
+        ],
+    ) -> Callable[..., Awaitable[CbBuilderOut]]:
+        """
+        Combine independent handlers into a single handler, that runs them
+        concurrently over the same data.
+
+        Each branch is a handler, or a sequence of handlers that are executed
+        one after another, and gets its own shallow copy of the data
+        dictionary. Once all branches are done, fields each branch added or
+        replaced are merged into the data in the order branches are provided,
+        so the result does not depend on which branch finishes first. If any
+        branch returns an error (or raises), the other branches are cancelled
+        and the error is returned with the data as it was before the group.
+
+        Branches share the response, so the body should be read before the
+        group (for example with `read`), rather than by several branches.
+
+        ```python
+        callback = CallbackBuilder.develop(
+            callbacks.read,
+            CallbackBuilder.concurrent(
+                builders.offload(orjson.loads, "json", source="read"),
+                builders.offload(sha256, "digest", source="read"),
+                (builders.headers, extract_metadata),
+            ),
+        )
+        ```
+
+        Args:
+            *branches: A variable number of handlers or sequences of
+            handlers.
+
+        Returns:
+            Callable[..., Awaitable[CbBuilderOut]]: An asynchronous handler,
+            that can be passed to `build` or `develop`.
+        """
+
+        pipelines = tuple(_handlers(branch) for branch in branches)
+
+        async def concurrent(
+            data: dict[str, Any],
             cr: aiohttp.ClientResponse,
             **kwargs,
-        ) -> ResponseCbOut:
-            nonlocal built, handlers
+        ) -> CbBuilderOut:
+            tasks = [
+                asyncio.ensure_future(
+                    _run_handlers(pipeline, dict(data), cr, kwargs),
+                )
+                for pipeline in pipelines
+            ]
+
+            try:
+                pending = set(tasks)
+                while pending:
+                    done, pending = await asyncio.wait(
+                        pending,
+                        return_when=asyncio.FIRST_COMPLETED,
+                    )
+                    for task in done:
+                        exc = task.exception()
+                        if exc is not None:
+                            if not isinstance(exc, Exception):
+                                raise exc
+                            return data, exc
+
+                        _, err = task.result()
+                        if err:
+                            return data, err
+            finally:
+                for task in tasks:
+                    if not task.done():
+                        task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+            merged: dict[str, Any] = {}
+            for task in tasks:
+                out, _ = task.result()
+                for key, value in out.items():
+                    if key not in data or data[key] is not value:
+                        merged[key] = value
+
+            data.update(merged)
+            return data, None
+
+        return concurrent
 
-            out, err = await built(cr, **kwargs)
-            if err:
-                return out, err
+    @staticmethod
+    def dispatch(
+        routes: Mapping[
+            Union[int, range],
+            Union[
+                Callable[
+                    [dict[str, Any], aiohttp.ClientResponse],
+                    Union[CbBuilderOut, Awaitable[CbBuilderOut]],
+                ],
+                Iterable[Callable[
+                    [dict[str, Any], aiohttp.ClientResponse],
+                    Union[CbBuilderOut, Awaitable[CbBuilderOut]],
+                ]],
+            ],
+        ],
+        default: Union[
+            Callable[
+                [dict[str, Any], aiohttp.ClientResponse],
+                Union[CbBuilderOut, Awaitable[CbBuilderOut]],
+            ],
+            Iterable[Callable[
+                [dict[str, Any], aiohttp.ClientResponse],
+                Union[CbBuilderOut, Awaitable[CbBuilderOut]],
+            ]],
+        ] = (),
+    ) -> Callable[..., Awaitable[CbBuilderOut]]:
+        """
+        Combine sub-pipelines into a single handler, that picks one of them
+        by response status.
+
+        Routes are keyed by an exact status code, or by a `range` of them;
+        exact codes take precedence over ranges, and ranges are checked in
+        the order they are provided. Responses matching no route go to
+        `default`. Each sub-pipeline is a handler, or a sequence of handlers
+        that are executed one after another.
+
+        This allows to skip downloading and parsing bodies of error
+        responses, for example:
+
+        ```python
+        callback = CallbackBuilder.build(
+            CallbackBuilder.dispatch(
+                {
+                    range(200, 300): (builders.status, builders.json),
+                },
+                default=(
+                    builders.status,
+                    builders.select_headers("Retry-After"),
+                    builders.discard(),
+                ),
+            ),
+        )
+        ```
 
-            for handler in handlers:
-                out, err = await handler(out, cr, **kwargs)
-                if err:
-                    return out, err
+        Args:
+            routes: Sub-pipelines keyed by status code or range of them.
+            default: Sub-pipeline of responses matching no route. \
+                Defaults to `()`, which passes data through.
+
+        Returns:
+            Callable[..., Awaitable[CbBuilderOut]]: An asynchronous handler,
+            that can be passed to `build` or `develop`.
+        """
+
+        exact: dict[int, Handlers] = {}
+        ranges: list[tuple[range, Handlers]] = []
+        for key, route in routes.items():
+            if isinstance(key, range):
+                ranges.append((key, _handlers(route)))
+            else:
+                exact[key] = _handlers(route)
+        fallback = _handlers(default)
 
-            return out, None
+        resolved: dict[int, Handlers] = {}
 
+        async def dispatch(
+            data: dict[str, Any],
+            cr: aiohttp.ClientResponse,
+            **kwargs,
+        ) -> CbBuilderOut:
+            pipeline = resolved.get(cr.status)
+            if pipeline is None:
+                pipeline = exact.get(cr.status)
+                if pipeline is None:
+                    pipeline = next(
+                        (
+                            route
+                            for statuses, route in ranges
+                            if cr.status in statuses
+                        ),
+                        fallback,
+                    )
+                resolved[cr.status] = pipeline
+
+            return await _run_handlers(pipeline, data, cr, kwargs)
+
+        return dispatch
+
+    @staticmethod
+    def _compile(
+        handlers: Handlers,
+    ) -> Callable[..., Awaitable[ResponseCbOut]]:
+        async def response_callback(
+            cr: aiohttp.ClientResponse,
+            **kwargs,
+        ) -> ResponseCbOut:
+            return await _run_handlers(handlers, {}, cr, kwargs)
+
+        setattr(response_callback, "handlers", handlers)
         return response_callback
+
+
+async def _aiter(
+    iterable: Union[Iterable[Any], AsyncIterable[Any]],
+) -> AsyncIterator[Any]:
+    if isinstance(iterable, AsyncIterable):
+        async for item in iterable:
+            yield item
+    else:
+        for item in iterable:
+            yield item
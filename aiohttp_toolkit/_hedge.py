@@ -0,0 +1,210 @@
+from typing import Any, Optional, Iterable
+import asyncio
+import collections
+import time
+
+import aiohttp
+import yarl
+
+from .types import ResponseCbOut, Send
+
+
+__all__ = ("HedgePolicy",)
+
+
+class HedgePolicy:
+    """
+    A hedging policy, that cuts tail latency of idempotent requests.
+
+    If no response has arrived `delay` seconds after a request was sent, a
+    duplicate request is sent, up to `max_hedges` times. No more duplicates
+    are sent once any response has arrived. The first response with a status
+    not in `statuses` wins: the others are cancelled, releasing their
+    connections, and only the winner runs the response callback. A response
+    with a status in `statuses` waits for the requests still without a
+    response, and wins only if they all fail. If `adaptive` is set, the
+    delay is the `quantile` of time to first response observed per host,
+    once `min_samples` are observed.
+
+    Hedging is capped to `max_ratio` of requests, so it can not double the
+    load during an outage.
+
+    Attributes:
+        requests: number of requests hedging was considered for
+        hedges: number of sent duplicate requests
+        wins: number of requests answered by a duplicate request
+    """
+
+    def __init__(
+        self,
+        *,
+        delay: float = 0.05,
+        adaptive: bool = True,
+        quantile: float = 0.95,
+        min_samples: int = 20,
+        window: int = 200,
+        max_hedges: int = 1,
+        max_ratio: float = 0.1,
+        methods: Iterable[str] = ("GET", "HEAD", "OPTIONS"),
+        statuses: Iterable[int] = (429, 500, 502, 503, 504),
+    ) -> None:
+        """
+        Args:
+            delay: Delay, in seconds, before sending a duplicate request. \
+                Defaults to `0.05`.
+            adaptive: Derive the delay from observed time to response per \
+                host. Defaults to `True`.
+            quantile: Quantile of observed time to response used as the \
+                delay. Defaults to `0.95`.
+            min_samples: Number of observations per host required to use \
+                the adaptive delay. Defaults to `20`.
+            window: Number of latest observations kept per host. \
+                Defaults to `200`.
+            max_hedges: Maximum number of duplicates per request. \
+                Defaults to `1`.
+            max_ratio: Maximum ratio of duplicates to requests. \
+                Defaults to `0.1`.
+            methods: Idempotent methods to hedge. \
+                Defaults to `("GET", "HEAD", "OPTIONS")`.
+            statuses: Response statuses, that do not win while other \
+                requests wait for a response. \
+                Defaults to `(429, 500, 502, 503, 504)`.
+        """
+
+        self.delay = delay
+        self.adaptive = adaptive
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self.window = window
+        self.max_hedges = max_hedges
+        self.max_ratio = max_ratio
+        self.methods = frozenset(methods)
+        self.statuses = frozenset(statuses)
+
+        self.requests = 0
+        self.hedges = 0
+        self.wins = 0
+
+        self._samples: dict[Optional[str], collections.deque] = {}
+
+    def hedge_delay(self, host: Optional[str]) -> float:
+        """Return the current delay before hedging requests to `host`."""
+
+        samples = self._samples.get(host)
+        if not self.adaptive or not samples or len(samples) < self.min_samples:
+            return self.delay
+
+        ordered = sorted(samples)
+        index = min(int(len(ordered) * self.quantile), len(ordered) - 1)
+        return ordered[index]
+
+    def wrap(self, send: Send) -> Send:
+        """
+        Wrap a request sending function with the hedging policy.
+
+        Used by `RequestHandler.request(..., hedge=policy)`.
+        """
+
+        async def hedged_send(
+            response_callback,
+            **request_kwargs,
+        ) -> ResponseCbOut:
+            if request_kwargs["method"] not in self.methods:
+                return await send(response_callback, **request_kwargs)
+
+            host = yarl.URL(request_kwargs["url"]).host
+            delay = self.hedge_delay(host)
+            self.requests += 1
+
+            start = time.monotonic()
+            tasks: list[asyncio.Future] = []
+            winner: Optional[asyncio.Future] = None
+            responded: set[asyncio.Future] = set()
+
+            async def attempt() -> ResponseCbOut:
+                async def hedge_callback(
+                    cr: aiohttp.ClientResponse,
+                    **kwargs,
+                ) -> ResponseCbOut:
+                    nonlocal winner
+
+                    if winner is not None:
+                        raise asyncio.CancelledError
+
+                    task = asyncio.current_task()
+                    if not responded:
+                        self._observe(host, time.monotonic() - start)
+                    responded.add(task)
+
+                    if cr.status in self.statuses:
+                        others = [
+                            other
+                            for other in tasks
+                            if other not in responded and not other.done()
+                        ]
+                        if others:
+                            await asyncio.wait(others)
+                        if winner is not None:
+                            raise asyncio.CancelledError
+
+                    winner = task
+                    for other in tasks:
+                        if other is not task:
+                            other.cancel()
+
+                    return await response_callback(cr, **kwargs)
+
+                return await send(hedge_callback, **request_kwargs)
+
+            tasks.append(asyncio.ensure_future(attempt()))
+            failed: Optional[asyncio.Future] = None
+
+            try:
+                while True:
+                    pending = [task for task in tasks if not task.done()]
+                    if not pending and failed is not None:
+                        return failed.result()
+
+                    timeout: Optional[float] = None
+                    if (
+                        not responded
+                        and len(tasks) <= self.max_hedges
+                        and self.hedges + 1 <= self.max_ratio * self.requests
+                    ):
+                        timeout = max(
+                            start + delay * len(tasks) - time.monotonic(), 0.0,
+                        )
+
+                    done, _ = await asyncio.wait(
+                        pending,
+                        timeout=timeout,
+                        return_when=asyncio.FIRST_COMPLETED,
+                    )
+
+                    if winner is not None and winner.done():
+                        if winner is not tasks[0]:
+                            self.wins += 1
+                        return winner.result()
+
+                    for task in done:
+                        if not task.cancelled():
+                            failed = task
+
+                    if not done and not responded:
+                        self.hedges += 1
+                        tasks.append(asyncio.ensure_future(attempt()))
+            finally:
+                for task in tasks:
+                    if not task.done():
+                        task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+        return hedged_send
+
+    def _observe(self, host: Optional[str], latency: float) -> None:
+        samples = self._samples.get(host)
+        if samples is None:
+            samples = self._samples[host] = collections.deque(
+                maxlen=self.window,
+            )
+        samples.append(latency)
@@ -0,0 +1,306 @@
+from typing import Any, Optional, Callable, Awaitable
+import contextvars
+import time
+import types
+
+import aiohttp
+import yarl
+
+from .types import ResponseCbOut, Send
+from ._pipeline import _run_handlers, _name
+
+
+__all__ = ("Instrumentation", "Histogram")
+
+
+_state: contextvars.ContextVar[Optional[dict[str, Any]]] = (
+    contextvars.ContextVar("aiohtk_instrumentation", default=None)
+)
+
+
+class Histogram:
+    """
+    A low-overhead histogram of durations, with power-of-two microsecond
+    buckets.
+
+    Attributes:
+        count: number of observed values
+        sum: sum of observed values, in seconds
+    """
+
+    __slots__ = ("count", "sum", "buckets")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.sum = 0.0
+        self.buckets = [0] * 64
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        self.buckets[min(int(value * 1e6).bit_length(), 63)] += 1
+
+    def quantile(self, q: float) -> float:
+        """
+        Return an estimate of `q` quantile, in seconds: the upper bound of
+        the bucket it falls into.
+        """
+
+        if not self.count:
+            return 0.0
+
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                return (1 << index) / 1e6
+        return (1 << 63) / 1e6
+
+    def snapshot(self) -> dict[str, float]:
+        return dict(
+            count=self.count,
+            sum=self.sum,
+            p50=self.quantile(0.5),
+            p90=self.quantile(0.9),
+            p99=self.quantile(0.99),
+        )
+
+
+class Instrumentation:
+    """
+    Phase-level timing instrumentation of requests.
+
+    Connection phases are measured by `trace_config`, which must be passed
+    to the session as `aiohttp.ClientSession(trace_configs=[...])`; each
+    request is linked to its timings through `trace_request_ctx`. Response
+    callbacks built by `CallbackBuilder` are timed per handler.
+
+    Phases, in seconds:
+        dns: host resolution, `0.0` if cached or reused
+        connect: connection creation, including TLS handshake, `0.0` if a
+        pooled connection was reused
+        ttfb: from the request start to the response headers
+        body: from the response headers to the last received body chunk
+        callback: response callback, with per-handler `handlers`
+        total: the whole request
+
+    Timings are aggregated into histograms per host (`hosts`) and per
+    callback (`callbacks`, keyed by joined handler names), and, if `report`
+    is set, added as `timings (dict[str, Any])` field to handled data.
+    Requests without instrumentation are not affected.
+    """
+
+    def __init__(self, *, report: bool = False) -> None:
+        self.report = report
+        self.hosts: dict[str, dict[str, Histogram]] = {}
+        self.callbacks: dict[str, dict[str, Histogram]] = {}
+
+        self._instrumented: dict[Callable, Callable] = {}
+
+        self.trace_config = aiohttp.TraceConfig()
+        self.trace_config.on_request_start.append(self._on_request_start)
+        self.trace_config.on_dns_resolvehost_start.append(self._on_dns_start)
+        self.trace_config.on_dns_resolvehost_end.append(self._on_dns_end)
+        self.trace_config.on_connection_create_start.append(
+            self._on_connect_start,
+        )
+        self.trace_config.on_connection_create_end.append(
+            self._on_connect_end,
+        )
+        self.trace_config.on_request_end.append(self._on_request_end)
+        self.trace_config.on_response_chunk_received.append(
+            self._on_response_chunk,
+        )
+
+    def snapshot(self) -> dict[str, dict[str, dict[str, dict[str, float]]]]:
+        """
+        Return histogram snapshots with `count`, `sum`, `p50`, `p90` and
+        `p99`, as `{"hosts": {host: {phase: ...}}, "callbacks": {...}}`.
+        """
+
+        return dict(
+            hosts={
+                host: {
+                    phase: histogram.snapshot()
+                    for phase, histogram in phases.items()
+                }
+                for host, phases in self.hosts.items()
+            },
+            callbacks={
+                name: {
+                    handler: histogram.snapshot()
+                    for handler, histogram in handlers.items()
+                }
+                for name, handlers in self.callbacks.items()
+            },
+        )
+
+    def instrument(
+        self,
+        response_callback: Callable[..., Awaitable[ResponseCbOut]],
+    ) -> Callable[..., Awaitable[ResponseCbOut]]:
+        """
+        Return a response callback that times `response_callback`, per
+        handler if it was built by `CallbackBuilder`.
+
+        Used by `RequestHandler.request(..., instrumentation=instrumentation)`.
+        """
+
+        timed = self._instrumented.get(response_callback)
+        if timed is not None:
+            return timed
+
+        handlers: Optional[tuple] = getattr(
+            response_callback, "handlers", None,
+        )
+        name = (
+            "+".join(_name(handler) for handler in handlers)
+            if handlers is not None
+            else _name(response_callback)
+        )
+
+        async def timed_callback(
+            cr: aiohttp.ClientResponse,
+            **kwargs,
+        ) -> ResponseCbOut:
+            state = _state.get()
+            if state is None:
+                return await response_callback(cr, **kwargs)
+
+            state["name"] = name
+            state["marks"]["callback"] = time.perf_counter()
+            try:
+                if handlers is None:
+                    return await response_callback(cr, **kwargs)
+
+                return await _run_handlers(
+                    handlers, {}, cr, kwargs, state["handlers"],
+                )
+            finally:
+                state["marks"]["callback_end"] = time.perf_counter()
+
+        self._instrumented[response_callback] = timed_callback
+        return timed_callback
+
+    def wrap(self, send: Send) -> Send:
+        """
+        Wrap a request sending function with the instrumentation.
+
+        Used by `RequestHandler.request(..., instrumentation=instrumentation)`.
+        """
+
+        async def instrumented_send(
+            response_callback,
+            **request_kwargs,
+        ) -> ResponseCbOut:
+            ctx = request_kwargs.get("trace_request_ctx")
+            if ctx is None:
+                ctx = types.SimpleNamespace()
+            marks: dict[str, float] = {}
+            setattr(ctx, "aiohtk_marks", marks)
+            request_kwargs = request_kwargs | dict(trace_request_ctx=ctx)
+
+            state: dict[str, Any] = dict(
+                name=_name(response_callback),
+                marks=marks,
+                handlers={},
+            )
+            token = _state.set(state)
+            try:
+                start = time.perf_counter()
+                out, err = await send(response_callback, **request_kwargs)
+                end = time.perf_counter()
+            finally:
+                _state.reset(token)
+
+            timings = self._timings(marks, start, end)
+            if state["handlers"]:
+                timings["handlers"] = state["handlers"]
+            self._observe(request_kwargs["url"], state["name"], timings)
+
+            if self.report and not err:
+                out["timings"] = timings
+
+            return out, err
+
+        return instrumented_send
+
+    @staticmethod
+    def _timings(
+        marks: dict[str, float],
+        start: float,
+        end: float,
+    ) -> dict[str, Any]:
+        def span(begin: str, finish: str) -> float:
+            if begin in marks and finish in marks:
+                return max(marks[finish] - marks[begin], 0.0)
+            return 0.0
+
+        return dict(
+            dns=span("dns", "dns_end"),
+            connect=span("connect", "connect_end"),
+            ttfb=span("request", "headers"),
+            body=span("headers", "chunk"),
+            callback=span("callback", "callback_end"),
+            total=end - start,
+        )
+
+    def _observe(
+        self,
+        url: Any,
+        name: str,
+        timings: dict[str, Any],
+    ) -> None:
+        host = str(yarl.URL(url).host)
+        phases = self.hosts.get(host)
+        if phases is None:
+            phases = self.hosts[host] = {}
+        for phase, value in timings.items():
+            if phase == "handlers":
+                continue
+            histogram = phases.get(phase)
+            if histogram is None:
+                histogram = phases[phase] = Histogram()
+            histogram.observe(value)
+
+        handlers = self.callbacks.get(name)
+        if handlers is None:
+            handlers = self.callbacks[name] = {}
+        for handler, value in timings.get("handlers", {}).items():
+            histogram = handlers.get(handler)
+            if histogram is None:
+                histogram = handlers[handler] = Histogram()
+            histogram.observe(value)
+
+    @staticmethod
+    def _mark(trace_config_ctx: types.SimpleNamespace, name: str) -> None:
+        ctx = trace_config_ctx.trace_request_ctx
+        marks = getattr(ctx, "aiohtk_marks", None)
+        if marks is not None:
+            marks[name] = time.perf_counter()
+
+    async def _on_request_start(self, session, trace_config_ctx, params):
+        ctx = trace_config_ctx.trace_request_ctx
+        marks = getattr(ctx, "aiohtk_marks", None)
+        if marks is not None and "request" not in marks:
+            marks["request"] = time.perf_counter()
+
+    async def _on_dns_start(self, session, trace_config_ctx, params):
+        self._mark(trace_config_ctx, "dns")
+
+    async def _on_dns_end(self, session, trace_config_ctx, params):
+        self._mark(trace_config_ctx, "dns_end")
+
+    async def _on_connect_start(self, session, trace_config_ctx, params):
+        self._mark(trace_config_ctx, "connect")
+
+    async def _on_connect_end(self, session, trace_config_ctx, params):
+        self._mark(trace_config_ctx, "connect_end")
+
+    async def _on_request_end(self, session, trace_config_ctx, params):
+        self._mark(trace_config_ctx, "headers")
+
+    async def _on_response_chunk(self, session, trace_config_ctx, params):
+        self._mark(trace_config_ctx, "chunk")
+
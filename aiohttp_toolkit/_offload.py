@@ -0,0 +1,96 @@
+from typing import Any, Optional, Callable
+import asyncio
+import concurrent.futures
+import time
+
+
+__all__ = ("OffloadPool",)
+
+
+class OffloadPool:
+    """
+    A thread or process pool that CPU-heavy parts of callback handlers are
+    offloaded to (see `offload` callback builder), with queue-depth metrics
+    to see when it is saturated.
+
+    Attributes:
+        workers: number of pool workers
+        pending: number of submitted and not yet completed calls
+        max_pending: maximum `pending` seen
+        completed: number of completed calls
+        busy: total duration, in seconds, of completed calls, including
+        queueing
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        *,
+        processes: bool = False,
+        executor: Optional[concurrent.futures.Executor] = None,
+    ) -> None:
+        """
+        Args:
+            workers: Number of workers of the created pool. Defaults to the \
+                default of `concurrent.futures` pools.
+            processes: Create a process pool instead of a thread pool, \
+                offloaded functions must be picklable. Defaults to `False`.
+            executor: Existing executor to use instead of creating a pool, \
+                `workers` must be set to report queue depth. \
+                Defaults to `None`.
+        """
+
+        if executor is None:
+            executor_type = (
+                concurrent.futures.ProcessPoolExecutor if processes
+                else concurrent.futures.ThreadPoolExecutor
+            )
+            executor = executor_type(max_workers=workers)
+            workers = getattr(executor, "_max_workers", workers)
+
+        self.executor = executor
+        self.workers = workers or 1
+        self.pending = 0
+        self.max_pending = 0
+        self.completed = 0
+        self.busy = 0.0
+
+    @property
+    def queued(self) -> int:
+        """Number of calls waiting for a free worker."""
+
+        return max(self.pending - self.workers, 0)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Return pool metrics: `workers`, `pending`, `queued`, `max_pending`,
+        `completed` and `busy`.
+        """
+
+        return dict(
+            workers=self.workers,
+            pending=self.pending,
+            queued=self.queued,
+            max_pending=self.max_pending,
+            completed=self.completed,
+            busy=self.busy,
+        )
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run `func(*args)` in the pool."""
+
+        loop = asyncio.get_running_loop()
+        self.pending += 1
+        self.max_pending = max(self.max_pending, self.pending)
+        start = time.perf_counter()
+        try:
+            return await loop.run_in_executor(self.executor, func, *args)
+        finally:
+            self.pending -= 1
+            self.completed += 1
+            self.busy += time.perf_counter() - start
+
+    def close(self) -> None:
+        """Shut down the pool."""
+
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,287 @@
+from typing import (
+    Any, Optional, Union, Callable, Awaitable, Iterable, AsyncIterator,
+)
+import asyncio
+import re
+
+import aiohttp
+import yarl
+
+from .types import ResponseCbOut
+from ._handler import RequestHandler
+
+
+__all__ = ("Paginator",)
+
+
+NextPage = Callable[
+    [dict[str, Any], list[Any], dict[str, Any]],
+    Optional[dict[str, Any]],
+]
+
+_link_re = re.compile(r"<([^>]*)>([^<]*)")
+_rel_re = re.compile(
+    r"""rel\s*=\s*(?:"([^"]*)"|([^\s;,]*))""",
+    re.IGNORECASE,
+)
+
+
+class Paginator:
+    """
+    An async iterator over items of a paginated API, that fetches the next
+    page while the consumer processes the current one.
+
+    Pages are fetched one after another by a background task with
+    `RequestHandler.request`, and handed over through a queue of `prefetch`
+    pages, so at most `prefetch + 1` pages are held in memory ahead of the
+    consumer. After every page, `next_page(out, items, request_kwargs)`
+    returns request kwargs of the next page, or `None` to stop; `cursor`,
+    `link` and `offset` build it for common styles. Iteration also stops at
+    an empty page, after `max_pages`, or on an error.
+
+    Following the Golang-style contract, errors are not raised: iterating
+    stops, and the error is stored as `err`.
+
+    ```python
+    paginator = Paginator(
+        session,
+        callbacks.json,
+        {},
+        Paginator.cursor("meta.next", param="cursor"),
+        items="data",
+        method="GET",
+        url="https://api.example.com/users",
+    )
+
+    async for user in paginator:
+        ...
+    if paginator.err:
+        raise paginator.err
+    ```
+
+    Attributes:
+        err: error that stopped iteration, if any
+        pages_fetched: number of fetched pages
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        response_callback: Callable[..., Awaitable[ResponseCbOut]],
+        response_callback_kwargs: dict[str, Any],
+        next_page: NextPage,
+        *,
+        items: Union[str, Callable[[dict[str, Any]], Iterable[Any]]] = "",
+        prefetch: int = 1,
+        max_pages: Optional[int] = None,
+        **request_kwargs,
+    ) -> None:
+        """
+        Args:
+            **request_kwargs: Kwargs of the first page request, unpacked as \
+                `RequestHandler.request(**request_kwargs)` (`method`, `url`, \
+                `params`, policies, ...)
+            session: Interface for making HTTP requests
+            response_callback: Response callback of every page
+            response_callback_kwargs: Kwargs that are passed to response \
+                callback
+            next_page: Function returning request kwargs of the next page
+            items: Function extracting items from handled data, or a \
+                dot-separated path in its `json` field. Defaults to `""`, \
+                the whole `json` field.
+            prefetch: Number of pages fetched ahead of the consumer. \
+                Defaults to `1`.
+            max_pages: Maximum number of pages to fetch. Defaults to `None`.
+        """
+
+        if prefetch < 1:
+            raise ValueError(f"prefetch must be positive, got {prefetch}")
+
+        self.session = session
+        self.response_callback = response_callback
+        self.response_callback_kwargs = response_callback_kwargs
+        self.next_page = next_page
+        self.items = (
+            items if callable(items)
+            else lambda out: _resolve(out["json"], items)
+        )
+        self.prefetch = prefetch
+        self.max_pages = max_pages
+        self.request_kwargs = request_kwargs
+
+        self.err: Optional[Exception] = None
+        self.pages_fetched = 0
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        return self._iter_items()
+
+    async def pages(
+        self,
+    ) -> AsyncIterator[tuple[dict[str, Any], list[Any], Optional[Exception]]]:
+        """
+        Iterate over pages instead of items.
+
+        Yields:
+            tuple[dict[str, Any], list[Any], Optional[Exception]]: handled
+            data, items of the page and optional exception, the last page
+            if set.
+        """
+
+        self.err = None
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.prefetch)
+        producer = asyncio.ensure_future(self._produce(queue))
+
+        try:
+            while True:
+                page = await queue.get()
+                if page is None:
+                    break
+
+                out, items, err = page
+                if err is not None:
+                    self.err = err
+                yield out, items, err
+
+            await producer
+        finally:
+            if not producer.done():
+                producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+
+    async def _iter_items(self) -> AsyncIterator[Any]:
+        async for _, items, err in self.pages():
+            if err is not None:
+                return
+            for item in items:
+                yield item
+
+    async def _produce(self, queue: asyncio.Queue) -> None:
+        request_kwargs: Optional[dict[str, Any]] = self.request_kwargs
+        pages = 0
+
+        try:
+            while request_kwargs is not None and (
+                self.max_pages is None or pages < self.max_pages
+            ):
+                out, err = await RequestHandler.request(
+                    session=self.session,
+                    response_callback=self.response_callback,
+                    response_callback_kwargs=self.response_callback_kwargs,
+                    **request_kwargs,
+                )
+                pages += 1
+                self.pages_fetched += 1
+
+                items: list[Any] = []
+                if err is None:
+                    try:
+                        items = list(self.items(out))
+                        if items:
+                            request_kwargs = self.next_page(
+                                out, items, request_kwargs,
+                            )
+                        else:
+                            request_kwargs = None
+                    except Exception as exc:
+                        err = exc
+
+                await queue.put((out, items, err))
+                if err is not None:
+                    break
+        except Exception as exc:
+            await queue.put(({}, [], exc))
+
+        await queue.put(None)
+
+    @staticmethod
+    def cursor(
+        field: str,
+        *,
+        param: str = "cursor",
+    ) -> NextPage:
+        """
+        Next page of cursor-style pagination: the cursor is read from a
+        dot-separated path `field` in `json` field of handled data, and sent
+        as `param` query parameter. Stops at an empty or missing cursor.
+        """
+
+        def next_page(
+            out: dict[str, Any],
+            items: list[Any],
+            request_kwargs: dict[str, Any],
+        ) -> Optional[dict[str, Any]]:
+            try:
+                cursor = _resolve(out["json"], field)
+            except (KeyError, IndexError, TypeError):
+                return None
+            if cursor in (None, ""):
+                return None
+
+            params = dict(request_kwargs.get("params") or {})
+            params[param] = str(cursor)
+            return request_kwargs | dict(params=params)
+
+        return next_page
+
+    @staticmethod
+    def link(rel: str = "next") -> NextPage:
+        """
+        Next page of `Link` header pagination (RFC 8288), as used by GitHub
+        and others: follows the link with `rel` relation, resolved against
+        the current URL. Handled data must have `headers` field.
+        """
+
+        def next_page(
+            out: dict[str, Any],
+            items: list[Any],
+            request_kwargs: dict[str, Any],
+        ) -> Optional[dict[str, Any]]:
+            for value in out["headers"].getall("Link", ()):
+                for target, link_params in _link_re.findall(value):
+                    match = _rel_re.search(link_params)
+                    if match is None:
+                        continue
+                    rels = (match.group(1) or match.group(2)).split()
+                    if rel in rels:
+                        url = yarl.URL(request_kwargs["url"]).join(
+                            yarl.URL(target),
+                        )
+                        return request_kwargs | dict(url=url, params={})
+
+            return None
+
+        return next_page
+
+    @staticmethod
+    def offset(
+        size: int,
+        *,
+        param: str = "offset",
+        start: int = 0,
+    ) -> NextPage:
+        """
+        Next page of offset-style pagination: `param` query parameter is
+        advanced by `size` items per page (use `size=1` and `param="page"`
+        for page numbers). Stops at a page shorter than `size` items.
+        """
+
+        def next_page(
+            out: dict[str, Any],
+            items: list[Any],
+            request_kwargs: dict[str, Any],
+        ) -> Optional[dict[str, Any]]:
+            if len(items) < size:
+                return None
+
+            params = dict(request_kwargs.get("params") or {})
+            offset = int(params.get(param, start)) + size
+            params[param] = str(offset)
+            return request_kwargs | dict(params=params)
+
+        return next_page
+
+
+def _resolve(value: Any, path: str) -> Any:
+    for key in path.split(".") if path else ():
+        value = value[int(key) if isinstance(value, list) else key]
+    return value
@@ -0,0 +1,53 @@
+from typing import Any, Optional, Union, Callable, Iterable
+import time
+
+import aiohttp
+
+from .types import CbBuilderOut
+
+
+Handlers = tuple[Callable[..., Any], ...]
+
+
+def _handlers(
+    handlers: Union[Callable[..., Any], Iterable[Callable[..., Any]]],
+) -> Handlers:
+    if callable(handlers):
+        return (handlers,)
+    return tuple(handlers)
+
+
+async def _run_handlers(
+    handlers: Handlers,
+    out: dict[str, Any],
+    cr: aiohttp.ClientResponse,
+    kwargs: dict[str, Any],
+    timings: Optional[dict[str, float]] = None,
+) -> CbBuilderOut:
+    """
+    Run callback builder handlers one after another over `out`, stopping at
+    the first error. Handlers may be asynchronous, or return their result
+    right away; the latter is told apart by the returned tuple, so it is not
+    awaited. If `timings` is set, handler durations are written into it.
+    """
+
+    for handler in handlers:
+        if timings is not None:
+            start = time.perf_counter()
+
+        result = handler(out, cr, **kwargs)
+        if result.__class__ is not tuple:
+            result = await result
+        out, err = result
+
+        if timings is not None:
+            timings[_name(handler)] = time.perf_counter() - start
+
+        if err:
+            return out, err
+
+    return out, None
+
+
+def _name(handler: Any) -> str:
+    return getattr(handler, "__name__", type(handler).__name__)
@@ -0,0 +1,186 @@
+from typing import Any, Optional, Union, Callable, Awaitable, Mapping
+import functools
+import urllib.parse
+
+import aiohttp
+import multidict
+import yarl
+
+from .types import ResponseCbOut
+from ._handler import RequestHandler
+from ._cache import ResponseCache
+from ._coalesce import Coalescer
+from ._retry import RetryPolicy
+from ._breaker import CircuitBreaker
+from ._ratelimit import RateLimiter
+from ._concurrency import ConcurrencyLimiter
+from ._instrument import Instrumentation
+from ._hedge import HedgePolicy
+from ._balance import EndpointGroup
+from ._scheduler import RequestScheduler, SchedulerLane
+
+
+__all__ = ("PreparedEndpoint",)
+
+
+class PreparedEndpoint:
+    """
+    A request template, that binds everything constant about requests to an
+    endpoint once, so repeated calls only pass what varies.
+
+    Session, method, URL template, default headers and params, callback with
+    its kwargs and request policies are bound on creation: default headers
+    are encoded into an immutable multidict, and the chain of request
+    policies is composed once. Every call formats path params into the URL
+    template (`{name}` placeholders, values are percent-encoded), and caches
+    up to `url_cache_size` resolved URLs.
+
+    ```python
+    get_user = aiohtk.PreparedEndpoint(
+        session,
+        aiohtk.callbacks.json,
+        {},
+        method="GET",
+        url="https://api.example.com/users/{user_id}",
+        headers={"Authorization": "Bearer token"},
+        retry=aiohtk.RetryPolicy(),
+    )
+
+    out, err = await get_user({"user_id": 42}, params={"fields": "name"})
+    ```
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        response_callback: Callable[..., Awaitable[ResponseCbOut]],
+        response_callback_kwargs: dict[str, Any],
+        *,
+        method: str,
+        url: Union[str, yarl.URL],
+        params: Optional[Mapping[str, str]] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        timeout: Optional[aiohttp.ClientTimeout] = None,
+        url_cache_size: int = 1024,
+        cache: Optional[ResponseCache] = None,
+        coalescer: Optional[Coalescer] = None,
+        retry: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        concurrency: Optional[ConcurrencyLimiter] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        hedge: Optional[HedgePolicy] = None,
+        endpoints: Optional[EndpointGroup] = None,
+        scheduler: Optional[Union[RequestScheduler, SchedulerLane]] = None,
+        **kwargs,
+    ) -> None:
+        """
+        Args:
+            **kwargs: Passed to `aiohttp.ClientSession.request` on every call
+            session: Interface for making HTTP requests
+            response_callback: Response callback
+            response_callback_kwargs: Kwargs that are passed to response \
+                callback
+            method: HTTP method
+            url: Request URL, or URL template with `{name}` path placeholders
+            params: Default query parameters. Defaults to `None`.
+            headers: Default HTTP headers. Defaults to `None`.
+            timeout: Override the session's timeout. Defaults to `None`.
+            url_cache_size: Number of resolved URLs to cache. \
+                Defaults to `1024`.
+            cache, coalescer, retry, breaker, rate_limiter, concurrency, \
+                instrumentation, hedge, endpoints, scheduler: Request \
+                policies, as in `RequestHandler.request`. Default to `None`.
+        """
+
+        self.method = method
+        self.url = str(url)
+        self.params = dict(params or {})
+        self.headers = multidict.CIMultiDictProxy(
+            multidict.CIMultiDict(headers or {}),
+        )
+
+        self._send, self._response_callback = RequestHandler._compose(
+            session=session,
+            response_callback=response_callback,
+            response_callback_kwargs=response_callback_kwargs,
+            cache=cache,
+            coalescer=coalescer,
+            retry=retry,
+            breaker=breaker,
+            rate_limiter=rate_limiter,
+            concurrency=concurrency,
+            instrumentation=instrumentation,
+            hedge=hedge,
+            endpoints=endpoints,
+            scheduler=scheduler,
+        )
+        self._kwargs = dict(timeout=timeout, **kwargs)
+
+        self._static_url = (
+            None if "{" in self.url
+            else yarl.URL(self.url)
+        )
+        self._format_url = functools.lru_cache(maxsize=url_cache_size)(
+            self._format_url,
+        )
+
+    async def __call__(
+        self,
+        path_params: Optional[Mapping[str, Any]] = None,
+        *,
+        params: Optional[Mapping[str, str]] = None,
+        data: Optional[Any] = None,
+        json: Optional[Any] = None,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> tuple[dict[str, Any], Optional[Exception]]:
+        """
+        Perform a request to the endpoint.
+
+        Args:
+            path_params: Values of URL template placeholders. \
+                Defaults to `None`.
+            params: Query parameters, merged over default ones. \
+                Defaults to `None`.
+            data: The data to send in the body of the request. \
+                Defaults to `None`.
+            json: Any json compatible python object. Defaults to `None`.
+            headers: HTTP headers, merged over default ones. \
+                Defaults to `None`.
+
+        Returns:
+            tuple[dict[str, Any], Optional[Exception]]: tuple with handled data
+            and optional exception, as `RequestHandler.request`.
+        """
+
+        if self._static_url is not None:
+            url = self._static_url
+        else:
+            url = self._format_url(tuple(sorted((path_params or {}).items())))
+
+        if headers:
+            merged = multidict.CIMultiDict(self.headers)
+            merged.update(headers)
+            headers = merged
+        else:
+            headers = self.headers
+
+        out, err = await self._send(
+            self._response_callback,
+            method=self.method,
+            url=url,
+            params=self.params | dict(params) if params else self.params,
+            data=data,
+            json=json,
+            headers=headers,
+            **self._kwargs,
+        )
+        return out, err
+
+    def _format_url(self, path_params: tuple[tuple[str, Any], ...]) -> yarl.URL:
+        return yarl.URL(
+            self.url.format(**{
+                name: urllib.parse.quote(str(value), safe="")
+                for name, value in path_params
+            }),
+        )
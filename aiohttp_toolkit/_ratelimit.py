@@ -0,0 +1,217 @@
+from typing import Any, Optional, Callable, Hashable, Mapping
+import asyncio
+import time
+
+import aiohttp
+import yarl
+
+from .types import ResponseCbOut, Send
+from ._retry import _parse_retry_after
+
+
+__all__ = ("RateLimiter",)
+
+
+# `RateLimit-Reset` values above this are Unix timestamps, not seconds
+_EPOCH = 1e9
+
+
+class _Bucket:
+    def __init__(self, rate: float, burst: float) -> None:
+        self.base_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.restore_at = 0.0
+        self.lock = asyncio.Lock()
+
+    def refill(self, now: float) -> None:
+        if self.restore_at and now >= self.restore_at:
+            self.tokens = min(
+                self.burst,
+                self.tokens + (self.restore_at - self.updated) * self.rate,
+            )
+            self.updated = self.restore_at
+            self.rate = self.base_rate
+            self.restore_at = 0.0
+
+        self.tokens = min(
+            self.burst,
+            self.tokens + (now - self.updated) * self.rate,
+        )
+        self.updated = now
+
+    async def acquire(self) -> float:
+        start = time.monotonic()
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    await asyncio.sleep(self.blocked_until - now)
+                    continue
+
+                self.refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return now - start
+
+                delay = (1 - self.tokens) / self.rate
+                if self.restore_at:
+                    delay = min(delay, self.restore_at - now)
+                await asyncio.sleep(delay)
+
+
+class RateLimiter:
+    """
+    A client-side token bucket rate limiter.
+
+    Requests take a token from the bucket of their key (request host by
+    default), which holds up to `burst` tokens and is refilled with `rate`
+    tokens per second. Requests that find the bucket empty wait in FIFO
+    order, sleeping until the next token is due.
+
+    The rate is adjusted on the fly from response headers: `Retry-After` on
+    `429` and `503` responses pauses the bucket, `RateLimit-Remaining` and
+    `RateLimit-Reset` (or their `X-RateLimit-*` variants) lower the rate to
+    spread the remaining quota until the reset, but never above `rate`, and
+    `rate` is restored once the reset is due. `RateLimit-Reset` is read as
+    seconds, or as a Unix timestamp if it is that large, as sent by GitHub.
+    A pause from a single response is capped by `max_block`.
+
+    A single limiter is meant to be shared between calls, for example across
+    a whole session.
+
+    Attributes:
+        waited: total time, in seconds, requests have waited for tokens
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float = 1.0,
+        *,
+        key: Optional[Callable[..., Hashable]] = None,
+        feedback: bool = True,
+        max_block: float = 3600.0,
+    ) -> None:
+        """
+        Args:
+            rate: Tokens added per second.
+            burst: Bucket size. Defaults to `1.0`.
+            key: Function called as `key(**request_kwargs)` to pick a bucket, \
+                for example by API key. Defaults to request host.
+            feedback: Adjust the rate from response headers. \
+                Defaults to `True`.
+            max_block: Longest pause or rate reduction, in seconds, from \
+                response headers. Defaults to `3600.0`.
+        """
+
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+
+        self.rate = rate
+        self.burst = burst
+        self.key = key or _host_key
+        self.feedback = feedback
+        self.max_block = max_block
+        self.waited = 0.0
+
+        self._buckets: dict[Hashable, _Bucket] = {}
+
+    def bucket(self, key: Hashable) -> dict[str, float]:
+        """Return `rate` and available `tokens` of the bucket of `key`."""
+
+        bucket = self._get(key)
+        bucket.refill(time.monotonic())
+        return dict(
+            rate=bucket.rate,
+            tokens=bucket.tokens,
+        )
+
+    async def acquire(self, key: Hashable) -> None:
+        """Wait for and take a token from the bucket of `key`."""
+
+        self.waited += await self._get(key).acquire()
+
+    def wrap(self, send: Send) -> Send:
+        """
+        Wrap a request sending function with the rate limiter.
+
+        Used by `RequestHandler.request(..., rate_limiter=limiter)`.
+        """
+
+        async def limited_send(
+            response_callback,
+            **request_kwargs,
+        ) -> ResponseCbOut:
+            key = self.key(**request_kwargs)
+            await self.acquire(key)
+
+            if not self.feedback:
+                return await send(response_callback, **request_kwargs)
+
+            async def feedback_callback(
+                cr: aiohttp.ClientResponse,
+                **kwargs,
+            ) -> ResponseCbOut:
+                self._feedback(self._get(key), cr.status, cr.headers)
+                return await response_callback(cr, **kwargs)
+
+            return await send(feedback_callback, **request_kwargs)
+
+        return limited_send
+
+    def _get(self, key: Hashable) -> _Bucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _Bucket(self.rate, self.burst)
+        return bucket
+
+    def _feedback(
+        self,
+        bucket: _Bucket,
+        status: int,
+        headers: Mapping[str, str],
+    ) -> None:
+        now = time.monotonic()
+
+        if status in (429, 503):
+            retry_after = _parse_retry_after(headers)
+            if retry_after is not None:
+                bucket.blocked_until = max(
+                    bucket.blocked_until,
+                    now + min(retry_after, self.max_block),
+                )
+
+        remaining = _header_float(headers, "RateLimit-Remaining")
+        reset = _header_float(headers, "RateLimit-Reset")
+        if remaining is None or reset is None:
+            return
+
+        if reset > _EPOCH:
+            reset -= time.time()
+        reset = max(0.0, min(reset, self.max_block))
+
+        if remaining < 1:
+            bucket.blocked_until = max(bucket.blocked_until, now + reset)
+        elif reset > 0:
+            bucket.refill(now)
+            bucket.rate = min(self.rate, remaining / reset)
+            bucket.restore_at = now + reset
+
+
+def _host_key(**request_kwargs: Any) -> Hashable:
+    return yarl.URL(request_kwargs["url"]).host
+
+
+def _header_float(headers: Mapping[str, str], name: str) -> Optional[float]:
+    value = headers.get(name, headers.get(f"X-{name}"))
+    if value is None:
+        return None
+
+    try:
+        return float(value)
+    except ValueError:
+        return None
@@ -0,0 +1,238 @@
+from typing import Any, Optional, Iterable, Mapping
+import asyncio
+import datetime
+import email.utils
+import random
+
+import aiohttp
+
+from .types import ResponseCbOut, Send
+
+
+__all__ = ("RetryPolicy", "RetryBudget")
+
+
+class RetryBudget:
+    """
+    A token-based retry budget, shared between retry policies (for example,
+    across a whole session), that limits retries to a fixed share of traffic.
+
+    Every request deposits `ratio` tokens and every retry withdraws one token,
+    so in the long run retries do not exceed `ratio` of requests. Up to
+    `capacity` tokens are kept, which allows a burst of retries after a quiet
+    period.
+
+    Attributes:
+        tokens: currently available tokens
+        rejected: number of retries rejected due to exhausted budget
+    """
+
+    def __init__(self, ratio: float = 0.1, capacity: float = 10.0) -> None:
+        self.ratio = ratio
+        self.capacity = capacity
+        self.tokens = capacity
+        self.rejected = 0
+
+    def deposit(self) -> None:
+        self.tokens = min(self.capacity, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        if self.tokens < 1:
+            self.rejected += 1
+            return False
+
+        self.tokens -= 1
+        return True
+
+
+class RetryPolicy:
+    """
+    A retry policy with exponential backoff and full jitter.
+
+    Only requests with idempotent `methods` are retried, since a failed
+    `POST` may still have taken effect on the server. A request is retried
+    when it fails with one of `exceptions`, when the response status is one
+    of `statuses` (the response callback is not called for such responses,
+    unless it is the last attempt), or, if `callback_errors` is set, when
+    the response callback returns an error.
+
+    The delay before attempt `n` is a random value between `0` and
+    `min(backoff_max, backoff_base * 2 ** n)`. If the response has a
+    `Retry-After` header, it is used as the delay instead; a `Retry-After`
+    longer than `backoff_max` stops retrying.
+
+    Attributes:
+        retries: total number of retries performed by this policy
+    """
+
+    def __init__(
+        self,
+        *,
+        attempts: int = 3,
+        exceptions: Iterable[type[BaseException]] = (
+            aiohttp.ClientError,
+            asyncio.TimeoutError,
+        ),
+        statuses: Iterable[int] = (429, 503),
+        methods: Iterable[str] = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE"),
+        callback_errors: bool = False,
+        backoff_base: float = 0.1,
+        backoff_max: float = 10.0,
+        budget: Optional[RetryBudget] = None,
+        report: bool = False,
+    ) -> None:
+        """
+        Args:
+            attempts: Maximum number of attempts, including the first one. \
+                Defaults to `3`.
+            exceptions: Exception types to retry on. \
+                Defaults to `(aiohttp.ClientError, asyncio.TimeoutError)`.
+            statuses: Response statuses to retry on. Defaults to `(429, 503)`.
+            methods: Request methods to retry. \
+                Defaults to `("GET", "HEAD", "OPTIONS", "PUT", "DELETE")`.
+            callback_errors: Retry when the response callback returns an \
+                error. Defaults to `False`.
+            backoff_base: Base delay, in seconds. Defaults to `0.1`.
+            backoff_max: Maximum delay, in seconds. Defaults to `10.0`.
+            budget: Retry budget shared with other policies. \
+                Defaults to `None`.
+            report: Add `retry (dict[str, Any])` field with `attempts (int)` \
+                and `backoff (float)` seconds to handled data. \
+                Defaults to `False`.
+        """
+
+        if attempts < 1:
+            raise ValueError(f"attempts must be positive, got {attempts}")
+
+        self.attempts = attempts
+        self.exceptions = tuple(exceptions)
+        self.statuses = frozenset(statuses)
+        self.methods = frozenset(methods)
+        self.callback_errors = callback_errors
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.budget = budget
+        self.report = report
+        self.retries = 0
+
+    def backoff(self, attempt: int) -> float:
+        """Return a jittered delay before retrying after `attempt`."""
+
+        return random.uniform(
+            0,
+            min(self.backoff_max, self.backoff_base * 2 ** attempt),
+        )
+
+    def wrap(self, send: Send) -> Send:
+        """
+        Wrap a request sending function with the retry policy.
+
+        Used by `RequestHandler.request(..., retry=policy)`.
+        """
+
+        async def retrying_send(
+            response_callback,
+            **request_kwargs,
+        ) -> ResponseCbOut:
+            if self.budget is not None:
+                self.budget.deposit()
+
+            attempts = (
+                self.attempts if request_kwargs["method"] in self.methods
+                else 1
+            )
+            attempt = 0
+            backoff = 0.0
+
+            while True:
+                attempt += 1
+                last = attempt >= attempts
+                delay: Optional[float] = None
+                callback_failed = False
+
+                async def retry_callback(
+                    cr: aiohttp.ClientResponse,
+                    **kwargs,
+                ) -> ResponseCbOut:
+                    nonlocal delay, callback_failed
+
+                    if not last and cr.status in self.statuses:
+                        delay = self._delay(attempt, cr.headers)
+                        if delay is not None:
+                            return {}, _RetryableStatus(cr.status)
+
+                    out, err = await response_callback(cr, **kwargs)
+                    callback_failed = err is not None
+                    return out, err
+
+                try:
+                    out, err = await send(retry_callback, **request_kwargs)
+                except self.exceptions:
+                    if last:
+                        raise
+                    out, err, delay = {}, None, self._delay(attempt)
+                    if delay is None:
+                        raise
+                else:
+                    if err is not None and delay is None and not last:
+                        retryable = (
+                            self.callback_errors if callback_failed
+                            else isinstance(err, self.exceptions)
+                        )
+                        if retryable:
+                            delay = self._delay(attempt)
+
+                if delay is None:
+                    if self.report and not err:
+                        out["retry"] = dict(
+                            attempts=attempt,
+                            backoff=backoff,
+                        )
+                    return out, err
+
+                self.retries += 1
+                backoff += delay
+                await asyncio.sleep(delay)
+
+        return retrying_send
+
+    def _delay(
+        self,
+        attempt: int,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> Optional[float]:
+        delay = self.backoff(attempt - 1)
+
+        retry_after = _parse_retry_after(headers or {})
+        if retry_after is not None:
+            if retry_after > self.backoff_max:
+                return None
+            delay = retry_after
+
+        if self.budget is not None and not self.budget.withdraw():
+            return None
+
+        return delay
+
+
+class _RetryableStatus(Exception):
+    pass
+
+
+def _parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    value = headers.get("Retry-After")
+    if value is None:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return max((date - now).total_seconds(), 0.0)
@@ -0,0 +1,250 @@
+from typing import Any, Optional, Callable, Hashable, Mapping
+import asyncio
+import collections
+import time
+
+from .types import ResponseCbOut, Send
+from ._instrument import Histogram
+
+
+__all__ = ("RequestScheduler", "SchedulerLane")
+
+
+class _Class:
+    def __init__(self, weight: float) -> None:
+        self.weight = weight
+        self.queue: collections.deque[
+            tuple[float, float, asyncio.Future]
+        ] = collections.deque()
+        self.finish = 0.0
+        self.inflight = 0
+        self.dispatched = 0
+        self.wait = Histogram()
+
+
+class SchedulerLane:
+    """
+    A class of traffic of `RequestScheduler`, returned by
+    `RequestScheduler.lane`.
+    """
+
+    def __init__(self, scheduler: "RequestScheduler", name: Hashable) -> None:
+        self.scheduler = scheduler
+        self.name = name
+
+    def wrap(self, send: Send) -> Send:
+        """
+        Wrap a request sending function with the scheduler, as requests of
+        the lane class.
+        """
+
+        return self.scheduler._wrap(send, lambda **_: self.name)
+
+
+class RequestScheduler:
+    """
+    A scheduler of requests into a bounded number of in-flight slots, shared
+    between classes of traffic (priorities, tenants) by weighted fair
+    queuing.
+
+    Once all `slots` are taken, requests queue per class. Every queued
+    request is tagged with a virtual finish time, advancing by `1 / weight`
+    of its class, and free slots are given to the request with the earliest
+    tag, so under load classes get slots in proportion to their weights,
+    and an idle class does not accumulate credit. To bound waiting of
+    low-weight classes, a request queued for longer than `max_wait` seconds
+    is given a slot before any other (aging).
+
+    Every attempt of a request, including retries and hedged duplicates,
+    queues for a slot on its own, so a request sleeping in retry backoff
+    does not hold one. The class of a request is picked by
+    `classify(**request_kwargs)`, or bound with `lane`:
+
+    ```python
+    scheduler = RequestScheduler(
+        slots=50,
+        weights={"interactive": 10, "background": 1},
+    )
+
+    out, err = await RequestHandler.request(
+        ...,
+        scheduler=scheduler.lane("interactive"),
+    )
+    ```
+
+    A single scheduler is meant to be shared between calls, for example
+    across a whole session.
+    """
+
+    def __init__(
+        self,
+        slots: int,
+        weights: Mapping[Hashable, float],
+        *,
+        default: Optional[Hashable] = None,
+        max_wait: Optional[float] = 1.0,
+        classify: Optional[Callable[..., Hashable]] = None,
+    ) -> None:
+        """
+        Args:
+            slots: Maximum number of requests in flight.
+            weights: Weights of classes.
+            default: Class of requests, that are not classified. \
+                Defaults to the first class of `weights`.
+            max_wait: Queue wait, in seconds, after which a request is \
+                given a slot first, `None` to disable aging. \
+                Defaults to `1.0`.
+            classify: Function called as `classify(**request_kwargs)` to \
+                pick a class, for example by a tenant header; classes not \
+                in `weights` are scheduled as `default`. \
+                Defaults to `default` class.
+        """
+
+        if slots < 1:
+            raise ValueError(f"slots must be positive, got {slots}")
+        if not weights or any(weight <= 0 for weight in weights.values()):
+            raise ValueError("weights must be non-empty and positive")
+
+        self.default = next(iter(weights)) if default is None else default
+        if self.default not in weights:
+            raise ValueError(
+                f"default class {self.default!r} is not in weights",
+            )
+
+        self.slots = slots
+        self.max_wait = max_wait
+        self.classify = classify or (lambda **_: self.default)
+
+        self.inflight = 0
+        self._classes = {
+            name: _Class(weight)
+            for name, weight in weights.items()
+        }
+        self._virtual = 0.0
+
+    def lane(self, name: Hashable) -> SchedulerLane:
+        """
+        Return a policy, that schedules requests as `name` class, to pass
+        as `RequestHandler.request(..., scheduler=scheduler.lane(name))`.
+        """
+
+        if name not in self._classes:
+            raise KeyError(name)
+
+        return SchedulerLane(self, name)
+
+    def stats(self) -> dict[Hashable, dict[str, Any]]:
+        """
+        Return metrics of classes: `weight`, requests `queued` and
+        `inflight`, number of `dispatched` requests, and histogram of queue
+        `wait` (see `Histogram.snapshot`).
+        """
+
+        return {
+            name: dict(
+                weight=cls.weight,
+                queued=sum(
+                    1 for _, _, waiter in cls.queue if not waiter.done()
+                ),
+                inflight=cls.inflight,
+                dispatched=cls.dispatched,
+                wait=cls.wait.snapshot(),
+            )
+            for name, cls in self._classes.items()
+        }
+
+    async def acquire(self, name: Hashable) -> None:
+        """Wait for a slot for a request of `name` class."""
+
+        cls = self._classes.get(name) or self._classes[self.default]
+        now = time.monotonic()
+
+        if self.inflight < self.slots and not any(
+            other.queue for other in self._classes.values()
+        ):
+            self._grant(cls, now, now)
+            return
+
+        cls.finish = max(self._virtual, cls.finish) + 1 / cls.weight
+        waiter = asyncio.get_running_loop().create_future()
+        cls.queue.append((cls.finish, now, waiter))
+        self._dispatch()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release(name)
+            raise
+
+    def release(self, name: Hashable) -> None:
+        """Free a slot taken by a request of `name` class."""
+
+        cls = self._classes.get(name) or self._classes[self.default]
+        cls.inflight -= 1
+        self.inflight -= 1
+        self._dispatch()
+
+    def wrap(self, send: Send) -> Send:
+        """
+        Wrap a request sending function with the scheduler, classifying
+        requests with `classify`.
+
+        Used by `RequestHandler.request(..., scheduler=scheduler)`.
+        """
+
+        return self._wrap(send, self.classify)
+
+    def _wrap(
+        self,
+        send: Send,
+        classify: Callable[..., Hashable],
+    ) -> Send:
+        async def scheduled_send(
+            response_callback,
+            **request_kwargs,
+        ) -> ResponseCbOut:
+            name = classify(**request_kwargs)
+            await self.acquire(name)
+            try:
+                return await send(response_callback, **request_kwargs)
+            finally:
+                self.release(name)
+
+        return scheduled_send
+
+    def _grant(self, cls: _Class, enqueued: float, now: float) -> None:
+        cls.inflight += 1
+        cls.dispatched += 1
+        cls.wait.observe(now - enqueued)
+        self.inflight += 1
+
+    def _dispatch(self) -> None:
+        while self.inflight < self.slots:
+            now = time.monotonic()
+            picked: Optional[_Class] = None
+            aged: Optional[_Class] = None
+
+            for cls in self._classes.values():
+                while cls.queue and cls.queue[0][2].done():
+                    cls.queue.popleft()
+                if not cls.queue:
+                    continue
+
+                tag, enqueued, _ = cls.queue[0]
+                if picked is None or tag < picked.queue[0][0]:
+                    picked = cls
+                if (
+                    self.max_wait is not None
+                    and now - enqueued >= self.max_wait
+                    and (aged is None or enqueued < aged.queue[0][1])
+                ):
+                    aged = cls
+
+            cls = aged or picked
+            if cls is None:
+                return
+
+            tag, enqueued, waiter = cls.queue.popleft()
+            self._virtual = max(self._virtual, tag)
+            self._grant(cls, enqueued, now)
+            waiter.set_result(None)
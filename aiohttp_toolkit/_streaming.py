@@ -0,0 +1,129 @@
+from typing import Any, Optional, Callable, AsyncIterator
+import json
+
+import aiohttp
+
+
+__all__ = ("LineTooLongError",)
+
+
+class LineTooLongError(ValueError):
+    """
+    Returned when a line of a streamed response body exceeds `max_line`
+    bytes.
+    """
+
+
+async def _iter_lines(
+    content: aiohttp.StreamReader,
+    max_line: int,
+) -> AsyncIterator[bytes]:
+    """
+    Iterate lines of a response body as it arrives, without line endings.
+
+    Lines are split out of every chunk in place; only a line crossing chunk
+    boundaries is buffered, as a list of fragments joined once it is
+    complete, so framing stays linear in body size. Lines longer than
+    `max_line` bytes raise `LineTooLongError`.
+    """
+
+    pending: list[bytes] = []
+    pending_size = 0
+
+    async for chunk in content.iter_any():
+        start = 0
+        while True:
+            end = chunk.find(b"\n", start)
+            if end == -1:
+                break
+
+            line = chunk[start:end]
+            if pending:
+                pending.append(line)
+                line = b"".join(pending)
+                pending.clear()
+                pending_size = 0
+            if len(line) > max_line:
+                raise LineTooLongError(
+                    f"line of {len(line)} bytes exceeds {max_line} bytes",
+                )
+
+            yield line[:-1] if line.endswith(b"\r") else line
+            start = end + 1
+
+        if start < len(chunk):
+            pending.append(chunk[start:])
+            pending_size += len(chunk) - start
+            if pending_size > max_line:
+                raise LineTooLongError(
+                    f"line of over {pending_size} bytes exceeds "
+                    f"{max_line} bytes",
+                )
+
+    if pending:
+        line = b"".join(pending)
+        yield line[:-1] if line.endswith(b"\r") else line
+
+
+async def _iter_ndjson(
+    content: aiohttp.StreamReader,
+    max_line: int,
+    decoder: Optional[Callable[[bytes], Any]] = None,
+) -> AsyncIterator[Any]:
+    """
+    Iterate records of a newline-delimited JSON body, skipping blank lines.
+    """
+
+    decode = decoder or json.loads
+    async for line in _iter_lines(content, max_line):
+        if line.strip():
+            yield decode(line)
+
+
+async def _iter_sse(
+    content: aiohttp.StreamReader,
+    max_line: int,
+) -> AsyncIterator[dict[str, Any]]:
+    """
+    Iterate events of a Server-Sent Events body, as dictionaries with
+    `event` type (`"message"` by default), `data`, last event `id` and
+    `retry` (`None` if not set).
+    """
+
+    event = ""
+    data: list[str] = []
+    last_id = ""
+    retry: Optional[int] = None
+
+    async for raw in _iter_lines(content, max_line):
+        line = raw.decode("utf-8", errors="replace")
+
+        if not line:
+            if data:
+                yield dict(
+                    event=event or "message",
+                    data="\n".join(data),
+                    id=last_id,
+                    retry=retry,
+                )
+            event = ""
+            data = []
+            continue
+
+        if line.startswith(":"):
+            continue
+
+        field, _, value = line.partition(":")
+        if value.startswith(" "):
+            value = value[1:]
+
+        if field == "data":
+            data.append(value)
+        elif field == "event":
+            event = value
+        elif field == "id":
+            if "\0" not in value:
+                last_id = value
+        elif field == "retry":
+            if value.isdigit():
+                retry = int(value)
@@ -0,0 +1,181 @@
+from typing import Any, Optional, Iterable, Union
+import asyncio
+import time
+
+import aiohttp
+import yarl
+
+
+__all__ = ("ConnectionWarmer",)
+
+
+class ConnectionWarmer:
+    """
+    A connection pre-warmer, that opens idle keep-alive connections in the
+    session's connector ahead of traffic, so first requests after start do
+    not pay DNS resolution, TCP connect and TLS handshake.
+
+    Warming an origin sends `connections` concurrent `method` requests to
+    `path` of it, holding every response until all of them have arrived, so
+    each one takes a separate connection, and then releases them to the
+    pool. Connector limits (`limit`, `limit_per_host`) cap the number of
+    connections that can be opened.
+
+    An optional keeper repeats warming every `interval` seconds: this reuses
+    idle connections, resetting their keep-alive timers, and replaces those
+    dropped by the server. The interval should be shorter than both the
+    server's keep-alive timeout and `keepalive_timeout` of the connector
+    (`15` seconds by default).
+
+    Can be used as an async context manager, that warms connections on
+    enter and calls `close` on exit.
+
+    Attributes:
+        report: report of the last warming, see `warm`
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        origins: Iterable[Union[str, yarl.URL]],
+        *,
+        connections: int = 4,
+        method: str = "HEAD",
+        path: str = "/",
+        timeout: float = 10.0,
+    ) -> None:
+        """
+        Args:
+            session: Session to warm connections of
+            origins: Origins to warm, as `scheme://host[:port]`
+            connections: Number of connections to open per origin. \
+                Defaults to `4`.
+            method: HTTP method of warming requests. Defaults to `"HEAD"`.
+            path: Path of warming requests. Defaults to `"/"`.
+            timeout: Timeout of warming an origin, in seconds. \
+                Defaults to `10.0`.
+        """
+
+        self.session = session
+        self.origins = [yarl.URL(origin).origin() for origin in origins]
+        self.connections = connections
+        self.method = method
+        self.path = path
+        self.timeout = timeout
+
+        self.report: dict[str, dict[str, Any]] = {}
+        self._keeper: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> "ConnectionWarmer":
+        await self.warm()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def warm(self) -> dict[str, dict[str, Any]]:
+        """
+        Open connections to all origins concurrently.
+
+        Returns:
+            dict[str, dict[str, Any]]: report keyed by origin, with number of
+            `opened` connections, number of `failed` requests, the last
+            `error`, and `duration` of warming, in seconds; the `"total"`
+            key holds total `duration`.
+        """
+
+        start = time.monotonic()
+        reports = await asyncio.gather(*(
+            self._warm_origin(origin)
+            for origin in self.origins
+        ))
+
+        report = {
+            str(origin): origin_report
+            for origin, origin_report in zip(self.origins, reports)
+        }
+        report["total"] = dict(duration=time.monotonic() - start)
+
+        self.report = report
+        return report
+
+    def keep(self, interval: float = 10.0) -> None:
+        """
+        Start the keeper, that warms connections every `interval` seconds.
+        """
+
+        if self._keeper is not None:
+            return
+
+        async def keeper() -> None:
+            while True:
+                await asyncio.sleep(interval)
+                await self.warm()
+
+        self._keeper = asyncio.ensure_future(keeper())
+
+    async def close(self) -> None:
+        """Stop the keeper. Connections are left in the pool."""
+
+        keeper, self._keeper = self._keeper, None
+        if keeper is None:
+            return
+
+        keeper.cancel()
+        try:
+            await keeper
+        except asyncio.CancelledError:
+            pass
+
+    async def _warm_origin(self, origin: yarl.URL) -> dict[str, Any]:
+        url = origin.join(yarl.URL(self.path))
+        arrived = 0
+        ready = asyncio.Event()
+        failed = 0
+        error: Optional[Exception] = None
+
+        async def open_connection() -> bool:
+            nonlocal arrived, failed, error
+
+            try:
+                async with self.session.request(self.method, url) as cr:
+                    await cr.read()
+                    arrived += 1
+                    if arrived + failed == self.connections:
+                        ready.set()
+                    await ready.wait()
+                    return True
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:
+                failed += 1
+                error = err
+                if arrived + failed == self.connections:
+                    ready.set()
+                return False
+
+        start = time.monotonic()
+        tasks = [
+            asyncio.ensure_future(open_connection())
+            for _ in range(self.connections)
+        ]
+        _, pending = await asyncio.wait(tasks, timeout=self.timeout)
+        if pending:
+            ready.set()
+            _, pending = await asyncio.wait(pending, timeout=self.timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        opened = sum(
+            1
+            for task in tasks
+            if not task.cancelled() and task.result()
+        )
+
+        return dict(
+            opened=opened,
+            failed=failed,
+            error=error,
+            duration=time.monotonic() - start,
+        )
@@ -1,8 +1,12 @@
-from typing import Any, Union
+from typing import Any, Optional, Union, Callable, Awaitable
+import asyncio as _asyncio
 
 import aiohttp as _aiohttp
+import multidict as _multidict
 
 from .types import CbBuilderOut
+from .sinks import Sink
+from ._offload import OffloadPool
 
 
 __all__ = (
@@ -12,6 +16,11 @@ __all__ = (
     "read",
     "text",
     "json",
+    "stream",
+    "peek",
+    "offload",
+    "select_headers",
+    "discard",
     "close",
 )
 
@@ -27,10 +36,8 @@ async def status(
     Adds `status (str)` and `ok (bool)` fields to handled data
     """
 
-    data |= dict(
-        status=cr.status,
-        ok=cr.ok,
-    )
+    data["status"] = cr.status
+    data["ok"] = cr.ok
 
     return data, None
 
@@ -46,9 +53,7 @@ async def headers(
     Adds `headers (multidict.CIMultiDictProxy[str])` field to handled data
     """
 
-    data |= dict(
-        headers=cr.headers,
-    )
+    data["headers"] = cr.headers
 
     return data, None
 
@@ -64,9 +69,7 @@ async def cookies(
     Adds `cookies (http.cookies.SimpleCookie)` field to handled data
     """
 
-    data |= dict(
-        cookies=cr.cookies,
-    )
+    data["cookies"] = cr.cookies
 
     return data, None
 
@@ -88,9 +91,7 @@ async def read(
     except Exception as err:
         return data, err
 
-    data |= dict(
-        read=read,
-    )
+    data["read"] = read
 
     return data, None
 
@@ -117,9 +118,7 @@ async def text(
     except Exception as err:
         return data, err
 
-    data |= dict(
-        text=text,
-    )
+    data["text"] = text
 
     return data, None
 
@@ -135,24 +134,290 @@ async def json(
     Adds `json (Any)` field to handled data.
 
     Takes kwargs by `"json"` key from parent kwargs and unpacks as
-    `aiohttp.ClientResponse.json(**kwargs)`
+    `aiohttp.ClientResponse.json(**kwargs)`.
+
+    If `decoder` key is set, it is called with raw body bytes instead,
+    skipping text decoding, for example `orjson.loads`, or
+    `msgspec.json.Decoder(Model).decode` to decode and validate straight into
+    a typed structure. The `content_type` key is checked in this case too:
+    by default any JSON media type (`application/json`,
+    `application/problem+json`, `text/json`, ...) is accepted, a set value
+    must match the response media type exactly, and `None` disables the check.
     """
 
     kwargs = kwargs.get("json", {})
+    decoder: Optional[Callable[[bytes], Any]] = kwargs.get("decoder")
 
     json: Union[dict[str, Any], list[Any], Any]
     try:
-        json = await cr.json(**kwargs)
+        if decoder is None:
+            json = await cr.json(**kwargs)
+        else:
+            content_type = kwargs.get("content_type", "application/json")
+            if content_type and not _is_content_type(
+                cr.content_type, content_type,
+            ):
+                raise _aiohttp.ContentTypeError(
+                    cr.request_info,
+                    cr.history,
+                    status=cr.status,
+                    message=(
+                        "Attempt to decode JSON with unexpected mimetype: "
+                        f"{cr.content_type}"
+                    ),
+                    headers=cr.headers,
+                )
+
+            json = decoder(await cr.read())
     except Exception as err:
         return data, err
 
-    data |= dict(
-        json=json,
-    )
+    data["json"] = json
+
+    return data, None
+
+
+async def stream(
+    data: dict[str, Any],
+    cr: _aiohttp.ClientResponse,
+    **kwargs,
+) -> CbBuilderOut:
+    """
+    Stream callback builder.
+
+    Iterates response body by chunks and feeds them to sinks, so the whole
+    body is never held in memory.
+    Adds `stream (dict[str, Any])` field to handled data, with `bytes (int)`
+    read and summaries of all sinks.
+
+    Takes kwargs by `"stream"` key from parent kwargs:
+        chunk_size (int): size of body chunks. Defaults to `65536`.
+        sinks (Iterable[Union[sinks.Sink, Callable[[], sinks.Sink]]]):
+        sinks to feed chunks to, or factories called for every response,
+        such as `sinks.HashSink`, to reuse the kwargs between requests.
+        Defaults to `()`.
+    """
+
+    kwargs = kwargs.get("stream", {})
+    chunk_size: int = kwargs.get("chunk_size", 65536)
+    sinks: list[Sink] = [
+        sink if isinstance(sink, Sink) else sink()
+        for sink in kwargs.get("sinks", ())
+    ]
+
+    stream: dict[str, Any] = dict(bytes=0)
+    error: Optional[Exception] = None
+    try:
+        async for chunk in cr.content.iter_chunked(chunk_size):
+            stream["bytes"] += len(chunk)
+            for sink in sinks:
+                await sink.write(chunk)
+    except Exception as err:
+        error = err
+
+    for sink in sinks:
+        try:
+            stream |= await sink.close()
+        except Exception as err:
+            error = error or err
+
+    if error:
+        return data, error
+
+    data["stream"] = stream
+
+    return data, None
+
+
+async def peek(
+    data: dict[str, Any],
+    cr: _aiohttp.ClientResponse,
+    **kwargs,
+) -> CbBuilderOut:
+    """
+    Peek callback builder.
+
+    Reads only the beginning of response body, for example to sniff content
+    type, read an HTML `<head>` or check a magic number, and aborts the
+    transfer of the rest: it is drained to keep the connection alive if it
+    is at most `max_drain` bytes by `Content-Length`, otherwise the
+    connection is closed.
+    Adds `peek (bytes)` and `released (bool)` fields to handled data, the
+    read bytes and whether the connection was kept alive.
+
+    Takes kwargs by `"peek"` key from parent kwargs:
+        max_bytes (int): maximum number of bytes to read. Defaults to `4096`.
+        delimiter (bytes): stop reading after the delimiter, which is kept.
+        Defaults to `None`.
+        predicate (Callable[[bytes], bool]): stop reading once it returns
+        `True` for the bytes read so far. Defaults to `None`.
+        max_drain (int): maximum number of the rest of body bytes to drain.
+        Defaults to `65536`.
+    """
+
+    kwargs = kwargs.get("peek", {})
+    max_bytes: int = kwargs.get("max_bytes", 4096)
+    delimiter: Optional[bytes] = kwargs.get("delimiter")
+    predicate: Optional[Callable[[bytes], bool]] = kwargs.get("predicate")
+    max_drain: int = kwargs.get("max_drain", 65536)
+
+    buffer = bytearray()
+    consumed = 0
+    try:
+        while len(buffer) < max_bytes:
+            chunk = await cr.content.read(max_bytes - len(buffer))
+            if not chunk:
+                break
+            consumed += len(chunk)
+
+            if delimiter:
+                start = max(len(buffer) - len(delimiter) + 1, 0)
+                buffer += chunk
+                index = buffer.find(delimiter, start)
+                if index != -1:
+                    del buffer[index + len(delimiter):]
+                    break
+            else:
+                buffer += chunk
+
+            if predicate is not None and predicate(bytes(buffer)):
+                break
+
+        released = await _release(cr, max_drain, consumed)
+    except Exception as err:
+        cr.close()
+        return data, err
+
+    data["peek"] = bytes(buffer)
+    data["released"] = released
 
     return data, None
 
 
+def offload(
+    func: Callable[[Any], Any],
+    field: str,
+    *,
+    source: Optional[str] = None,
+    pool: Optional[OffloadPool] = None,
+) -> Callable[..., Awaitable[CbBuilderOut]]:
+    """
+    Offload callback builder factory.
+
+    Returns a callback builder that reads response body bytes on the event
+    loop (or takes `source` field of handled data, if set) and runs CPU-heavy
+    `func` on it in `pool`, so other requests are not stalled.
+    Adds `field (Any)` field to handled data with the result of `func`.
+
+    ```python
+    json = CallbackBuilder.develop(
+        callbacks.properties,
+        builders.offload(orjson.loads, "json", pool=OffloadPool(4)),
+    )
+    ```
+
+    Args:
+        func: Synchronous function of body bytes (or `source` field), must \
+            be picklable for process pools
+        field: Name of the field to add
+        source: Field of handled data to pass to `func` instead of body \
+            bytes. Defaults to `None`.
+        pool: Pool to run `func` in. Defaults to the default executor of \
+            the event loop.
+    """
+
+    async def offloaded(
+        data: dict[str, Any],
+        cr: _aiohttp.ClientResponse,
+        **kwargs,
+    ) -> CbBuilderOut:
+        try:
+            value = data[source] if source else await cr.read()
+
+            if pool is None:
+                loop = _asyncio.get_running_loop()
+                result = await loop.run_in_executor(None, func, value)
+            else:
+                result = await pool.run(func, value)
+        except Exception as err:
+            return data, err
+
+        data[field] = result
+
+        return data, None
+
+    offloaded.__name__ = f"offload_{field}"
+    return offloaded
+
+
+def select_headers(*names: str) -> Callable[..., CbBuilderOut]:
+    """
+    Select headers callback builder factory.
+
+    Returns a callback builder, that adds
+    `headers (multidict.CIMultiDictProxy[str])` field to handled data with
+    only the headers of `names`, so the rest of response headers are not
+    kept alive with handled data.
+
+    Args:
+        *names: Names of headers to select, case-insensitive
+    """
+
+    def select_headers(
+        data: dict[str, Any],
+        cr: _aiohttp.ClientResponse,
+        **kwargs,
+    ) -> CbBuilderOut:
+        selected: _multidict.CIMultiDict[str] = _multidict.CIMultiDict()
+        for name in names:
+            for value in cr.headers.getall(name, ()):
+                selected.add(name, value)
+
+        data["headers"] = _multidict.CIMultiDictProxy(selected)
+
+        return data, None
+
+    return select_headers
+
+
+def discard(
+    *,
+    max_drain: int = 65536,
+) -> Callable[..., Awaitable[CbBuilderOut]]:
+    """
+    Discard callback builder factory.
+
+    Returns a callback builder, that releases the connection without reading
+    response body into memory. If the rest of the body is at most
+    `max_drain` bytes, it is drained and the connection is kept alive for
+    reuse; otherwise (or if `Content-Length` announces more than that) the
+    connection is closed, which is cheaper than downloading a large body.
+    Adds `released (bool)` field to handled data, whether the connection was
+    kept alive.
+
+    Args:
+        max_drain: Maximum number of body bytes to drain. \
+            Defaults to `65536`.
+    """
+
+    async def discard(
+        data: dict[str, Any],
+        cr: _aiohttp.ClientResponse,
+        **kwargs,
+    ) -> CbBuilderOut:
+        try:
+            released = await _release(cr, max_drain)
+        except Exception as err:
+            cr.close()
+            return data, err
+
+        data["released"] = released
+
+        return data, None
+
+    return discard
+
+
 async def close(
     data: dict[str, Any],
     cr: _aiohttp.ClientResponse,
@@ -169,3 +434,42 @@ async def close(
     await cr.wait_for_close()
 
     return data, None
+
+
+async def _release(
+    cr: _aiohttp.ClientResponse,
+    max_drain: int,
+    consumed: int = 0,
+) -> bool:
+    remaining = cr.content_length
+    if remaining is not None:
+        if cr.headers.get("Content-Encoding", "identity") != "identity":
+            remaining = None
+        else:
+            remaining -= consumed
+
+    released = False
+    if remaining is None or remaining <= max_drain:
+        budget = max_drain
+        while budget >= 0:
+            chunk = await cr.content.read(min(budget + 1, 65536))
+            if not chunk:
+                released = True
+                break
+            budget -= len(chunk)
+
+    if released:
+        cr.release()
+    else:
+        cr.close()
+
+    return released
+
+
+def _is_content_type(media_type: str, expected: str) -> bool:
+    media_type = media_type.lower()
+    if expected != "application/json":
+        return media_type == expected.lower()
+
+    _, _, subtype = media_type.partition("/")
+    return subtype == "json" or subtype.endswith("+json")
@@ -8,6 +8,8 @@ __all__ = (
     "read",
     "text",
     "json",
+    "stream",
+    "peek",
 )
 
 
@@ -91,5 +93,53 @@ all property-like response fields (listed in `properties` response callback)
 
 Arguments:
     json (**kwargs): kwargs to be unpacked as
-    `aiohttp.ClientResponse.json(**kwargs)`
+    `aiohttp.ClientResponse.json(**kwargs)`, or `decoder` of raw body bytes
+    and `content_type` (see `json` callback builder)
+"""
+
+stream = _cbuilder.develop(
+    properties,
+    _cbb.stream,
+)
+"""
+`stream` - stream response body by chunks into sinks without buffering it,
+also return all property-like response fields (listed in `properties`
+response callback)
+
+Arguments:
+    stream (**kwargs): kwargs of `stream` callback builder, `chunk_size` and
+    `sinks`
+
+Returns:
+    status (str): response status code
+    ok (bool): response status code boolean representation.
+    `True` if status is less than 400; otherwise, `False`.
+    headers (CIMultiDictProxy[str]): inmutable case-insensitive multidict with
+    HTTP response headers.
+    cookies (http.cookies.SimpleCookie): container with HTTP response cookies.
+    stream (dict[str, Any]): `bytes` read and summaries of sinks
+"""
+
+peek = _cbuilder.develop(
+    properties,
+    _cbb.peek,
+)
+"""
+`peek` - read only the beginning of response body and abort the transfer of
+the rest, also return all property-like response fields (listed in
+`properties` response callback)
+
+Arguments:
+    peek (**kwargs): kwargs of `peek` callback builder, `max_bytes`,
+    `delimiter`, `predicate` and `max_drain`
+
+Returns:
+    status (str): response status code
+    ok (bool): response status code boolean representation.
+    `True` if status is less than 400; otherwise, `False`.
+    headers (CIMultiDictProxy[str]): inmutable case-insensitive multidict with
+    HTTP response headers.
+    cookies (http.cookies.SimpleCookie): container with HTTP response cookies.
+    peek (bytes): beginning of response body
+    released (bool): whether the connection was kept alive
 """
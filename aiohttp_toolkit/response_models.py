@@ -1,24 +1,57 @@
-from typing import Any
+from typing import Any, Callable, TypeVar
 import dataclasses
 import http.cookies
+import operator
 
 import multidict
 
 
 __all__ = (
     "Status", "Properties", "Read", "Text", "JsonObj", "JsonList", "JsonAny",
+    "Stream", "Peek",
 )
 
 
+_ModelT = TypeVar("_ModelT", bound="Status")
+
+_getters: dict[type, Callable[[dict[str, Any]], tuple[Any, ...]]] = {}
+
+
 @dataclasses.dataclass
 class Status:
     """
     `Status` - used to be applied from `status` callback.
+
+    Models define `__slots__`, so instances carry no per-instance `__dict__`.
     """
 
+    __slots__ = ("status", "ok")
+
     status: int
     ok: bool
 
+    @classmethod
+    def from_out(cls: type[_ModelT], out: dict[str, Any]) -> _ModelT:
+        """
+        Build a model from handled data, passing fields positionally instead
+        of unpacking `out` as kwargs. Keys of `out` that are not fields of the
+        model are ignored.
+
+        Raises:
+            KeyError: if a field of the model is missing in `out`
+        """
+
+        getter = _getters.get(cls)
+        if getter is None:
+            names = [
+                field.name
+                for field in dataclasses.fields(cls)
+                if field.init
+            ]
+            getter = _getters[cls] = operator.itemgetter(*names)
+
+        return cls(*getter(out))
+
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__}({self.status})>"
 
@@ -30,6 +63,8 @@ class Properties(Status):
     Inherits `Status`.
     """
 
+    __slots__ = ("headers", "cookies")
+
     headers: multidict.CIMultiDictProxy[str]
     cookies: http.cookies.BaseCookie
 
@@ -47,6 +82,8 @@ class Read(Properties):
     Inherits `Properties`.
     """
 
+    __slots__ = ("read",)
+
     read: bytes
 
     def __repr__(self) -> str:
@@ -60,6 +97,8 @@ class Text(Properties):
     Inherits `Properties`.
     """
 
+    __slots__ = ("text",)
+
     text: str
 
     def __repr__(self) -> str:
@@ -74,6 +113,8 @@ class JsonObj(Properties):
     Inherits `Properties`.
     """
 
+    __slots__ = ("json",)
+
     json: dict[str, Any]
 
     def __repr__(self) -> str:
@@ -88,6 +129,8 @@ class JsonList(Properties):
     Inherits `Properties`.
     """
 
+    __slots__ = ("json",)
+
     json: list[Any]
 
     def __repr__(self) -> str:
@@ -102,7 +145,40 @@ class JsonAny(Properties):
     Inherits `Properties`.
     """
 
+    __slots__ = ("json",)
+
     json: Any
 
     def __repr__(self) -> str:
         return super().__repr__()
+
+
+@dataclasses.dataclass
+class Stream(Properties):
+    """
+    `Stream` - used to be applied from `stream` callback.
+    Inherits `Properties`.
+    """
+
+    __slots__ = ("stream",)
+
+    stream: dict[str, Any]
+
+    def __repr__(self) -> str:
+        return super().__repr__()
+
+
+@dataclasses.dataclass
+class Peek(Properties):
+    """
+    `Peek` - used to be applied from `peek` callback.
+    Inherits `Properties`.
+    """
+
+    __slots__ = ("peek", "released")
+
+    peek: bytes
+    released: bool
+
+    def __repr__(self) -> str:
+        return super().__repr__()
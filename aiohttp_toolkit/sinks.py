@@ -0,0 +1,89 @@
+from typing import Any, Optional, Callable, Awaitable, BinaryIO, Union
+import abc
+import asyncio
+import hashlib
+import os
+
+
+__all__ = ("Sink", "FileSink", "HashSink", "CallbackSink")
+
+
+class Sink(abc.ABC):
+    """
+    Base class for response body sinks, used by `stream` callback builder.
+
+    A sink receives every body chunk with `write` and is closed with `close`,
+    which returns a summary that is merged into the `stream` field of handled
+    data. Sinks hold per-response state, so a sink instance serves a single
+    response; to reuse callback kwargs between requests (retries,
+    `request_many`, `Paginator`, ...), pass a sink factory instead, for
+    example `functools.partial(FileSink, path)`, called for every response.
+    """
+
+    @abc.abstractmethod
+    async def write(self, chunk: bytes) -> None:
+        ...
+
+    async def close(self) -> dict[str, Any]:
+        return {}
+
+
+class FileSink(Sink):
+    """
+    `FileSink` - write body chunks to a file without blocking the event loop.
+
+    Summary:
+        path (str): path of the written file
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]) -> None:
+        self._path = os.fspath(path)
+        self._file: Optional[BinaryIO] = None
+
+    async def write(self, chunk: bytes) -> None:
+        loop = asyncio.get_running_loop()
+        if self._file is None:
+            self._file = await loop.run_in_executor(None, open, self._path, "wb")
+        await loop.run_in_executor(None, self._file.write, chunk)
+
+    async def close(self) -> dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        if self._file is None:
+            self._file = await loop.run_in_executor(None, open, self._path, "wb")
+        await loop.run_in_executor(None, self._file.close)
+
+        return dict(
+            path=self._path,
+        )
+
+
+class HashSink(Sink):
+    """
+    `HashSink` - compute a running digest of the body.
+
+    Summary:
+        digest (str): hex digest of the body
+    """
+
+    def __init__(self, algorithm: str = "sha256") -> None:
+        self._hash = hashlib.new(algorithm)
+
+    async def write(self, chunk: bytes) -> None:
+        self._hash.update(chunk)
+
+    async def close(self) -> dict[str, Any]:
+        return dict(
+            digest=self._hash.hexdigest(),
+        )
+
+
+class CallbackSink(Sink):
+    """
+    `CallbackSink` - pass every body chunk to a user coroutine function.
+    """
+
+    def __init__(self, callback: Callable[[bytes], Awaitable[Any]]) -> None:
+        self._callback = callback
+
+    async def write(self, chunk: bytes) -> None:
+        await self._callback(chunk)
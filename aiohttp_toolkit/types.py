@@ -1,7 +1,7 @@
-from typing import Any, Optional
+from typing import Any, Optional, Callable, Awaitable
 
 
-__all__ = ("CbBuilderOut", "ResponseCbOut")
+__all__ = ("CbBuilderOut", "ResponseCbOut", "Send")
 
 
 CbBuilderOut = tuple[dict[str, Any], Optional[Exception]]
@@ -15,3 +15,10 @@ ResponseCbOut = tuple[dict[str, Any], Optional[Exception]]
 Return type of response callback.\n
 Alias for `tuple[dict[str, Any], Optional[Exception]]`
 """
+
+Send = Callable[..., Awaitable[ResponseCbOut]]
+"""
+Request sending function, called as `send(response_callback, **request_kwargs)`
+and wrapped by request policies, such as `ResponseCache`.\n
+Alias for `Callable[..., Awaitable[ResponseCbOut]]`
+"""
@@ -0,0 +1,94 @@
+"""
+Benchmark of `json` callback decoding paths on large payloads, served by a
+local `aiohttp.web` server.
+
+Compares the default `aiohttp.ClientResponse.json` path (body decoded to
+`str`, then `json.loads`) against `decoder` on raw bytes: stdlib
+`json.loads`, and `orjson.loads` and `msgspec.json.decode` when installed.
+
+Usage:
+    python -m benchmarks.json_decode [--items N] [--requests N]
+"""
+
+from typing import Any, Callable, Optional
+import argparse
+import asyncio
+import json
+import time
+
+import aiohttp
+import yarl
+from aiohttp import web
+
+import aiohttp_toolkit as aiohtk
+
+
+def decoders() -> dict[str, Optional[Callable[[bytes], Any]]]:
+    found: dict[str, Optional[Callable[[bytes], Any]]] = {
+        "aiohttp": None,
+        "stdlib-bytes": json.loads,
+    }
+
+    try:
+        import orjson
+        found["orjson"] = orjson.loads
+    except ImportError:
+        pass
+
+    try:
+        import msgspec
+        found["msgspec"] = msgspec.json.decode
+    except ImportError:
+        pass
+
+    return found
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=50_000)
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+
+    payload = json.dumps([
+        {"id": i, "name": f"item-{i}", "tags": ["a", "b"], "score": i / 3}
+        for i in range(args.items)
+    ]).encode()
+
+    async def handle(request: web.Request) -> web.Response:
+        return web.Response(body=payload, content_type="application/json")
+
+    app = web.Application()
+    app.router.add_get("/", handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    url = yarl.URL.build(scheme="http", host="127.0.0.1", port=port)
+
+    print(f"payload: {len(payload) / 1024 / 1024:.1f} MiB")
+    async with aiohttp.ClientSession() as session:
+        for name, decoder in decoders().items():
+            kwargs = {} if decoder is None else dict(decoder=decoder)
+
+            start = time.perf_counter()
+            for _ in range(args.requests):
+                _, err = await aiohtk.RequestHandler.request(
+                    session=session,
+                    response_callback=aiohtk.callbacks.json,
+                    response_callback_kwargs=dict(json=kwargs),
+                    method="GET",
+                    url=url,
+                )
+                if err:
+                    raise err
+            elapsed = (time.perf_counter() - start) / args.requests
+
+            print(f"{name:>14}: {elapsed * 1e3:8.2f} ms/request")
+
+    await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
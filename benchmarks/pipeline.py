@@ -0,0 +1,116 @@
+"""
+Microbenchmark of per-response `CallbackBuilder` pipeline overhead.
+
+Compares compiled `aiohtk.callbacks.json` against the previous pipeline, where
+`develop` nested built callbacks and every handler was awaited and merged its
+fields with a temporary dict. A stub response is used, so only the pipeline
+overhead is measured. Both pipelines are run alternately `--repeat` times,
+and the best run of each is reported, as timings on a shared machine are
+noisy.
+
+Usage:
+    python -m benchmarks.pipeline [--responses N] [--repeat N]
+"""
+
+from typing import Any
+import argparse
+import asyncio
+import http.cookies
+import time
+
+import multidict
+
+import aiohttp_toolkit as aiohtk
+
+
+class StubResponse:
+    status = 200
+    ok = True
+    headers = multidict.CIMultiDictProxy(multidict.CIMultiDict(a="b"))
+    cookies = http.cookies.SimpleCookie()
+
+    async def json(self, **kwargs) -> Any:
+        return {"key": "value"}
+
+
+def legacy_build(*handlers):
+    async def response_callback(cr, **kwargs):
+        out: dict[str, Any] = {}
+        for handler in handlers:
+            out, err = await handler(out, cr, **kwargs)
+            if err:
+                return out, err
+        return out, None
+
+    return response_callback
+
+
+def legacy_develop(built, *handlers):
+    async def response_callback(cr, **kwargs):
+        out, err = await built(cr, **kwargs)
+        if err:
+            return out, err
+        for handler in handlers:
+            out, err = await handler(out, cr, **kwargs)
+            if err:
+                return out, err
+        return out, None
+
+    return response_callback
+
+
+async def legacy_status(data, cr, **kwargs):
+    data |= dict(status=cr.status, ok=cr.ok)
+    return data, None
+
+
+async def legacy_headers(data, cr, **kwargs):
+    data |= dict(headers=cr.headers)
+    return data, None
+
+
+async def legacy_cookies(data, cr, **kwargs):
+    data |= dict(cookies=cr.cookies)
+    return data, None
+
+
+async def legacy_json(data, cr, **kwargs):
+    json = await cr.json(**kwargs.get("json", {}))
+    data |= dict(json=json)
+    return data, None
+
+
+legacy = legacy_develop(
+    legacy_build(legacy_status, legacy_headers, legacy_cookies),
+    legacy_json,
+)
+
+
+async def measure(callback, responses: int) -> float:
+    cr = StubResponse()
+    start = time.perf_counter()
+    for _ in range(responses):
+        await callback(cr)
+    return (time.perf_counter() - start) / responses
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--responses", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    callbacks = dict(legacy=legacy, compiled=aiohtk.callbacks.json)
+    best = dict.fromkeys(callbacks, float("inf"))
+    for _ in range(args.repeat):
+        for name, callback in callbacks.items():
+            best[name] = min(
+                best[name], await measure(callback, args.responses),
+            )
+
+    for name, per_response in best.items():
+        print(f"{name:>10}: {per_response * 1e9:8.1f} ns/response (min)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
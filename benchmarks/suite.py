@@ -0,0 +1,231 @@
+"""
+Benchmark suite of `RequestHandler.request` with every premade callback
+against a local `aiohttp.web` server.
+
+The server runs in a separate process, serving a JSON payload of
+`--payload` bytes after `--delay` seconds, with statuses drawn from
+`--statuses` (for example `200:0.9,500:0.1`). Every callback of
+`--callbacks` is driven at every concurrency level of `--concurrency`,
+and one JSON line is reported per run, with `rps`, `p50`, `p99` latency in
+seconds, `base_rss` and `peak_rss` in KiB (where available) and, with
+`--trace-alloc`, `alloc_peak` bytes traced by `tracemalloc` (which slows
+down the run).
+
+Every run is done in a fresh process, since peak RSS is only tracked for a
+whole process lifetime: `base_rss` is the peak before the first request
+(interpreter, imports and session), and `peak_rss` is the peak of the run.
+
+Usage:
+    python -m benchmarks.suite [--requests N] [--concurrency 1,16,64]
+        [--callbacks status,properties,read,text,json] [--payload BYTES]
+        [--delay SECONDS] [--statuses STATUS:WEIGHT,...] [--trace-alloc]
+        [--output FILE]
+"""
+
+from typing import Any, Optional
+import argparse
+import asyncio
+import json
+import multiprocessing
+import platform
+import random
+import socket
+import sys
+import time
+import tracemalloc
+
+import aiohttp
+import yarl
+from aiohttp import web
+
+import aiohttp_toolkit as aiohtk
+
+
+def serve(port: int, payload: int, delay: float, statuses: str) -> None:
+    choices = [
+        (int(status), float(weight))
+        for status, weight in (
+            item.split(":") for item in statuses.split(",")
+        )
+    ]
+    codes = [status for status, _ in choices]
+    weights = [weight for _, weight in choices]
+
+    item = b'"' + b"x" * 62 + b'"'
+    count = max(payload // (len(item) + 1), 1)
+    body = b"[" + b",".join([item] * count) + b"]"
+
+    async def handle(request: web.Request) -> web.Response:
+        if delay:
+            await asyncio.sleep(delay)
+        return web.Response(
+            status=random.choices(codes, weights)[0],
+            body=body,
+            content_type="application/json",
+        )
+
+    app = web.Application()
+    app.router.add_get("/", handle)
+    web.run_app(app, host="127.0.0.1", port=port, print=None)
+
+
+def scenario(
+    url: str,
+    callback_name: str,
+    concurrency: int,
+    requests: int,
+    trace_alloc: bool,
+) -> dict[str, Any]:
+    async def main() -> dict[str, Any]:
+        connector = aiohttp.TCPConnector(limit=concurrency)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            return await run(
+                session=session,
+                url=yarl.URL(url),
+                callback_name=callback_name,
+                concurrency=concurrency,
+                requests=requests,
+                trace_alloc=trace_alloc,
+            )
+
+    return asyncio.run(main())
+
+
+def peak_rss() -> Optional[int]:
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+async def run(
+    session: aiohttp.ClientSession,
+    url: yarl.URL,
+    callback_name: str,
+    concurrency: int,
+    requests: int,
+    trace_alloc: bool,
+) -> dict[str, Any]:
+    callback = getattr(aiohtk.callbacks, callback_name)
+    latencies: list[float] = []
+    errors = 0
+    remaining = requests
+
+    async def worker() -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            _, err = await aiohtk.RequestHandler.request(
+                session=session,
+                response_callback=callback,
+                response_callback_kwargs={},
+                method="GET",
+                url=url,
+            )
+            latencies.append(time.perf_counter() - start)
+            errors += err is not None
+
+    base_rss = peak_rss()
+    if trace_alloc:
+        tracemalloc.start()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    alloc_peak = None
+    if trace_alloc:
+        _, alloc_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    latencies.sort()
+    return dict(
+        callback=callback_name,
+        concurrency=concurrency,
+        requests=len(latencies),
+        errors=errors,
+        rps=len(latencies) / elapsed,
+        p50=latencies[len(latencies) // 2],
+        p99=latencies[min(int(len(latencies) * 0.99), len(latencies) - 1)],
+        base_rss=base_rss,
+        peak_rss=peak_rss(),
+        alloc_peak=alloc_peak,
+    )
+
+
+async def wait_for_server(url: yarl.URL) -> None:
+    async with aiohttp.ClientSession() as session:
+        for _ in range(100):
+            try:
+                async with session.get(url):
+                    return
+            except aiohttp.ClientConnectionError:
+                await asyncio.sleep(0.05)
+
+    raise RuntimeError(f"benchmark server at {url} did not start")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--concurrency", default="1,16,64")
+    parser.add_argument(
+        "--callbacks", default="status,properties,read,text,json",
+    )
+    parser.add_argument("--payload", type=int, default=1024)
+    parser.add_argument("--delay", type=float, default=0.0)
+    parser.add_argument("--statuses", default="200:1")
+    parser.add_argument("--trace-alloc", action="store_true")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    url = yarl.URL.build(scheme="http", host="127.0.0.1", port=port)
+
+    server = multiprocessing.Process(
+        target=serve,
+        args=(port, args.payload, args.delay, args.statuses),
+        daemon=True,
+    )
+    server.start()
+
+    output = open(args.output, "a") if args.output else sys.stdout
+    try:
+        await wait_for_server(url)
+
+        meta = dict(
+            python=platform.python_version(),
+            aiohttp=aiohttp.__version__,
+            aiohttp_toolkit=aiohtk.__version__,
+            payload=args.payload,
+            delay=args.delay,
+            statuses=args.statuses,
+        )
+
+        context = multiprocessing.get_context("spawn")
+        for concurrency in map(int, args.concurrency.split(",")):
+            for callback_name in args.callbacks.split(","):
+                with context.Pool(1) as pool:
+                    result = pool.apply(scenario, (
+                        str(url),
+                        callback_name,
+                        concurrency,
+                        args.requests,
+                        args.trace_alloc,
+                    ))
+                print(json.dumps(meta | result), file=output, flush=True)
+    finally:
+        server.terminate()
+        server.join()
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
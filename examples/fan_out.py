@@ -0,0 +1,30 @@
+import asyncio
+import collections
+
+import yarl
+
+import aiohttp_toolkit as aiohtk
+
+
+async def main() -> None:
+    url = yarl.URL("https://example.com")
+
+    specs = (
+        dict(method="GET", url=url)
+        for _ in range(10_000)
+    )
+
+    counter = collections.Counter()
+    with aiohtk.ProcessFanOut(processes=4, limit=50) as fanout:
+        async for _, out, err in fanout.request_many(
+            response_callback="aiohttp_toolkit.response_callbacks:text",
+            response_callback_kwargs={},
+            specs=specs,
+        ):
+            counter[err if err else out["status"]] += 1
+
+    print(f"Results: {counter}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -15,23 +15,22 @@ async def main() -> None:
     async with aiohttp.ClientSession() as session:
         start = time.perf_counter()
 
-        requests = [
-            aiohtk.RequestHandler.request(
-                session=session,
-                response_callback=aiohtk.callbacks.text,
-                response_callback_kwargs={},
-                method="GET",
-                url=url,
-            )
+        specs = (
+            dict(method="GET", url=url)
             for _ in range(1_000)
-        ]
-        outs = await asyncio.gather(*requests)
-
-        results = [
-            err if err else request["status"]
-            for request, err in outs
-        ]
-        counter = collections.Counter(results)
+        )
+
+        counter = collections.Counter()
+        async for _, out, err in aiohtk.RequestHandler.request_many(
+            session=session,
+            response_callback=aiohtk.callbacks.status,
+            response_callback_kwargs={},
+            specs=specs,
+            limit=100,
+            limit_per_host=50,
+        ):
+            counter[err if err else out["status"]] += 1
+
         print(f"Results: {counter}")
 
         time_passed = datetime.timedelta(seconds=time.perf_counter() - start)
@@ -20,7 +20,7 @@ async def main() -> None:
         if err:
             raise err
 
-        res = aiohtk.models.Text(**out)
+        res = aiohtk.models.Text.from_out(out)
         if not res.ok:
             raise RuntimeError(f"response is not ok: {res.status=}")
 
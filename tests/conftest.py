@@ -1,4 +1,5 @@
 from typing import Any, AsyncGenerator
+import asyncio
 import json
 
 import aiohttp
@@ -43,11 +44,106 @@ async def aiohttp_test_server() -> AsyncGenerator[aiohttp.test_utils.TestServer,
         )
 
     async def handle_post(request: web.Request) -> web.Response:
-        return web.Response(body=await request.read())
+        return web.Response(
+            body=await request.read(),
+            content_type=request.content_type,
+        )
+
+    async def handle_cache(request: web.Request) -> web.Response:
+        headers = {
+            "ETag": '"v1"',
+            "Cache-Control": f"max-age={request.query.get('max_age', '0')}",
+            "Vary": "Accept-Language",
+        }
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304, headers=headers)
+
+        return web.Response(
+            text=request.headers.get("Accept-Language", ""),
+            headers=headers,
+        )
+
+    async def handle_delay(request: web.Request) -> web.Response:
+        await asyncio.sleep(float(request.query.get("delay", "0")))
+        return web.Response(
+            status=int(request.query.get("status", "200")),
+            text="delayed",
+        )
+
+    async def handle_error(request: web.Request) -> web.Response:
+        return web.Response(
+            status=int(request.query.get("status", "500")),
+            body=b"x" * int(request.query.get("size", "0")),
+            content_type="text/html",
+            headers={"Retry-After": "1"},
+        )
+
+    async def handle_pages(request: web.Request) -> web.Response:
+        total = int(request.query.get("total", "7"))
+        size = int(request.query.get("size", "3"))
+        start = int(request.query.get("cursor", request.query.get("offset", "0")))
+        await asyncio.sleep(float(request.query.get("delay", "0")))
+
+        items = list(range(start, min(start + size, total)))
+        end = start + len(items)
+        if request.query.get("style") == "cursor":
+            return web.json_response(dict(
+                data=items,
+                meta=dict(next=str(end) if end < total else None),
+            ))
+
+        headers = {}
+        if request.query.get("style") == "link" and end < total:
+            headers["Link"] = (
+                f'</pages?style=link&total={total}&size={size}&offset={end}>; '
+                'rel="next", </pages?style=link>; rel="first"'
+            )
+        return web.json_response(items, headers=headers)
+
+    async def handle_stream(request: web.Request) -> web.StreamResponse:
+        response = web.StreamResponse()
+        await response.prepare(request)
+        for piece in request.query.getall("piece", ()):
+            await response.write(piece.encode())
+            await asyncio.sleep(float(request.query.get("interval", "0.001")))
+        await response.write_eof()
+        return response
+
+    flaky_hits: dict[str, int] = {}
+
+    async def handle_flaky(request: web.Request) -> web.Response:
+        key = request.query.get("key", "")
+        flaky_hits[key] = flaky_hits.get(key, 0) + 1
+        if flaky_hits[key] <= int(request.query.get("fails", "0")):
+            return web.Response(
+                status=503,
+                headers={"Retry-After": request.query.get("retry_after", "0")},
+            )
+
+        return web.Response(text=str(flaky_hits[key]))
+
+    slow_hits: dict[str, int] = {}
+
+    async def handle_slow_first(request: web.Request) -> web.Response:
+        key = request.query.get("key", "")
+        slow_hits[key] = slow_hits.get(key, 0) + 1
+        hit = slow_hits[key]
+        if hit == 1:
+            await asyncio.sleep(float(request.query.get("delay", "0")))
+
+        status = 200 if hit == 1 else int(request.query.get("status", "200"))
+        return web.Response(status=status, text=str(hit))
 
     app = web.Application()
     app.router.add_get("/", handle_get)
     app.router.add_post("/", handle_post)
+    app.router.add_get("/cache", handle_cache)
+    app.router.add_get("/delay", handle_delay)
+    app.router.add_get("/error", handle_error)
+    app.router.add_get("/flaky", handle_flaky)
+    app.router.add_get("/pages", handle_pages)
+    app.router.add_get("/stream", handle_stream)
+    app.router.add_get("/slow_first", handle_slow_first)
     server = aiohttp.test_utils.TestServer(
         app=app,
         scheme="http",
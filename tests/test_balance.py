@@ -0,0 +1,87 @@
+from typing import Any
+
+import aiohttp
+import aiohttp.test_utils
+import pytest
+import yarl
+
+import aiohttp_toolkit as aiohtk
+
+
+@pytest.mark.asyncio
+async def test_endpoint_group(
+    shared: dict[str, Any],
+    aiohttp_test_server: aiohttp.test_utils.TestServer,
+    aiohttp_session: aiohttp.ClientSession,
+) -> None:
+    healthy: yarl.URL = shared["test_server_url"]
+    broken = yarl.URL("http://127.0.0.1:1")
+    endpoints = aiohtk.EndpointGroup(
+        [healthy, broken],
+        max_failures=1,
+        ejection_time=60,
+    )
+
+    errors = 0
+    for _ in range(20):
+        out, err = await aiohtk.RequestHandler.request(
+            session=aiohttp_session,
+            response_callback=aiohtk.callbacks.text,
+            response_callback_kwargs={},
+            method="GET",
+            url=yarl.URL("delay"),
+            endpoints=endpoints,
+        )
+        if err:
+            errors += 1
+        else:
+            assert out["text"] == "delayed"
+
+    snapshot = endpoints.snapshot()
+    assert errors <= 1
+    assert snapshot[str(broken)]["ejected"]
+    assert not snapshot[str(healthy)]["ejected"]
+    assert snapshot[str(healthy)]["outstanding"] == 0
+
+@pytest.mark.asyncio
+async def test_endpoint_group_penalty(
+    shared: dict[str, Any],
+    aiohttp_test_server: aiohttp.test_utils.TestServer,
+    aiohttp_session: aiohttp.ClientSession,
+) -> None:
+    slow: yarl.URL = shared["test_server_url"] / "delay" % {"delay": "0.02"}
+    failing: yarl.URL = shared["test_server_url"] / "error"
+    endpoints = aiohtk.EndpointGroup([slow, failing], max_failures=100)
+
+    errors = 0
+    for _ in range(20):
+        out, _ = await aiohtk.RequestHandler.request(
+            session=aiohttp_session,
+            response_callback=aiohtk.callbacks.status,
+            response_callback_kwargs={},
+            method="GET",
+            url=yarl.URL(""),
+            endpoints=endpoints,
+        )
+        errors += out["status"] == 500
+
+    # fast failures do not make the failing replica look faster
+    snapshot = endpoints.snapshot()
+    assert errors <= 3
+    assert snapshot[str(failing)]["latency"] > snapshot[str(slow)]["latency"]
+
+def test_endpoint_group_penalty_bound() -> None:
+    endpoints = aiohtk.EndpointGroup(
+        ["http://healthy/", "http://failing/"],
+        max_failures=100,
+    )
+    healthy, failing = endpoints.endpoints
+    healthy.latency = 0.02
+
+    for _ in range(10):
+        endpoints._record(failing, 0.001, True)
+    assert failing.latency <= endpoints.penalty * healthy.latency
+
+    for _ in range(5):
+        endpoints._record(failing, 0.02, False)
+    assert failing.latency < 2 * healthy.latency
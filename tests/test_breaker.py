@@ -0,0 +1,55 @@
+from typing import Any
+import asyncio
+
+import aiohttp
+import aiohttp.test_utils
+import pytest
+import yarl
+
+import aiohttp_toolkit as aiohtk
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker(
+    shared: dict[str, Any],
+    aiohttp_test_server: aiohttp.test_utils.TestServer,
+    aiohttp_session: aiohttp.ClientSession,
+) -> None:
+    url: yarl.URL = shared["test_server_url"] / "delay"
+    origin = str(url.origin())
+    breaker = aiohtk.CircuitBreaker(
+        min_requests=4,
+        failure_ratio=0.5,
+        reset_timeout=0.1,
+    )
+
+    async def request(status: int) -> tuple[dict[str, Any], Any]:
+        return await aiohtk.RequestHandler.request(
+            session=aiohttp_session,
+            response_callback=aiohtk.callbacks.status,
+            response_callback_kwargs={},
+            method="GET",
+            url=url,
+            params={"status": str(status)},
+            breaker=breaker,
+        )
+
+    for status in (200, 503, 200, 503):
+        _, err = await request(status)
+        assert err is None
+
+    assert breaker.state(origin) == "open"
+
+    out, err = await request(200)
+    assert out == {}
+    assert isinstance(err, aiohtk.CircuitOpenError)
+    assert err.origin == origin
+
+    await asyncio.sleep(0.1)
+    assert breaker.state(origin) == "half-open"
+
+    _, err = await request(200)
+    assert err is None
+    assert breaker.snapshot()[origin] == dict(
+        state="closed", requests=0, failures=0, latency=0.0,
+    )
@@ -0,0 +1,370 @@
+from typing import Any
+import asyncio
+import dataclasses
+import hashlib
+import json
+
+import aiohttp
+import aiohttp.test_utils
+import pytest
+import yarl
+
+import aiohttp_toolkit as aiohtk
+
+
+@pytest.mark.asyncio
+async def test_stream(
+    shared: dict[str, Any],
+    aiohttp_test_server: aiohttp.test_utils.TestServer,
+    aiohttp_session: aiohttp.ClientSession,
+    tmp_path,
+) -> None:
+    url: yarl.URL = shared["test_server_url"]
+    data = b"0123456789" * 10_000
+    path = tmp_path / "body.bin"
+    chunks = []
+
+    async def collect(chunk: bytes) -> None:
+        chunks.append(len(chunk))
+
+    out, err = await aiohtk.RequestHandler.request(
+        session=aiohttp_session,
+        response_callback=aiohtk.callbacks.stream,
+        response_callback_kwargs=dict(
+            stream=dict(
+                chunk_size=4096,
+                sinks=[
+                    aiohtk.sinks.FileSink(path),
+                    aiohtk.sinks.HashSink("sha256"),
+                    aiohtk.sinks.CallbackSink(collect),
+                ],
+            ),
+        ),
+        method="POST",
+        url=url,
+        data=data,
+    )
+    if err:
+        raise err
+
+    res = aiohtk.models.Stream(**out)
+
+    assert res.stream == dict(
+        bytes=len(data),
+        path=str(path),
+        digest=hashlib.sha256(data).hexdigest(),
+    )
+    assert path.read_bytes() == data
+    assert sum(chunks) == len(data)
+    assert max(chunks) <= 4096
+
+    with pytest.raises(TypeError):
+        aiohtk.sinks.Sink()
+
+@pytest.mark.asyncio
+async def test_json_decoder(
+    shared: dict[str, Any],
+    aiohttp_test_server: aiohttp.test_utils.TestServer,
+    aiohttp_session: aiohttp.ClientSession,
+) -> None:
+    url: yarl.URL = shared["test_server_url"]
+    bodies = []
+
+    @dataclasses.dataclass
+    class Headers:
+        host: str
+
+    def decoder(body: bytes) -> Headers:
+        bodies.append(body)
+        return Headers(host=json.loads(body)["Host"])
+
+    out, err = await aiohtk.RequestHandler.request(
+        session=aiohttp_session,
+        response_callback=aiohtk.callbacks.json,
+        response_callback_kwargs=dict(json=dict(decoder=decoder)),
+        method="GET",
+        url=url,
+    )
+    if err:
+        raise err
+
+    assert out["json"] == Headers(host=f"{url.host}:{url.port}")
+    assert isinstance(bodies[0], bytes)
+
+    out, err = await aiohtk.RequestHandler.request(
+        session=aiohttp_session,
+        response_callback=aiohtk.callbacks.json,
+        response_callback_kwargs=dict(json=dict(decoder=decoder)),
+        method="POST",
+        url=url,
+        data=b"{}",
+    )
+
+    assert isinstance(err, aiohttp.ContentTypeError)
+    assert len(bodies) == 1
+
+    out, err = await aiohtk.RequestHandler.request(
+        session=aiohttp_session,
+        response_callback=aiohtk.callbacks.json,
+        response_callback_kwargs=dict(json=dict(decoder=json.loads)),
+        method="POST",
+        url=url,
+        data=b'{"title": "Not Found"}',
+        headers={"Content-Type": "application/problem+json; charset=utf-8"},
+    )
+
+    assert err is None
+    assert out["json"] == {"title": "Not Found"}
+
+@pytest.mark.asyncio
+async def test_offload(
+    shared: dict[str, Any],
+    aiohttp_test_server: aiohttp.test_utils.TestServer,
+    aiohttp_session: aiohttp.ClientSession,
+) -> None:
+    url: yarl.URL = shared["test_server_url"]
+    pool = aiohtk.OffloadPool(2)
+
+    callback = aiohtk.CallbackBuilder.develop(
+        aiohtk.callbacks.read,
+        aiohtk.builders.offload(json.loads, "json", pool=pool),
+        aiohtk.builders.offload(len, "size", source="read"),
+    )
+
+    outs = await asyncio.gather(*(
+        aiohtk.RequestHandler.request(
+            session=aiohttp_session,
+            response_callback=callback,
+            response_callback_kwargs={},
+            method="POST",
+            url=url,
+            data=json.dumps([i]).encode(),
+        )
+        for i in range(5)
+    ))
+    pool.close()
+
+    assert [out["json"] for out, _ in outs] == [[i] for i in range(5)]
+    assert all(out["size"] == 3 for out, _ in outs)
+    assert pool.stats() | dict(busy=0) == dict(
+        workers=2, pending=0, queued=0, max_pending=5, completed=5, busy=0,
+    )
+
+@pytest.mark.asyncio
+async def test_concurrent(
+    shared: dict[str, Any],
+    aiohttp_test_server: aiohttp.test_utils.TestServer,
+    aiohttp_session: aiohttp.ClientSession,
+) -> None:
+    url: yarl.URL = shared["test_server_url"]
+    cancelled = []
+
+    async def slow_size(data, cr, **kwargs):
+        await asyncio.sleep(0.05)
+        data["size"] = len(data["read"])
+        data["source"] = "size"
+        return data, None
+
+    def source(data, cr, **kwargs):
+        data["source"] = "sync"
+        return data, None
+
+    async def hang(data, cr, **kwargs):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return data, None
+
+    def fail(data, cr, **kwargs):
+        data["partial"] = True
+        return data, ValueError("failed")
+
+    callback = aiohtk.CallbackBuilder.develop(
+        aiohtk.callbacks.read,
+        aiohtk.CallbackBuilder.concurrent(
+            slow_size,
+            (aiohtk.builders.status, source),
+            aiohtk.builders.offload(json.loads, "json", source="read"),
+        ),
+    )
+
+    out, err = await aiohtk.RequestHandler.request(
+        session=aiohttp_session,
+        response_callback=callback,
+        response_callback_kwargs={},
+        method="POST",
+        url=url,
+        data=b"[1, 2]",
+    )
+    if err:
+        raise err
+
+    assert out["size"] == 6
+    assert out["status"] == 200
+    assert out["json"] == [1, 2]
+    assert out["source"] == "sync"
+
+    callback = aiohtk.CallbackBuilder.develop(
+        aiohtk.callbacks.read,
+        aiohtk.CallbackBuilder.concurrent(hang, fail),
+    )
+
+    out, err = await aiohtk.RequestHandler.request(
+        session=aiohttp_session,
+        response_callback=callback,
+        response_callback_kwargs={},
+        method="POST",
+        url=url,
+        data=b"[]",
+    )
+
+    assert isinstance(err, ValueError)
+    assert cancelled == [True]
+    assert "partial" not in out
+
+    def explode(data, cr, **kwargs):
+        raise RuntimeError("branch failed")
+
+    callback = aiohtk.CallbackBuilder.develop(
+        aiohtk.callbacks.read,
+        aiohtk.CallbackBuilder.concurrent(hang, explode),
+    )
+
+    out, err = await aiohtk.RequestHandler.request(
+        session=aiohttp_session,
+        response_callback=callback,
+        response_callback_kwargs={},
+        method="POST",
+        url=url,
+        data=b"[]",
+    )
+
+    assert isinstance(err, RuntimeError)
+    assert cancelled == [True, True]
+
+@pytest.mark.asyncio
+async def test_dispatch(
+    shared: dict[str, Any],
+    aiohttp_test_server: aiohttp.test_utils.TestServer,
+    aiohttp_session: aiohttp.ClientSession,
+) -> None:
+    url: yarl.URL = shared["test_server_url"]
+
+    callback = aiohtk.CallbackBuilder.build(
+        aiohtk.builders.status,
+        aiohtk.CallbackBuilder.dispatch(
+            {
+                range(200, 300): aiohtk.builders.json,
+                404: aiohtk.builders.read,
+            },
+            default=(
+                aiohtk.builders.select_headers("Retry-After"),
+                aiohtk.builders.discard(max_drain=1024),
+            ),
+        ),
+    )
+
+    async def request(url: yarl.URL) -> tuple[dict[str, Any], Any]:
+        return await aiohtk.RequestHandler.request(
+            session=aiohttp_session,
+            response_callback=callback,
+            response_callback_kwargs={},
+            method="GET",
+            url=url,
+        )
+
+    out, err = await request(url)
+    if err:
+        raise err
+    assert "json" in out
+
+    out, err = await request(url / "error" % {"status": "404", "size": "3"})
+    if err:
+        raise err
+    assert out["read"] == b"xxx"
+
+    out, err = await request(url / "error" % {"status": "503", "size": "512"})
+    if err:
+        raise err
+    assert out == dict(
+        status=503,
+        ok=False,
+        headers={"Retry-After": "1"},
+        released=True,
+    )
+
+    out, err = await request(url / "error" % {"status": "502", "size": "1000000"})
+    if err:
+        raise err
+    assert out["released"] is False
+    assert "read" not in out
+
+@pytest.mark.asyncio
+async def test_peek(
+    shared: dict[str, Any],
+    aiohttp_test_server: aiohttp.test_utils.TestServer,
+    aiohttp_session: aiohttp.ClientSession,
+) -> None:
+    url: yarl.URL = shared["test_server_url"]
+    body = b"<html><head><title>t</title></head><body>" + b"x" * 1_000_000
+
+    async def request(**peek) -> tuple[dict[str, Any], Any]:
+        return await aiohtk.RequestHandler.request(
+            session=aiohttp_session,
+            response_callback=aiohtk.callbacks.peek,
+            response_callback_kwargs=dict(peek=peek),
+            method="POST",
+            url=url,
+            data=body,
+        )
+
+    out, err = await request(max_bytes=8)
+    if err:
+        raise err
+    assert out["peek"] == b"<html><h"
+    assert out["released"] is False
+
+    out, err = await request(delimiter=b"</head>", max_drain=2_000_000)
+    if err:
+        raise err
+    assert out["peek"] == b"<html><head><title>t</title></head>"
+    assert out["released"] is True
+
+    out, err = await request(predicate=lambda read: b"<title>" in read)
+    if err:
+        raise err
+    assert out["peek"].startswith(b"<html><head><title>")
+    assert len(out["peek"]) <= 4096
+
+    model = aiohtk.models.Peek.from_out(out)
+    assert model.released is False
+
+@pytest.mark.asyncio
+async def test_stream_sink_factories(
+    shared: dict[str, Any],
+    aiohttp_test_server: aiohttp.test_utils.TestServer,
+    aiohttp_session: aiohttp.ClientSession,
+) -> None:
+    url: yarl.URL = shared["test_server_url"]
+    bodies = [str(i).encode() * 100 for i in range(5)]
+
+    results = {}
+    async for index, out, err in aiohtk.RequestHandler.request_many(
+        session=aiohttp_session,
+        response_callback=aiohtk.callbacks.stream,
+        response_callback_kwargs=dict(
+            stream=dict(sinks=[aiohtk.sinks.HashSink]),
+        ),
+        specs=[dict(method="POST", url=url, data=body) for body in bodies],
+        limit=2,
+    ):
+        if err:
+            raise err
+        results[index] = out["stream"]["digest"]
+
+    assert results == {
+        i: hashlib.sha256(body).hexdigest()
+        for i, body in enumerate(bodies)
+    }
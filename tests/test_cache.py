@@ -0,0 +1,111 @@
+from typing import Any
+
+import aiohttp
+import aiohttp.test_utils
+import pytest
+import yarl
+
+import aiohttp_toolkit as aiohtk
+
+
+async def fetch(
+    session: aiohttp.ClientSession,
+    cache: aiohtk.ResponseCache,
+    url: yarl.URL,
+    **kwargs,
+) -> dict[str, Any]:
+    out, err = await aiohtk.RequestHandler.request(
+        session=session,
+        response_callback=aiohtk.callbacks.text,
+        response_callback_kwargs={},
+        method="GET",
+        url=url,
+        cache=cache,
+        **kwargs,
+    )
+    if err:
+        raise err
+
+    return out
+
+
+@pytest.mark.asyncio
+async def test_cache_fresh(
+    shared: dict[str, Any],
+    aiohttp_test_server: aiohttp.test_utils.TestServer,
+    aiohttp_session: aiohttp.ClientSession,
+) -> None:
+    url: yarl.URL = shared["test_server_url"] / "cache"
+    cache = aiohtk.ResponseCache()
+
+    for _ in range(3):
+        out = await fetch(aiohttp_session, cache, url, params={"max_age": "60"})
+        assert out["status"] == 200
+
+    assert cache.stats() | dict(size=0) == dict(
+        hits=2, misses=1, revalidations=0, entries=1, size=0,
+    )
+
+@pytest.mark.asyncio
+async def test_cache_revalidate_and_vary(
+    shared: dict[str, Any],
+    aiohttp_test_server: aiohttp.test_utils.TestServer,
+    aiohttp_session: aiohttp.ClientSession,
+) -> None:
+    url: yarl.URL = shared["test_server_url"] / "cache"
+    cache = aiohtk.ResponseCache()
+
+    en = await fetch(aiohttp_session, cache, url, headers={"Accept-Language": "en"})
+    en_again = await fetch(aiohttp_session, cache, url, headers={"Accept-Language": "en"})
+    de = await fetch(aiohttp_session, cache, url, headers={"Accept-Language": "de"})
+
+    assert en["text"] == en_again["text"] == "en"
+    assert en_again["status"] == 200
+    assert de["text"] == "de"
+    assert cache.revalidations == 1
+    assert cache.misses == 2
+    assert cache.stats()["entries"] == 2
+
+@pytest.mark.asyncio
+async def test_cache_eviction(
+    shared: dict[str, Any],
+    aiohttp_test_server: aiohttp.test_utils.TestServer,
+    aiohttp_session: aiohttp.ClientSession,
+) -> None:
+    url: yarl.URL = shared["test_server_url"] / "cache"
+    cache = aiohtk.ResponseCache()
+
+    await fetch(aiohttp_session, cache, url, params={"max_age": "60"})
+    cache.max_bytes = cache.size
+
+    await fetch(aiohttp_session, cache, url, params={"max_age": "61"})
+
+    assert cache.stats()["entries"] == 1
+    assert cache.size <= cache.max_bytes
+
+@pytest.mark.asyncio
+async def test_cache_per_callback(
+    shared: dict[str, Any],
+    aiohttp_test_server: aiohttp.test_utils.TestServer,
+    aiohttp_session: aiohttp.ClientSession,
+) -> None:
+    url: yarl.URL = shared["test_server_url"] / "cache"
+    cache = aiohtk.ResponseCache()
+
+    out, err = await aiohtk.RequestHandler.request(
+        session=aiohttp_session,
+        response_callback=aiohtk.callbacks.status,
+        response_callback_kwargs={},
+        method="GET",
+        url=url,
+        params={"max_age": "60"},
+        cache=cache,
+    )
+    assert err is None and "text" not in out
+
+    for _ in range(2):
+        out = await fetch(aiohttp_session, cache, url, params={"max_age": "60"})
+        assert out["text"] == ""
+    assert cache.stats() | dict(size=0) == dict(
+        hits=1, misses=2, revalidations=0, entries=2, size=0,
+    )
@@ -0,0 +1,74 @@
+from typing import Any
+import asyncio
+
+import aiohttp
+import aiohttp.test_utils
+import pytest
+import yarl
+
+import aiohttp_toolkit as aiohtk
+
+
+@pytest.mark.asyncio
+async def test_coalescer(
+    shared: dict[str, Any],
+    aiohttp_test_server: aiohttp.test_utils.TestServer,
+    aiohttp_session: aiohttp.ClientSession,
+) -> None:
+    url: yarl.URL = shared["test_server_url"] / "delay"
+    coalescer = aiohtk.Coalescer()
+    calls = 0
+
+    async def count(
+        data: dict[str, Any],
+        cr: aiohttp.ClientResponse,
+        **kwargs,
+    ) -> aiohtk.types.CbBuilderOut:
+        nonlocal calls
+        calls += 1
+        return data, None
+
+    callback = aiohtk.CallbackBuilder.develop(aiohtk.callbacks.text, count)
+
+    def request() -> Any:
+        return aiohtk.RequestHandler.request(
+            session=aiohttp_session,
+            response_callback=callback,
+            response_callback_kwargs={},
+            method="GET",
+            url=url,
+            params={"delay": "0.1"},
+            coalescer=coalescer,
+        )
+
+    leader = asyncio.ensure_future(request())
+    followers = [asyncio.ensure_future(request()) for _ in range(9)]
+    await asyncio.sleep(0.01)
+
+    followers[0].cancel()
+    outs = await asyncio.gather(leader, *followers[1:])
+
+    assert calls == 1
+    assert coalescer.coalesced == 9
+    assert coalescer.inflight == 0
+    assert all(out["text"] == "delayed" and not err for out, err in outs)
+    assert len({id(out) for out, _ in outs}) == len(outs)
+
+    leader = asyncio.ensure_future(request())
+    await asyncio.sleep(0.01)
+    leader.cancel()
+    out, err = await request()
+
+    assert calls == 2
+    assert out["text"] == "delayed"
+
+    # a request arriving while the abandoned leader is being cancelled
+    leader = asyncio.ensure_future(request())
+    await asyncio.sleep(0.01)
+    leader.cancel()
+    await asyncio.sleep(0)
+    out, err = await request()
+
+    assert err is None
+    assert out["text"] == "delayed"
+    assert coalescer.inflight == 0
@@ -0,0 +1,85 @@
+from typing import Any
+import asyncio
+
+import aiohttp
+import aiohttp.test_utils
+import pytest
+import yarl
+
+import aiohttp_toolkit as aiohtk
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limiter(
+    shared: dict[str, Any],
+    aiohttp_test_server: aiohttp.test_utils.TestServer,
+    aiohttp_session: aiohttp.ClientSession,
+) -> None:
+    url: yarl.URL = shared["test_server_url"]
+    limiter = aiohtk.ConcurrencyLimiter(
+        algorithm="aimd",
+        initial_limit=2,
+        max_limit=4,
+        backoff=0.5,
+    )
+    seen: list[dict[str, Any]] = []
+
+    async def callback(cr: aiohttp.ClientResponse, **kwargs):
+        seen.append(limiter.snapshot()[url.host])
+        return await aiohtk.callbacks.status(cr, **kwargs)
+
+    async def request(url: yarl.URL) -> dict[str, Any]:
+        out, err = await aiohtk.RequestHandler.request(
+            session=aiohttp_session,
+            response_callback=callback,
+            response_callback_kwargs={},
+            method="GET",
+            url=url,
+            concurrency=limiter,
+        )
+        if err:
+            raise err
+        return out
+
+    await asyncio.gather(*(
+        request(url / "delay" % {"delay": "0.01"})
+        for _ in range(30)
+    ))
+
+    assert all(state["inflight"] <= state["limit"] for state in seen)
+    assert max(state["queued"] for state in seen) > 0
+    assert limiter.limit(url.host) == 4
+
+    await request(url / "error" % {"status": "503"})
+    assert limiter.limit(url.host) == 2
+    assert limiter.snapshot()[url.host] | dict(rtt=0, long_rtt=0) == dict(
+        limit=2, inflight=0, queued=0, rtt=0, long_rtt=0,
+    )
+
+@pytest.mark.asyncio
+async def test_concurrency_limiter_gradient(
+    shared: dict[str, Any],
+    aiohttp_test_server: aiohttp.test_utils.TestServer,
+    aiohttp_session: aiohttp.ClientSession,
+) -> None:
+    url: yarl.URL = shared["test_server_url"]
+    limiter = aiohtk.ConcurrencyLimiter(initial_limit=4)
+
+    async def request(delay: float) -> None:
+        _, err = await aiohtk.RequestHandler.request(
+            session=aiohttp_session,
+            response_callback=aiohtk.callbacks.status,
+            response_callback_kwargs={},
+            method="GET",
+            url=url / "delay" % {"delay": str(delay)},
+            concurrency=limiter,
+        )
+        if err:
+            raise err
+
+    await asyncio.gather(*(request(0.01) for _ in range(40)))
+    grown = limiter.limit(url.host)
+    assert grown > 4
+
+    await asyncio.gather(*(request(0.1) for _ in range(grown)))
+    assert limiter.limit(url.host) < grown
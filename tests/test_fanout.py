@@ -0,0 +1,105 @@
+from typing import Any
+
+import aiohttp
+import aiohttp.test_utils
+import multidict
+import pytest
+import yarl
+
+import aiohttp_toolkit as aiohtk
+
+
+async def unpicklable(cr: aiohttp.ClientResponse, **kwargs):
+    out, err = await aiohtk.callbacks.read(cr, **kwargs)
+    if out["read"] == b"1":
+        out["lock"] = __import__("threading").Lock()
+    return out, err
+
+
+@pytest.mark.asyncio
+async def test_process_fan_out(
+    shared: dict[str, Any],
+    aiohttp_test_server: aiohttp.test_utils.TestServer,
+) -> None:
+    url: yarl.URL = shared["test_server_url"]
+    specs = (
+        dict(method="POST", url=url, data=str(i).encode())
+        for i in range(30)
+    )
+
+    results = {}
+    with aiohtk.ProcessFanOut(processes=2, chunk_size=4, limit=2) as fanout:
+        async for index, out, err in fanout.request_many(
+            response_callback="aiohttp_toolkit.response_callbacks:read",
+            response_callback_kwargs={},
+            specs=specs,
+        ):
+            if err:
+                raise err
+            assert isinstance(out["headers"], multidict.CIMultiDictProxy)
+            results[index] = aiohtk.models.Read.from_out(out).read
+
+    assert results == {i: str(i).encode() for i in range(30)}
+
+@pytest.mark.asyncio
+async def test_process_fan_out_error() -> None:
+    specs = [dict(method="GET", url=yarl.URL("http://127.0.0.1:1"))]
+
+    with aiohtk.ProcessFanOut(processes=1) as fanout:
+        results = [
+            result
+            async for result in fanout.request_many(
+                response_callback="aiohttp_toolkit.response_callbacks:status",
+                response_callback_kwargs={},
+                specs=specs,
+            )
+        ]
+
+    assert len(results) == 1
+    index, out, err = results[0]
+    assert index == 0
+    assert out == {}
+    assert isinstance(err, (aiohttp.ClientConnectionError, aiohtk.RemoteError))
+
+@pytest.mark.asyncio
+async def test_process_fan_out_unpicklable(
+    shared: dict[str, Any],
+    aiohttp_test_server: aiohttp.test_utils.TestServer,
+) -> None:
+    url: yarl.URL = shared["test_server_url"]
+    specs = [
+        dict(method="POST", url=url, data=str(i).encode())
+        for i in range(4)
+    ]
+
+    with aiohtk.ProcessFanOut(processes=1, chunk_size=4) as fanout:
+        results = {
+            index: (out, err)
+            async for index, out, err in fanout.request_many(
+                response_callback="tests.test_fanout:unpicklable",
+                response_callback_kwargs={},
+                specs=specs,
+            )
+        }
+
+        assert results[1][0] == {}
+        assert isinstance(results[1][1], aiohtk.RemoteError)
+        assert all(
+            results[i][0]["read"] == str(i).encode() and results[i][1] is None
+            for i in (0, 2, 3)
+        )
+
+        results = {
+            index: (out, err)
+            async for index, out, err in fanout.request_many(
+                response_callback="tests.test_fanout:missing",
+                response_callback_kwargs={},
+                specs=specs,
+            )
+        }
+
+    assert sorted(results) == [0, 1, 2, 3]
+    assert all(
+        out == {} and isinstance(err, aiohtk.RemoteError)
+        for out, err in results.values()
+    )
@@ -1,5 +1,6 @@
 from typing import Any
 from unittest.mock import MagicMock
+import asyncio
 
 import aiohttp
 import aiohttp.test_utils
@@ -143,3 +144,132 @@ async def test_client(
         raise RuntimeError(f"response is not ok: {res.status=}")
 
     assert res.read == data
+
+@pytest.mark.asyncio
+async def test_request_many(
+    shared: dict[str, Any],
+    aiohttp_test_server: aiohttp.test_utils.TestServer,
+    aiohttp_session: aiohttp.ClientSession,
+) -> None:
+    url: yarl.URL = shared["test_server_url"]
+    specs = (
+        dict(method="POST", url=url, data=str(i).encode())
+        for i in range(20)
+    )
+
+    results = {}
+    async for index, out, err in aiohtk.RequestHandler.request_many(
+        session=aiohttp_session,
+        response_callback=aiohtk.callbacks.read,
+        response_callback_kwargs={},
+        specs=specs,
+        limit=4,
+        limit_per_host=2,
+    ):
+        if err:
+            raise err
+        results[index] = out["read"]
+
+    assert results == {i: str(i).encode() for i in range(20)}
+
+@pytest.mark.asyncio
+async def test_request_many_errors(
+    shared: dict[str, Any],
+    aiohttp_test_server: aiohttp.test_utils.TestServer,
+    aiohttp_session: aiohttp.ClientSession,
+) -> None:
+    url: yarl.URL = shared["test_server_url"]
+
+    async def callback(cr: aiohttp.ClientResponse, **kwargs):
+        if cr.url.path == "/error":
+            raise RuntimeError("callback failed")
+        return await aiohtk.callbacks.status(cr, **kwargs)
+
+    specs = [dict(method="GET", url=url / "delay") for _ in range(6)]
+    specs[1] = dict(
+        method="GET",
+        url=url / "delay" % {"delay": "1"},
+        timeout=aiohttp.ClientTimeout(total=0.05),
+    )
+    specs[2] = dict(method="GET", url=url / "error")
+
+    results = {}
+    async for index, out, err in aiohtk.RequestHandler.request_many(
+        session=aiohttp_session,
+        response_callback=callback,
+        response_callback_kwargs={},
+        specs=specs,
+        limit=3,
+    ):
+        results[index] = (out, err)
+
+    assert len(results) == 6
+    assert isinstance(results[1][1], asyncio.TimeoutError)
+    assert isinstance(results[2][1], RuntimeError)
+    assert results[1][0] == results[2][0] == {}
+    assert all(
+        results[i] == (dict(status=200, ok=True), None)
+        for i in (0, 3, 4, 5)
+    )
+
+@pytest.mark.asyncio
+async def test_request_many_async_specs(
+    shared: dict[str, Any],
+    aiohttp_test_server: aiohttp.test_utils.TestServer,
+    aiohttp_session: aiohttp.ClientSession,
+) -> None:
+    url: yarl.URL = shared["test_server_url"]
+
+    async def specs():
+        for _ in range(5):
+            yield dict(method="GET", url=url)
+
+    indexes = []
+    async for index, out, err in aiohtk.RequestHandler.request_many(
+        session=aiohttp_session,
+        response_callback=aiohtk.callbacks.status,
+        response_callback_kwargs={},
+        specs=specs(),
+        limit=2,
+    ):
+        if err:
+            raise err
+        assert out["status"] == 200
+        indexes.append(index)
+
+    assert sorted(indexes) == list(range(5))
+
+@pytest.mark.asyncio
+async def test_callback_builder_compile() -> None:
+    cr = MagicMock(aiohttp.ClientResponse)
+    cr.status = 200
+    cr.ok = True
+
+    def sync_handler(data: dict[str, Any], cr: Any, **kwargs) -> Any:
+        data["sync"] = kwargs["value"]
+        return data, None
+
+    async def async_handler(data: dict[str, Any], cr: Any, **kwargs) -> Any:
+        data["async"] = kwargs["value"]
+        return data, None
+
+    async def failing_handler(data: dict[str, Any], cr: Any, **kwargs) -> Any:
+        return data, ValueError("failed")
+
+    built = aiohtk.CallbackBuilder.build(aiohtk.builders.status, sync_handler)
+    developed = aiohtk.CallbackBuilder.develop(built, async_handler)
+
+    assert developed.handlers == (
+        aiohtk.builders.status, sync_handler, async_handler,
+    )
+
+    out, err = await developed(cr, value=1)
+    assert err is None
+    assert out == dict(status=200, ok=True, sync=1) | {"async": 1}
+
+    failing = aiohtk.CallbackBuilder.develop(
+        developed, failing_handler, sync_handler,
+    )
+    out, err = await failing(cr, value=2)
+    assert isinstance(err, ValueError)
+    assert out == dict(status=200, ok=True, sync=2) | {"async": 2}
@@ -0,0 +1,129 @@
+from typing import Any
+import time
+
+import aiohttp
+import aiohttp.test_utils
+import pytest
+import yarl
+
+import aiohttp_toolkit as aiohtk
+
+
+async def request(
+    session: aiohttp.ClientSession,
+    url: yarl.URL,
+    key: str,
+    hedge: aiohtk.HedgePolicy,
+) -> dict[str, Any]:
+    out, err = await aiohtk.RequestHandler.request(
+        session=session,
+        response_callback=aiohtk.callbacks.text,
+        response_callback_kwargs={},
+        method="GET",
+        url=url,
+        params={"key": key, "delay": "0.5"},
+        hedge=hedge,
+    )
+    if err:
+        raise err
+    return out
+
+
+@pytest.mark.asyncio
+async def test_hedge(
+    shared: dict[str, Any],
+    aiohttp_test_server: aiohttp.test_utils.TestServer,
+    aiohttp_session: aiohttp.ClientSession,
+) -> None:
+    url: yarl.URL = shared["test_server_url"] / "slow_first"
+    hedge = aiohtk.HedgePolicy(delay=0.05, adaptive=False, max_ratio=1.0)
+
+    start = time.monotonic()
+    out = await request(aiohttp_session, url, "hedged", hedge)
+
+    assert time.monotonic() - start < 0.4
+    assert out["text"] == "2"
+    assert hedge.hedges == hedge.wins == 1
+
+@pytest.mark.asyncio
+async def test_hedge_ratio(
+    shared: dict[str, Any],
+    aiohttp_test_server: aiohttp.test_utils.TestServer,
+    aiohttp_session: aiohttp.ClientSession,
+) -> None:
+    url: yarl.URL = shared["test_server_url"] / "slow_first"
+    hedge = aiohtk.HedgePolicy(delay=0.05, adaptive=False, max_ratio=0.0)
+
+    out = await request(aiohttp_session, url, "capped", hedge)
+
+    assert out["text"] == "1"
+    assert hedge.hedges == 0
+    assert hedge.hedge_delay(url.host) == 0.05
+
+@pytest.mark.asyncio
+async def test_hedge_failed_duplicate(
+    shared: dict[str, Any],
+    aiohttp_test_server: aiohttp.test_utils.TestServer,
+    aiohttp_session: aiohttp.ClientSession,
+) -> None:
+    url: yarl.URL = shared["test_server_url"] / "slow_first"
+    hedge = aiohtk.HedgePolicy(delay=0.05, adaptive=False, max_ratio=1.0)
+
+    out, err = await aiohtk.RequestHandler.request(
+        session=aiohttp_session,
+        response_callback=aiohtk.CallbackBuilder.develop(
+            aiohtk.callbacks.status, aiohtk.builders.text,
+        ),
+        response_callback_kwargs={},
+        method="GET",
+        url=url,
+        params={"key": "failed", "delay": "0.2", "status": "503"},
+        hedge=hedge,
+    )
+
+    # the duplicate failed fast, so the original request is waited for
+    assert err is None
+    assert out["status"] == 200
+    assert out["text"] == "1"
+    assert hedge.hedges == 1
+    assert hedge.wins == 0
+
+@pytest.mark.asyncio
+async def test_hedge_slow_body(
+    shared: dict[str, Any],
+    aiohttp_test_server: aiohttp.test_utils.TestServer,
+    aiohttp_session: aiohttp.ClientSession,
+) -> None:
+    url: yarl.URL = shared["test_server_url"] / "stream"
+    hedge = aiohtk.HedgePolicy(delay=0.03, adaptive=False, max_ratio=1.0)
+    calls = 0
+
+    async def count(
+        data: dict[str, Any],
+        cr: aiohttp.ClientResponse,
+        **kwargs,
+    ) -> aiohtk.types.CbBuilderOut:
+        nonlocal calls
+        calls += 1
+        return data, None
+
+    out, err = await aiohtk.RequestHandler.request(
+        session=aiohttp_session,
+        response_callback=aiohtk.CallbackBuilder.develop(
+            aiohtk.callbacks.text, count,
+        ),
+        response_callback_kwargs={},
+        method="GET",
+        url=url,
+        params=[
+            ("piece", "a"), ("piece", "b"), ("piece", "c"),
+            ("interval", "0.05"),
+        ],
+        hedge=hedge,
+    )
+
+    # headers arrived before the hedge delay, so the body is not raced
+    assert err is None
+    assert out["text"] == "abc"
+    assert calls == 1
+    assert hedge.hedges == 0
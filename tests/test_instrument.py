@@ -0,0 +1,80 @@
+from typing import Any
+
+import aiohttp
+import aiohttp.test_utils
+import pytest
+import yarl
+
+import aiohttp_toolkit as aiohtk
+
+
+@pytest.mark.asyncio
+async def test_instrumentation(
+    shared: dict[str, Any],
+    aiohttp_test_server: aiohttp.test_utils.TestServer,
+) -> None:
+    url: yarl.URL = shared["test_server_url"]
+    instrumentation = aiohtk.Instrumentation(report=True)
+
+    async with aiohttp.ClientSession(
+        trace_configs=[instrumentation.trace_config],
+    ) as session:
+        for _ in range(3):
+            out, err = await aiohtk.RequestHandler.request(
+                session=session,
+                response_callback=aiohtk.callbacks.json,
+                response_callback_kwargs={},
+                method="GET",
+                url=url,
+                instrumentation=instrumentation,
+            )
+            if err:
+                raise err
+
+    timings = out["timings"]
+    assert set(timings) == {
+        "dns", "connect", "ttfb", "body", "callback", "total", "handlers",
+    }
+    assert set(timings["handlers"]) == {"status", "headers", "cookies", "json"}
+    assert 0 < timings["ttfb"] <= timings["total"]
+    assert timings["callback"] >= timings["handlers"]["json"]
+
+    snapshot = instrumentation.snapshot()
+    assert snapshot["hosts"][url.host]["total"]["count"] == 3
+    assert snapshot["callbacks"]["status+headers+cookies+json"]["json"][
+        "count"
+    ] == 3
+
+def test_histogram() -> None:
+    histogram = aiohtk.Histogram()
+    for value in (0.001, 0.002, 0.004, 1.0):
+        histogram.observe(value)
+
+    assert histogram.count == 4
+    assert histogram.quantile(0.5) >= 0.002
+    assert histogram.quantile(0.99) >= 1.0
+
+@pytest.mark.asyncio
+async def test_instrumentation_with_retry(
+    shared: dict[str, Any],
+    aiohttp_test_server: aiohttp.test_utils.TestServer,
+    aiohttp_session: aiohttp.ClientSession,
+) -> None:
+    url: yarl.URL = shared["test_server_url"]
+    instrumentation = aiohtk.Instrumentation(report=True)
+
+    out, err = await aiohtk.RequestHandler.request(
+        session=aiohttp_session,
+        response_callback=aiohtk.callbacks.status,
+        response_callback_kwargs={},
+        method="GET",
+        url=url,
+        retry=aiohtk.RetryPolicy(),
+        cache=aiohtk.ResponseCache(),
+        instrumentation=instrumentation,
+    )
+    if err:
+        raise err
+
+    assert set(out["timings"]["handlers"]) == {"status"}
+    assert "status" in instrumentation.callbacks
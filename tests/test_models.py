@@ -0,0 +1,35 @@
+import dataclasses
+import http.cookies
+
+import multidict
+import pytest
+
+import aiohttp_toolkit as aiohtk
+
+
+def test_from_out() -> None:
+    out = dict(
+        status=200,
+        ok=True,
+        headers=multidict.CIMultiDictProxy(multidict.CIMultiDict()),
+        cookies=http.cookies.SimpleCookie(),
+        text="Hello, World!",
+        retry=dict(attempts=1, backoff=0.0),
+    )
+
+    res = aiohtk.models.Text.from_out(out)
+
+    assert res == aiohtk.models.Text(**{k: out[k] for k in out if k != "retry"})
+    assert not hasattr(res, "__dict__")
+
+    with pytest.raises(KeyError):
+        aiohtk.models.Read.from_out(out)
+
+def test_from_out_subclass() -> None:
+    @dataclasses.dataclass
+    class Tagged(aiohtk.models.Status):
+        tag: str
+
+    res = Tagged.from_out(dict(status=404, ok=False, tag="missing"))
+
+    assert res == Tagged(status=404, ok=False, tag="missing")
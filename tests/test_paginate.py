@@ -0,0 +1,109 @@
+from typing import Any
+import asyncio
+import time
+
+import aiohttp
+import aiohttp.test_utils
+import pytest
+import yarl
+
+import aiohttp_toolkit as aiohtk
+
+
+@pytest.mark.asyncio
+async def test_paginator(
+    shared: dict[str, Any],
+    aiohttp_test_server: aiohttp.test_utils.TestServer,
+    aiohttp_session: aiohttp.ClientSession,
+) -> None:
+    url: yarl.URL = shared["test_server_url"] / "pages"
+
+    paginators = [
+        aiohtk.Paginator(
+            aiohttp_session,
+            aiohtk.callbacks.json,
+            {},
+            aiohtk.Paginator.cursor("meta.next"),
+            items="data",
+            method="GET",
+            url=url,
+            params={"style": "cursor"},
+        ),
+        aiohtk.Paginator(
+            aiohttp_session,
+            aiohtk.callbacks.json,
+            {},
+            aiohtk.Paginator.offset(3),
+            method="GET",
+            url=url,
+            params={"style": "offset"},
+        ),
+        aiohtk.Paginator(
+            aiohttp_session,
+            aiohtk.callbacks.json,
+            {},
+            aiohtk.Paginator.link(),
+            method="GET",
+            url=url,
+            params={"style": "link"},
+        ),
+    ]
+
+    for paginator in paginators:
+        assert [item async for item in paginator] == list(range(7))
+        assert paginator.err is None
+        assert paginator.pages_fetched == 3
+
+    paginator = aiohtk.Paginator(
+        aiohttp_session,
+        aiohtk.callbacks.json,
+        {},
+        aiohtk.Paginator.offset(3),
+        max_pages=2,
+        method="GET",
+        url=url,
+    )
+    assert [item async for item in paginator] == list(range(6))
+
+    paginator = aiohtk.Paginator(
+        aiohttp_session,
+        aiohtk.callbacks.text,
+        {},
+        aiohtk.Paginator.offset(3),
+        method="GET",
+        url=url,
+    )
+    assert [item async for item in paginator] == []
+    assert isinstance(paginator.err, KeyError)
+
+@pytest.mark.asyncio
+async def test_paginator_prefetch(
+    shared: dict[str, Any],
+    aiohttp_test_server: aiohttp.test_utils.TestServer,
+    aiohttp_session: aiohttp.ClientSession,
+) -> None:
+    url: yarl.URL = shared["test_server_url"] / "pages"
+    paginator = aiohtk.Paginator(
+        aiohttp_session,
+        aiohtk.callbacks.json,
+        {},
+        aiohtk.Paginator.offset(3),
+        prefetch=2,
+        method="GET",
+        url=url,
+        params={"delay": "0.05", "total": "12"},
+    )
+
+    start = time.monotonic()
+    async for _, _, err in paginator.pages():
+        if err:
+            raise err
+        await asyncio.sleep(0.05)
+
+    # 4 pages, fetching overlaps processing
+    assert time.monotonic() - start < 0.35
+
+    async for item in paginator:
+        break
+    await asyncio.sleep(0.2)
+    assert paginator.pages_fetched <= 4 + 1 + 2 + 1
@@ -0,0 +1,49 @@
+from typing import Any
+
+import aiohttp
+import aiohttp.test_utils
+import pytest
+import yarl
+
+import aiohttp_toolkit as aiohtk
+
+
+@pytest.mark.asyncio
+async def test_prepared_endpoint(
+    shared: dict[str, Any],
+    aiohttp_test_server: aiohttp.test_utils.TestServer,
+    aiohttp_session: aiohttp.ClientSession,
+) -> None:
+    url: yarl.URL = shared["test_server_url"]
+    endpoint = aiohtk.PreparedEndpoint(
+        aiohttp_session,
+        aiohtk.callbacks.status,
+        {},
+        method="GET",
+        url=f"{url}/{{path}}",
+        headers={"Authorization": "Bearer token"},
+    )
+    endpoint_root = aiohtk.PreparedEndpoint(
+        aiohttp_session,
+        aiohtk.callbacks.json,
+        {},
+        method="GET",
+        url=url,
+        headers={"Authorization": "Bearer token"},
+        params={"key": "value"},
+    )
+
+    out, err = await endpoint_root(headers={"X-Extra": "1"})
+    if err:
+        raise err
+
+    assert out["json"]["Authorization"] == "Bearer token"
+    assert out["json"]["X-Extra"] == "1"
+
+    out, err = await endpoint({"path": "missing route"})
+    if err:
+        raise err
+
+    assert out["status"] == 404
+    assert endpoint._format_url.cache_info().currsize == 1
+    assert str(endpoint._format_url((("path", "a/b"),))).endswith("/a%2Fb")
@@ -0,0 +1,90 @@
+from typing import Any
+import asyncio
+import time
+
+import aiohttp
+import aiohttp.test_utils
+import pytest
+import yarl
+
+import aiohttp_toolkit as aiohtk
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter(
+    shared: dict[str, Any],
+    aiohttp_test_server: aiohttp.test_utils.TestServer,
+    aiohttp_session: aiohttp.ClientSession,
+) -> None:
+    url: yarl.URL = shared["test_server_url"]
+    limiter = aiohtk.RateLimiter(rate=50, burst=2)
+
+    start = time.monotonic()
+    outs = await asyncio.gather(*(
+        aiohtk.RequestHandler.request(
+            session=aiohttp_session,
+            response_callback=aiohtk.callbacks.status,
+            response_callback_kwargs={},
+            method="GET",
+            url=url,
+            rate_limiter=limiter,
+        )
+        for _ in range(7)
+    ))
+    elapsed = time.monotonic() - start
+
+    assert all(not err for _, err in outs)
+    assert elapsed >= 0.09
+    assert limiter.waited > 0
+
+@pytest.mark.asyncio
+async def test_rate_limiter_retry_after(
+    shared: dict[str, Any],
+    aiohttp_test_server: aiohttp.test_utils.TestServer,
+    aiohttp_session: aiohttp.ClientSession,
+) -> None:
+    url: yarl.URL = shared["test_server_url"] / "flaky"
+    limiter = aiohtk.RateLimiter(rate=1000, burst=10)
+
+    async def request() -> dict[str, Any]:
+        out, err = await aiohtk.RequestHandler.request(
+            session=aiohttp_session,
+            response_callback=aiohtk.callbacks.status,
+            response_callback_kwargs={},
+            method="GET",
+            url=url,
+            params={"key": "limiter", "fails": "1", "retry_after": "0.2"},
+            rate_limiter=limiter,
+        )
+        if err:
+            raise err
+        return out
+
+    assert (await request())["status"] == 503
+
+    start = time.monotonic()
+    assert (await request())["status"] == 200
+    assert time.monotonic() - start >= 0.15
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_reset() -> None:
+    limiter = aiohtk.RateLimiter(rate=100, burst=1, max_block=60)
+    bucket = limiter._get("host")
+
+    # Unix timestamp reset, 0.1 seconds from now
+    limiter._feedback(bucket, 200, {
+        "X-RateLimit-Remaining": "1",
+        "X-RateLimit-Reset": str(time.time() + 0.1),
+    })
+    assert 5 < limiter.bucket("host")["rate"] < 100
+
+    await asyncio.sleep(0.15)
+    assert limiter.bucket("host")["rate"] == 100
+
+    # far-away reset is capped by `max_block`
+    limiter._feedback(bucket, 200, {
+        "RateLimit-Remaining": "0",
+        "RateLimit-Reset": str(time.time() + 86400),
+    })
+    assert bucket.blocked_until - time.monotonic() <= 60
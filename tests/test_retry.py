@@ -0,0 +1,99 @@
+from typing import Any
+
+import aiohttp
+import aiohttp.test_utils
+import pytest
+import yarl
+
+import aiohttp_toolkit as aiohtk
+
+
+@pytest.mark.asyncio
+async def test_retry_status(
+    shared: dict[str, Any],
+    aiohttp_test_server: aiohttp.test_utils.TestServer,
+    aiohttp_session: aiohttp.ClientSession,
+) -> None:
+    url: yarl.URL = shared["test_server_url"] / "flaky"
+    policy = aiohtk.RetryPolicy(attempts=3, backoff_base=0.01, report=True)
+
+    out, err = await aiohtk.RequestHandler.request(
+        session=aiohttp_session,
+        response_callback=aiohtk.callbacks.text,
+        response_callback_kwargs={},
+        method="GET",
+        url=url,
+        params={"key": "status", "fails": "2"},
+        retry=policy,
+    )
+    if err:
+        raise err
+
+    assert out["status"] == 200
+    assert out["text"] == "3"
+    assert out["retry"]["attempts"] == 3
+    assert policy.retries == 2
+
+@pytest.mark.asyncio
+async def test_retry_budget_and_retry_after(
+    shared: dict[str, Any],
+    aiohttp_test_server: aiohttp.test_utils.TestServer,
+    aiohttp_session: aiohttp.ClientSession,
+) -> None:
+    url: yarl.URL = shared["test_server_url"] / "flaky"
+    budget = aiohtk.RetryBudget(ratio=0.1, capacity=1)
+    policy = aiohtk.RetryPolicy(attempts=5, backoff_max=1, budget=budget)
+
+    async def request(key: str, retry_after: str = "0") -> dict[str, Any]:
+        out, err = await aiohtk.RequestHandler.request(
+            session=aiohttp_session,
+            response_callback=aiohtk.callbacks.status,
+            response_callback_kwargs={},
+            method="GET",
+            url=url,
+            params={"key": key, "fails": "2", "retry_after": retry_after},
+            retry=policy,
+        )
+        if err:
+            raise err
+        return out
+
+    assert (await request("budget"))["status"] == 503
+    assert policy.retries == 1
+    assert budget.rejected == 1
+
+    budget.tokens = budget.capacity
+    assert (await request("retry_after", retry_after="60"))["status"] == 503
+    assert policy.retries == 1
+
+@pytest.mark.asyncio
+async def test_retry_client_error(
+    aiohttp_session: aiohttp.ClientSession,
+) -> None:
+    url = yarl.URL("http://127.0.0.1:1")
+    policy = aiohtk.RetryPolicy(attempts=3, backoff_base=0.01)
+
+    out, err = await aiohtk.RequestHandler.request(
+        session=aiohttp_session,
+        response_callback=aiohtk.callbacks.status,
+        response_callback_kwargs={},
+        method="GET",
+        url=url,
+        retry=policy,
+    )
+
+    assert out == {}
+    assert isinstance(err, aiohttp.ClientConnectionError)
+    assert policy.retries == 2
+
+    out, err = await aiohtk.RequestHandler.request(
+        session=aiohttp_session,
+        response_callback=aiohtk.callbacks.status,
+        response_callback_kwargs={},
+        method="POST",
+        url=url,
+        retry=policy,
+    )
+
+    assert isinstance(err, aiohttp.ClientConnectionError)
+    assert policy.retries == 2
@@ -0,0 +1,127 @@
+from typing import Any
+import asyncio
+
+import aiohttp
+import aiohttp.test_utils
+import pytest
+import yarl
+
+import aiohttp_toolkit as aiohtk
+
+
+@pytest.mark.asyncio
+async def test_scheduler(
+    shared: dict[str, Any],
+    aiohttp_test_server: aiohttp.test_utils.TestServer,
+    aiohttp_session: aiohttp.ClientSession,
+) -> None:
+    url: yarl.URL = shared["test_server_url"] / "delay" % {"delay": "0.01"}
+    scheduler = aiohtk.RequestScheduler(
+        slots=2,
+        weights={"interactive": 4, "background": 1},
+        max_wait=None,
+    )
+    order: list[str] = []
+
+    async def request(name: str) -> None:
+        _, err = await aiohtk.RequestHandler.request(
+            session=aiohttp_session,
+            response_callback=aiohtk.callbacks.status,
+            response_callback_kwargs={},
+            method="GET",
+            url=url,
+            scheduler=scheduler.lane(name),
+        )
+        if err:
+            raise err
+        order.append(name)
+
+    tasks = [
+        asyncio.ensure_future(request("background"))
+        for _ in range(10)
+    ]
+    await asyncio.sleep(0)
+    tasks += [
+        asyncio.ensure_future(request("interactive"))
+        for _ in range(8)
+    ]
+    await asyncio.gather(*tasks)
+
+    # 2 background requests took free slots, then slots are shared 4:1
+    assert order[:12].count("interactive") == 8
+
+    stats = scheduler.stats()
+    assert stats["interactive"]["dispatched"] == 8
+    assert stats["background"]["dispatched"] == 10
+    assert stats["background"]["wait"]["count"] == 10
+    assert stats["background"]["queued"] == 0
+    assert scheduler.inflight == 0
+
+@pytest.mark.asyncio
+async def test_scheduler_aging(
+    shared: dict[str, Any],
+    aiohttp_test_server: aiohttp.test_utils.TestServer,
+    aiohttp_session: aiohttp.ClientSession,
+) -> None:
+    url: yarl.URL = shared["test_server_url"] / "delay" % {"delay": "0.02"}
+    scheduler = aiohtk.RequestScheduler(
+        slots=1,
+        weights={"interactive": 1000, "background": 1},
+        max_wait=0.05,
+    )
+    order: list[str] = []
+
+    async def request(name: str) -> None:
+        await aiohtk.RequestHandler.request(
+            session=aiohttp_session,
+            response_callback=aiohtk.callbacks.status,
+            response_callback_kwargs={},
+            method="GET",
+            url=url,
+            scheduler=scheduler.lane(name),
+        )
+        order.append(name)
+
+    tasks = [asyncio.ensure_future(request("interactive"))]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.ensure_future(request("background")))
+    tasks += [
+        asyncio.ensure_future(request("interactive"))
+        for _ in range(10)
+    ]
+    await asyncio.gather(*tasks)
+
+    assert order.index("background") < 6
+
+
+@pytest.mark.asyncio
+async def test_scheduler_classify(
+    shared: dict[str, Any],
+    aiohttp_test_server: aiohttp.test_utils.TestServer,
+    aiohttp_session: aiohttp.ClientSession,
+) -> None:
+    with pytest.raises(ValueError):
+        aiohtk.RequestScheduler(slots=1, weights={"a": 1}, default="b")
+
+    scheduler = aiohtk.RequestScheduler(
+        slots=1,
+        weights={"interactive": 1, "background": 1},
+        default="background",
+        classify=lambda **kwargs: kwargs["headers"]["X-Tenant"],
+    )
+
+    _, err = await aiohtk.RequestHandler.request(
+        session=aiohttp_session,
+        response_callback=aiohtk.callbacks.status,
+        response_callback_kwargs={},
+        method="GET",
+        url=shared["test_server_url"],
+        headers={"X-Tenant": "unknown"},
+        scheduler=scheduler,
+    )
+
+    assert err is None
+    stats = scheduler.stats()
+    assert stats["background"]["dispatched"] == 1
+    assert stats["interactive"]["dispatched"] == 0
+    assert scheduler.inflight == 0
@@ -0,0 +1,117 @@
+from typing import Any
+import asyncio
+
+import aiohttp
+import aiohttp.test_utils
+import pytest
+import yarl
+
+import aiohttp_toolkit as aiohtk
+
+
+async def collect(**kwargs) -> tuple[list[Any], Any]:
+    records = []
+    async for record, err in aiohtk.RequestHandler.stream(**kwargs):
+        if err:
+            return records, err
+        records.append(record)
+    return records, None
+
+@pytest.mark.asyncio
+async def test_stream_ndjson(
+    shared: dict[str, Any],
+    aiohttp_test_server: aiohttp.test_utils.TestServer,
+    aiohttp_session: aiohttp.ClientSession,
+) -> None:
+    url: yarl.URL = shared["test_server_url"]
+
+    records, err = await collect(
+        session=aiohttp_session,
+        method="GET",
+        url=url / "stream",
+        params=[("piece", '{"a": 1}\n{"a"'), ("piece", ': 2}\r\n\n'),
+                ("piece", '{"a": 3}')],
+    )
+    assert err is None
+    assert records == [{"a": 1}, {"a": 2}, {"a": 3}]
+
+    records, err = await collect(
+        session=aiohttp_session,
+        method="GET",
+        url=url / "stream",
+        params=[("piece", '{"a": 1}\n'), ("piece", "x" * 100)],
+        max_line=50,
+    )
+    assert records == [{"a": 1}]
+    assert isinstance(err, aiohtk.LineTooLongError)
+
+    records, err = await collect(
+        session=aiohttp_session,
+        method="GET",
+        url=url / "error",
+    )
+    assert records == []
+    assert isinstance(err, aiohttp.ClientResponseError)
+
+    records, err = await collect(
+        session=aiohttp_session,
+        method="GET",
+        url=yarl.URL("http://127.0.0.1:1"),
+    )
+    assert isinstance(err, aiohttp.ClientConnectionError)
+
+@pytest.mark.asyncio
+async def test_stream_sse(
+    shared: dict[str, Any],
+    aiohttp_test_server: aiohttp.test_utils.TestServer,
+    aiohttp_session: aiohttp.ClientSession,
+) -> None:
+    url: yarl.URL = shared["test_server_url"]
+
+    records, err = await collect(
+        session=aiohttp_session,
+        method="GET",
+        url=url / "stream",
+        format="sse",
+        params=[
+            ("piece", ": comment\nretry: 100\nid: 1\nda"),
+            ("piece", "ta: first\ndata:second\n\n"),
+            ("piece", "event: update\ndata: {}\n\nid: 2\n\n"),
+        ],
+    )
+    assert err is None
+    assert records == [
+        dict(event="message", data="first\nsecond", id="1", retry=100),
+        dict(event="update", data="{}", id="1", retry=100),
+    ]
+
+@pytest.mark.asyncio
+async def test_stream_errors(
+    shared: dict[str, Any],
+    aiohttp_test_server: aiohttp.test_utils.TestServer,
+    aiohttp_session: aiohttp.ClientSession,
+) -> None:
+    url: yarl.URL = shared["test_server_url"]
+
+    records, err = await collect(
+        session=aiohttp_session,
+        method="GET",
+        url=url / "stream",
+        params=[("piece", "data: 1\n\n")] * 20,
+        format="sse",
+        timeout=aiohttp.ClientTimeout(total=0.005),
+    )
+    assert isinstance(err, asyncio.TimeoutError)
+
+    def decoder(line: bytes) -> Any:
+        raise RuntimeError(line)
+
+    records, err = await collect(
+        session=aiohttp_session,
+        method="GET",
+        url=url / "stream",
+        params=[("piece", '{"a": 1}\n')],
+        decoder=decoder,
+    )
+    assert records == []
+    assert isinstance(err, RuntimeError)
@@ -0,0 +1,69 @@
+from typing import Any
+import asyncio
+
+import aiohttp
+import aiohttp.test_utils
+import pytest
+import yarl
+
+import aiohttp_toolkit as aiohtk
+
+
+@pytest.mark.asyncio
+async def test_warm(
+    shared: dict[str, Any],
+    aiohttp_test_server: aiohttp.test_utils.TestServer,
+) -> None:
+    url: yarl.URL = shared["test_server_url"]
+    created = 0
+    reused = 0
+
+    async def on_create(session, ctx, params) -> None:
+        nonlocal created
+        created += 1
+
+    async def on_reuse(session, ctx, params) -> None:
+        nonlocal reused
+        reused += 1
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_connection_create_end.append(on_create)
+    trace_config.on_connection_reuseconn.append(on_reuse)
+
+    async with aiohttp.ClientSession(trace_configs=[trace_config]) as session:
+        async with aiohtk.ConnectionWarmer(
+            session,
+            [url, "http://127.0.0.1:1"],
+            connections=3,
+            timeout=1.0,
+        ) as warmer:
+            report = warmer.report
+
+            assert report[str(url)]["opened"] == 3
+            assert report[str(url)]["failed"] == 0
+            assert report["http://127.0.0.1:1"]["opened"] == 0
+            assert isinstance(
+                report["http://127.0.0.1:1"]["error"],
+                aiohttp.ClientConnectionError,
+            )
+            assert created == 3
+
+            await asyncio.gather(*(
+                aiohtk.RequestHandler.request(
+                    session=session,
+                    response_callback=aiohtk.callbacks.status,
+                    response_callback_kwargs={},
+                    method="GET",
+                    url=url / "delay" % {"delay": "0.05"},
+                )
+                for _ in range(3)
+            ))
+            assert created == 3
+            assert reused == 3
+
+            warmer.keep(0.01)
+            await asyncio.sleep(0.05)
+
+        assert warmer._keeper is None
+        assert created == 3
+        assert reused > 3